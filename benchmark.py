@@ -0,0 +1,259 @@
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import List, Dict, Tuple, Optional, Any
+
+from solver.RuleBase import RuleBase
+from solver.Solver import Status, DP_LIMIT
+from tools.get_solver import create_solver, get_order, SEPARATOR
+from tools.sudoku_to_dimacs import read_sudokus
+
+# Corpora can be given by their name in this directory, e.g. top95 for top95.sdk.txt.
+SUDOKU_DIRECTORY = os.path.join('input', 'sudoku')
+CORPUS_EXTENSIONS = ['.sdk.txt', '.txt']
+# The rules for every size of Sudoku.
+RULES = os.path.join('input', 'rules', 'sudoku-rules-{0}x{0}.txt')
+# A configuration has regressed if its median time is this fraction above the baseline.
+TOLERANCE = 0.1
+
+# A Sudoku with its index in the corpus, its size and its givens.
+Sudoku = Tuple[int, int, List[int]]
+
+
+def corpus_filename(corpus: str) -> str:
+    """A corpus is a file with one Sudoku per line, given by its path or its name in the Sudoku directory."""
+    if os.path.isfile(corpus):
+        return corpus
+    for extension in CORPUS_EXTENSIONS:
+        filename = os.path.join(SUDOKU_DIRECTORY, corpus + extension)
+        if os.path.isfile(filename):
+            return filename
+    raise ValueError("Unknown corpus '{}', expected a file or a name in '{}'.".format(corpus, SUDOKU_DIRECTORY))
+
+
+def load_corpus(corpus: str, n: Optional[int], offset: int) -> List[Sudoku]:
+    """
+    The Sudokus of a corpus. Raises a ValueError if the givens of a Sudoku are no variables of the rules of its size,
+    e.g. for the 16x16 rules, whose encoding differs from that of the Sudoku files: the solver would ignore them.
+    """
+    sudokus: List[Sudoku] = []
+    for i, size, literals in read_sudokus(corpus_filename(corpus)):
+        if i < offset:
+            continue
+        if n is not None and len(sudokus) >= n:
+            break
+        rules: RuleBase = RuleBase.load(RULES.format(size))
+        if not rules.variables.issuperset(literals):
+            raise ValueError("Sudoku {} of corpus '{}' does not use the variable encoding of the rules in '{}'.".format(
+                i, corpus, RULES.format(size)
+            ))
+        sudokus.append((i, size, literals))
+    return sudokus
+
+
+def percentile(values: List[float], p: float) -> float:
+    """The p-th percentile of the values, interpolated linearly between the two nearest ranks."""
+    values = sorted(values)
+    rank: float = (len(values) - 1) * p / 100
+    lower: int = math.floor(rank)
+    upper: int = math.ceil(rank)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+def solve_once(sudoku: Sudoku, split: str, budget: Dict[str, Any]) -> Tuple[float, Status]:
+    """Solves a Sudoku with a new solver and returns the wall-clock time, including creating the solver."""
+    i, size, literals = sudoku
+    rules: RuleBase = RuleBase.load(RULES.format(size))
+
+    start: float = time.perf_counter()
+    solver = create_solver(split, rules.problem(literals))
+    status, solution, clauses, conflict = solver.solve(order=get_order(split), **budget)
+    return time.perf_counter() - start, status
+
+
+def peak_memory(sudoku: Sudoku, split: str, budget: Dict[str, Any]) -> int:
+    """
+    The peak of the memory that is allocated while solving a Sudoku, in bytes. The rules are shared between solvers,
+    so they are loaded before measuring. Tracing slows the solver down, so this is a separate run.
+    """
+    RuleBase.load(RULES.format(sudoku[1]))
+    tracemalloc.start()
+    try:
+        solve_once(sudoku, split, budget)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(
+        corpus: str,
+        split: str,
+        sudokus: List[Sudoku],
+        budget: Dict[str, Any],
+        warmup: int,
+        repeat: int,
+        memory: bool
+) -> Dict[str, Any]:
+    """
+    Solves every Sudoku repeat times after solving the first few once as a warmup, and summarises the median time of
+    every Sudoku. A Sudoku counts as solved if every repetition solved it within the budget.
+    """
+    for sudoku in sudokus[:warmup]:
+        solve_once(sudoku, split, budget)
+
+    times: List[float] = []
+    solved: int = 0
+    peaks: List[int] = []
+    for sudoku in sudokus:
+        runs: List[Tuple[float, Status]] = [solve_once(sudoku, split, budget) for _ in range(repeat)]
+        times.append(statistics.median(elapsed for elapsed, status in runs))
+        solved += all(status is Status.SAT for elapsed, status in runs)
+        if memory:
+            peaks.append(peak_memory(sudoku, split, budget))
+
+    return {
+        'corpus': corpus,
+        'split': split,
+        'sudokus': len(sudokus),
+        'solved': solved,
+        'median': percentile(times, 50),
+        'p95': percentile(times, 95),
+        'p99': percentile(times, 99),
+        'mean': statistics.mean(times),
+        'total': sum(times),
+        'peak_memory': max(peaks) if peaks else None,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Returns a message for every configuration that solves fewer Sudokus than in the baseline, or whose median time is
+    more than the tolerance above it. Configurations that the baseline ran on other Sudokus are not compared.
+    """
+    previous: Dict[Tuple[str, str], Dict[str, Any]] = {
+        (result['corpus'], result['split']): result for result in baseline['results']
+    }
+    regressions: List[str] = []
+
+    for result in results:
+        before: Optional[Dict[str, Any]] = previous.get((result['corpus'], result['split']))
+        if before is None or before['sudokus'] != result['sudokus']:
+            continue
+
+        name: str = "{} {}".format(result['corpus'], result['split'])
+        if result['solved'] < before['solved']:
+            regressions.append("{}: solved {} of {}, was {}".format(
+                name, result['solved'], result['sudokus'], before['solved']
+            ))
+        if result['median'] > before['median'] * (1 + tolerance):
+            regressions.append("{}: median {:.2f} ms, was {:.2f} ms".format(
+                name, result['median'] * 1000, before['median'] * 1000
+            ))
+
+    return regressions
+
+
+def print_results(results: List[Dict[str, Any]], baseline: Optional[Dict[str, Any]]):
+    previous: Dict[Tuple[str, str], Dict[str, Any]] = {
+        (result['corpus'], result['split']): result for result in (baseline or {}).get('results', [])
+    }
+
+    columns: str = "{{:<12}} {{:<{}}} {{:>9}} {{:>11}} {{:>11}} {{:>11}} {{:>10}} {{:>9}}".format(
+        max(len(result['split']) for result in results)
+    )
+    print(columns.format(
+        'corpus', 'split', 'solved', 'median ms', 'p95 ms', 'p99 ms', 'peak KiB', 'baseline'
+    ))
+    for result in results:
+        before: Optional[Dict[str, Any]] = previous.get((result['corpus'], result['split']))
+        # The median relative to the baseline, below 1 is faster.
+        ratio: str = "{:.2f}x".format(result['median'] / before['median']) if before and before['median'] else ''
+        print(columns.format(
+            result['corpus'],
+            result['split'],
+            "{}/{}".format(result['solved'], result['sudokus']),
+            "{:.2f}".format(result['median'] * 1000),
+            "{:.2f}".format(result['p95'] * 1000),
+            "{:.2f}".format(result['p99'] * 1000),
+            result['peak_memory'] // 1024 if result['peak_memory'] is not None else '',
+            ratio
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark splits on the Sudoku corpora and compare with a baseline.")
+    parser.add_argument('corpora', type=lambda value: value.split(","),
+                        help="comma separated corpora, files or names in input/sudoku, e.g. top95,damnhard")
+    parser.add_argument('splits', type=lambda value: value.split(","), help="comma separated splits")
+    parser.add_argument('--options', type=lambda value: value.split(","), default=[""],
+                        help="comma separated options to append to every split, e.g. ',watched,watched__luby' runs "
+                             "every split as it is, with the watched engine and with Luby restarts")
+    parser.add_argument('--n', type=int, default=None, help="number of Sudokus per corpus")
+    parser.add_argument('--offset', type=int, default=0, help="index of the first Sudoku of every corpus")
+    parser.add_argument('--warmup', type=int, default=1, help="number of Sudokus to solve before timing")
+    parser.add_argument('--repeat', type=int, default=3, help="number of timed solves of every Sudoku")
+    parser.add_argument('--max-calls', type=int, default=DP_LIMIT, help="budget of DP calls per solve")
+    parser.add_argument('--timeout', type=float, default=None, help="time limit in seconds per solve")
+    parser.add_argument('--memory', action='store_true', help="also measure the peak memory of every Sudoku")
+    parser.add_argument('--save', metavar='FILE', default=None, help="write the results to a JSON file")
+    parser.add_argument('--baseline', metavar='FILE', default=None,
+                        help="compare with the results in a JSON file and exit with status 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help="fraction by which the median may exceed the baseline")
+    args = parser.parse_args()
+
+    budget: Dict[str, Any] = {'max_calls': args.max_calls, 'time_limit': args.timeout}
+    splits: List[str] = [
+        SEPARATOR.join(filter(None, [split, option])) for split in args.splits for option in args.options
+    ]
+    settings: Dict[str, Any] = {
+        'n': args.n, 'offset': args.offset, 'warmup': args.warmup, 'repeat': args.repeat, **budget
+    }
+
+    baseline: Optional[Dict[str, Any]] = None
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline['settings'] != settings:
+            print("The baseline was run with other settings: {}".format(baseline['settings']))
+
+    results: List[Dict[str, Any]] = []
+    for corpus in args.corpora:
+        try:
+            sudokus: List[Sudoku] = load_corpus(corpus, args.n, args.offset)
+        except ValueError as e:
+            print("Skipping corpus: {}".format(e))
+            continue
+        for split in splits:
+            print("Corpus: {}, split: {}".format(corpus, split))
+            results.append(benchmark(corpus, split, sudokus, budget, args.warmup, args.repeat, args.memory))
+
+    if len(results) == 0:
+        print("No corpus was benchmarked.")
+        sys.exit(1)
+    print_results(results, baseline)
+
+    if args.save is not None:
+        with open(args.save, 'w') as save_file:
+            json.dump({
+                'settings': settings,
+                'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+                'results': results,
+            }, save_file, indent=2)
+
+    if baseline is not None:
+        regressions: List[str] = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print("Regression: {}".format(regression))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
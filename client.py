@@ -0,0 +1,78 @@
+import argparse
+import json
+import socket
+from typing import Dict, Any, Optional
+
+from tools.dimacs_writer import write_dimacs
+from tools.printer import print_solution, print_values
+from tools.solve_service import HOST, PORT
+from tools.sudoku_to_dimacs import sudoku_to_literals
+
+parser = argparse.ArgumentParser(description="Solve a DIMACS file or a file of Sudokus on a running solve server.")
+parser.add_argument('split', nargs='?', default=None)
+parser.add_argument('input_filename', nargs='?', default=None)
+parser.add_argument('--sudokus', action='store_true', help="the input is a file with one Sudoku per line")
+parser.add_argument('--n', type=int, default=None, help="number of Sudokus to solve")
+parser.add_argument('--offset', type=int, default=0, help="index of the first Sudoku to solve")
+parser.add_argument('--max-calls', type=int, default=None, help="budget of DP calls per request")
+parser.add_argument('--timeout', type=float, default=None, help="time limit in seconds per request")
+parser.add_argument('--stats', action='store_true', help="print the queue depth and latencies of the server")
+parser.add_argument('--host', default=HOST)
+parser.add_argument('--port', type=int, default=PORT)
+args = parser.parse_args()
+if args.input_filename is None and not args.stats:
+    parser.error("the following arguments are required: split, input_filename")
+
+
+def print_response(response: Dict[str, Any], output_filename: Optional[str] = None):
+    if 'error' in response:
+        print("Error: {}".format(response['error']))
+        return
+
+    success: bool = response['status'] == 'SAT'
+    solution: Optional[Dict[int, bool]] = {
+        abs(literal): literal > 0 for literal in response['solution']
+    } if success else None
+    if success and output_filename is not None:
+        write_dimacs(output_filename, solution)
+
+    print_solution(success, solution)
+    print_values({**response['stats'], 'Latency': response['latency'], 'Wait': response['wait']})
+
+
+# Unset fields are left out, so the server's budget applies to them.
+budget: Dict[str, Any] = {
+    name: value for name, value in (('max_calls', args.max_calls), ('time_limit', args.timeout)) if value is not None
+}
+with socket.create_connection((args.host, args.port)) as connection, connection.makefile('rb') as responses:
+    requests: Dict[int, str] = {}
+
+    if args.input_filename is not None and args.sudokus:
+        # All Sudokus are sent before reading the answers, so the server can solve them in parallel.
+        with open(args.input_filename, 'r') as sudoku_file:
+            for i, sudoku in enumerate(sudoku_file):
+                if i < args.offset or sudoku_to_literals(sudoku) is None:
+                    continue
+                if args.n is not None and i >= args.offset + args.n:
+                    break
+                requests[i] = sudoku
+                connection.sendall(json.dumps({'id': i, 'split': args.split, 'sudoku': sudoku, **budget}).encode() +
+                                   b"\n")
+    elif args.input_filename is not None:
+        with open(args.input_filename, 'r') as input_file:
+            requests[0] = args.input_filename
+            connection.sendall(json.dumps({'id': 0, 'split': args.split, 'cnf': input_file.read(), **budget}).encode() +
+                               b"\n")
+
+    for _ in requests:
+        response: Dict[str, Any] = json.loads(responses.readline())
+        if args.sudokus:
+            print("Sudoku: {}".format(response['id']))
+            print_response(response)
+        else:
+            print("Solved '{}' with heuristic '{}'.".format(args.input_filename, args.split))
+            print_response(response, args.input_filename + '.out')
+
+    if args.stats:
+        connection.sendall(json.dumps({'command': 'stats'}).encode() + b"\n")
+        print_values(json.loads(responses.readline())['stats'])
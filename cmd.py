@@ -8,6 +8,7 @@ input_filename = sys.argv[2]
 
 
 solver = get_solver(split, input_filename)
+solver.verbose = True
 
 success, solution, clauses, conflict = solver.solve(order=get_order(split))
 print_solution(success, solution)
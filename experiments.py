@@ -1,56 +1,189 @@
+import argparse
+import concurrent.futures
+import contextlib
 import csv
-import sys
-from typing import List
+import json
+import multiprocessing
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Tuple, Optional, Any, Callable
 
+from solver.Metrics import Metrics
+from solver.Solver import Status
 from tools.get_solver import get_solver, get_order
 from tools.printer import print_solution, print_stats
 
 
-prefix_input: str = sys.argv[1]
-prefix_output: str = sys.argv[2]
-splits: List[str] = sys.argv[3].split(",")
-n: int = int(sys.argv[4])
-offset: int = int(sys.argv[5])
-end = offset + n
-
-with open("{}-{}-{}.csv".format(prefix_output, offset, end), mode='w', newline='') as stats_file:
-    stats = csv.writer(stats_file)
-
-    stats.writerow([
-        'sudoku',
-        'split',
-        'time',
-        'dp_calls',
-        'split_calls',
-        'solution_attempts',
-        'number_known',
-        'lowest_freq',
-        'highest_freq'
-    ])
-    stats_file.flush()
-
-    print("Processing Sudoku {} to {}".format(str(offset), str(end)))
-    for i in range(offset, end):
-        print("Sudoku: {}".format(str(i)))
-        input_filename = "{}-{}.cnf".format(prefix_input, str(i).zfill(4))
-
-        for split in splits:
-            print("Split:  {}".format(split))
-            solver = get_solver(split, input_filename)
-
-            success, solution, clauses, conflict = solver.solve(order=get_order(split))
-            print_solution(success, solution)
+HEADER = [
+    'sudoku',
+    'split',
+    'time',
+    'dp_calls',
+    'split_calls',
+    'solution_attempts',
+    'number_known',
+    'lowest_freq',
+    'highest_freq',
+    'status'
+]
+
+# A job: the index of a Sudoku and a split.
+Job = Tuple[int, str]
+
+
+def run_job(
+        prefix_input: str,
+        i: int,
+        split: str,
+        timeout: Optional[float] = None,
+        verbose: bool = True,
+        metrics: bool = False
+) -> Tuple[List, Optional[Dict[str, Any]]]:
+    """
+    Solves one Sudoku with one split and returns its CSV row and, if asked for, its metrics. Failures are reported in
+    the status column.
+    """
+    input_filename = "{}-{}.cnf".format(prefix_input, str(i).zfill(4))
+    solver = None
+
+    try:
+        solver = get_solver(split, input_filename)
+        solver.verbose = verbose
+        if metrics:
+            Metrics().attach(solver)
+        result, solution, clauses, conflict = solver.solve(order=get_order(split), time_limit=timeout)
+        if result is Status.UNKNOWN:
+            status = 'timeout' if solver.stopped_by == 'time' else 'unsolved'
+        else:
+            status = 'solved' if result else 'unsat'
+
+        if verbose:
+            print_solution(result, solution)
             print_stats(solver)
+    except Exception as e:
+        print(e)
+        status = 'error'
+
+    if solver is None:
+        return [i, split, '', '', '', '', '', '', '', status], None
+
+    return [
+        i,
+        split,
+        solver.end - solver.start,
+        solver.dp_calls,
+        solver.split_calls,
+        solver.solution_attempts,
+        len(solver.known),
+        solver.frequencies[-1][1] if solver.frequencies else '',
+        solver.frequencies[0][1] if solver.frequencies else '',
+        status
+    ], {'sudoku': i, 'split': split, 'status': status, **solver.metrics.to_dict()} if metrics else None
+
+
+def run_started_job(
+        started,
+        job: Job,
+        prefix_input: str,
+        timeout: Optional[float],
+        verbose: bool,
+        metrics: bool
+) -> Tuple[List, Optional[Dict[str, Any]]]:
+    """Runs a job in a worker process and marks it as started first, so a pool that breaks knows what was running."""
+    started[job] = True
+    return run_job(prefix_input, *job, timeout, verbose, metrics)
+
+
+def run_pool(
+        jobs: List[Job],
+        workers: int,
+        started,
+        write: Callable[[Job, List, Optional[Dict[str, Any]]], None],
+        *args
+) -> Tuple[List[Job], List[Job]]:
+    """
+    Solves the jobs in a new pool of processes and writes their rows as they complete. If a worker dies, e.g. because
+    it ran out of memory, the pool breaks and every job in it that did not complete fails. Returns those jobs: the ones
+    that were running and the ones that had not started yet.
+    """
+    running: List[Job] = []
+    waiting: List[Job] = []
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_started_job, started, job, *args): job for job in jobs}
 
-            stats.writerow([
-                i,
-                split,
-                solver.end - solver.start,
-                solver.dp_calls,
-                solver.split_calls,
-                solver.solution_attempts,
-                len(solver.known),
-                solver.frequencies[-1][1],
-                solver.frequencies[0][1],
-            ])
+        for future in concurrent.futures.as_completed(futures):
+            job: Job = futures[future]
+            try:
+                row, metrics = future.result()
+            except BrokenProcessPool:
+                (running if job in started else waiting).append(job)
+                continue
+            except Exception as e:
+                print(e)
+                row, metrics = [*job, '', '', '', '', '', '', '', 'error'], None
+            write(job, row, metrics)
+
+    return running, waiting
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark split heuristics on a range of converted Sudokus.")
+    parser.add_argument('prefix_input')
+    parser.add_argument('prefix_output')
+    parser.add_argument('splits', type=lambda value: value.split(","))
+    parser.add_argument('n', type=int)
+    parser.add_argument('offset', type=int)
+    parser.add_argument('--workers', type=int, default=1, help="number of processes to solve in parallel")
+    parser.add_argument('--timeout', type=float, default=None, help="time limit in seconds per sudoku and split")
+    parser.add_argument('--metrics', action='store_true',
+                        help="also write the time per part of the search and the depth histograms as JSON lines")
+    args = parser.parse_args()
+
+    end = args.offset + args.n
+    prefix = "{}-{}-{}".format(args.prefix_output, args.offset, end)
+
+    with open(prefix + ".csv", mode='w', newline='') as stats_file, \
+            open(prefix + ".jsonl", mode='w') if args.metrics else contextlib.nullcontext() as metrics_file:
+        stats = csv.writer(stats_file)
+        stats.writerow(HEADER)
+        stats_file.flush()
+
+        def write(row: List, metrics: Optional[Dict[str, Any]]):
+            stats.writerow(row)
             stats_file.flush()
+            if metrics is not None:
+                metrics_file.write(json.dumps(metrics) + "\n")
+                metrics_file.flush()
+
+        print("Processing Sudoku {} to {}".format(str(args.offset), str(end)))
+        if args.workers <= 1:
+            for i in range(args.offset, end):
+                print("Sudoku: {}".format(str(i)))
+                for split in args.splits:
+                    print("Split:  {}".format(split))
+                    write(*run_job(args.prefix_input, i, split, args.timeout, metrics=args.metrics))
+            return
+
+        # Rows are written in order of completion. Every row is tagged with its Sudoku and split.
+        def write_job(job: Job, row: List, metrics: Optional[Dict[str, Any]]):
+            print("Sudoku: {}, split: {}, status: {}".format(*job, row[-1]))
+            write(row, metrics)
+
+        jobs: List[Job] = [(i, split) for i in range(args.offset, end) for split in args.splits]
+        job_args = (args.prefix_input, args.timeout, False, args.metrics)
+        with multiprocessing.Manager() as manager:
+            started = manager.dict()
+            while len(jobs) != 0:
+                running, jobs = run_pool(jobs, args.workers, started, write_job, *job_args)
+
+                # The jobs that were running when a worker died are solved again one at a time, so only the job that
+                # killed its worker fails. The jobs that had not started go to a new pool.
+                for job in running:
+                    del started[job]
+                    if run_pool([job], 1, started, write_job, *job_args) != ([], []):
+                        print("Sudoku: {}, split: {}: the worker process died".format(*job))
+                        write_job(job, [*job, '', '', '', '', '', '', '', 'error'], None)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,16 @@ from tools.dimacs_writer import write_dimacs
 from tools.get_solver import get_solver, get_order
 from tools.printer import print_solution, print_stats
 
-splits = {'-S1': 'fifo__positive_only', '-S2': 'mfld__positive_only', '-S3': 'dlis__positive_only', '-S4': 'dcls__positive_only'}
+splits = {
+    '-S1': 'fifo__positive_only',
+    '-S2': 'mfld__positive_only',
+    '-S3': 'dlis__positive_only',
+    '-S4': 'dlcs__positive_only',
+    '-S5': 'cdcl__positive_only',
+    '-S6': 'portfolio',
+}
 if sys.argv[1] not in splits:
-    print("Value of first argument is '{}', '-S1' '-S2', '-S3' or '-S4' expected.".format(sys.argv[1]))
+    print("Value of first argument is '{}', '-S1' '-S2', '-S3', '-S4', '-S5' or '-S6' expected.".format(sys.argv[1]))
 elif not os.path.exists(sys.argv[2]):
     print("File from second argument does not exist: '{}'".format(sys.argv[2]))
 else:
@@ -17,6 +24,7 @@ else:
     try:
         print("Solving '{}' with heuristic '{}'.".format(input_filename, split))
         solver = get_solver(split, input_filename)
+        solver.verbose = True
         success, solution, clauses, conflict = solver.solve(order=get_order(split))
         if success:
             write_dimacs(input_filename + '.out', solution)
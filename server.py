@@ -0,0 +1,24 @@
+import argparse
+import asyncio
+import glob
+import os
+
+from solver.Solver import DP_LIMIT
+from tools.solve_service import SolveService, HOST, PORT
+
+parser = argparse.ArgumentParser(description="Serve solve requests on localhost from a pool of warm worker processes.")
+parser.add_argument('--host', default=HOST)
+parser.add_argument('--port', type=int, default=PORT)
+parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of worker processes")
+parser.add_argument('--rules', type=lambda value: value.split(","),
+                    default=sorted(glob.glob(os.path.join('input', 'rules', '*.txt'))),
+                    help="comma separated rules files that every worker parses up front")
+parser.add_argument('--max-calls', type=int, default=DP_LIMIT, help="budget of DP calls of requests without one")
+parser.add_argument('--timeout', type=float, default=None, help="time limit in seconds of requests without one")
+args = parser.parse_args()
+
+service = SolveService(args.workers, args.rules, {'max_calls': args.max_calls, 'time_limit': args.timeout})
+try:
+    asyncio.run(service.serve(args.host, args.port))
+except KeyboardInterrupt:
+    pass
@@ -0,0 +1,105 @@
+from typing import Dict, List, Iterable
+
+DECAY = 0.95
+RESCALE_LIMIT = 1e100
+
+
+class ActivityHeap:
+    """
+    Indexed binary max-heap of variables ordered by their activity. Bumping a variable moves it up in place, instead of
+    re-sorting all variables. Decaying is done by growing the bump increment, so older bumps count less.
+    """
+
+    def __init__(self, variables: Iterable[int], activity: Dict[int, float] = None, decay: float = DECAY):
+        self.activity: Dict[int, float] = {variable: 0.0 for variable in variables}
+        if activity is not None:
+            self.activity.update(activity)
+        self.increment: float = 1.0
+        self.decay_factor: float = decay
+
+        self.heap: List[int] = []
+        self.indices: Dict[int, int] = {}
+        for variable in self.activity:
+            self.push(variable)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, variable: int) -> bool:
+        return variable in self.indices
+
+    def push(self, variable: int):
+        """Adds a variable, if it is not in the heap yet. Variables that are new start without activity."""
+        if variable in self.indices:
+            return
+
+        self.activity.setdefault(variable, 0.0)
+
+        self.indices[variable] = len(self.heap)
+        self.heap.append(variable)
+        self._sift_up(len(self.heap) - 1)
+
+    def pop(self) -> int:
+        """Removes and returns the variable with the highest activity."""
+        top: int = self.heap[0]
+        last: int = self.heap.pop()
+        del self.indices[top]
+
+        if self.heap:
+            self.heap[0] = last
+            self.indices[last] = 0
+            self._sift_down(0)
+
+        return top
+
+    def bump(self, variable: int):
+        """Increases the activity of a variable by the current increment."""
+        self.activity[variable] += self.increment
+
+        if self.activity[variable] > RESCALE_LIMIT:
+            # Scale everything down to keep the floats in range. The order of the heap does not change.
+            for _variable in self.activity:
+                self.activity[_variable] /= RESCALE_LIMIT
+            self.increment /= RESCALE_LIMIT
+
+        if variable in self.indices:
+            self._sift_up(self.indices[variable])
+
+    def decay(self):
+        """Makes all earlier bumps relatively less important."""
+        self.increment /= self.decay_factor
+
+    def _sift_up(self, index: int):
+        variable: int = self.heap[index]
+        activity: float = self.activity[variable]
+
+        while index > 0:
+            parent: int = (index - 1) >> 1
+            if self.activity[self.heap[parent]] >= activity:
+                break
+            self.heap[index] = self.heap[parent]
+            self.indices[self.heap[index]] = index
+            index = parent
+
+        self.heap[index] = variable
+        self.indices[variable] = index
+
+    def _sift_down(self, index: int):
+        variable: int = self.heap[index]
+        activity: float = self.activity[variable]
+        size: int = len(self.heap)
+
+        while True:
+            child: int = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and self.activity[self.heap[child + 1]] > self.activity[self.heap[child]]:
+                child += 1
+            if self.activity[self.heap[child]] <= activity:
+                break
+            self.heap[index] = self.heap[child]
+            self.indices[self.heap[index]] = index
+            index = child
+
+        self.heap[index] = variable
+        self.indices[variable] = index
@@ -0,0 +1,270 @@
+from typing import List, Dict, Set, Tuple, Optional, Iterator, Iterable, Sequence
+
+from mxklabs.dimacs import Dimacs
+
+from solver.ActivityHeap import ActivityHeap
+from solver.ClauseDatabase import watch_index, UNASSIGNED, TRUE, NO_REASON
+from solver.Solver import Solver, ENGINE_WATCHED, PURE_LITERALS, MAX_VARIABLE
+
+
+class CDCL(Solver):
+    """Conflict Driven Clause Learning with 1-UIP learned clauses and non-chronological backjumping."""
+
+    def __init__(
+            self,
+            problem: Dimacs,
+            pure_literals: bool = PURE_LITERALS,
+            engine: Optional[str] = None,
+            restarts: Optional[str] = None,
+            phase_saving: bool = False
+    ):
+        # Conflict analysis needs the implication reasons, which only the watched literals engine records.
+        if engine not in (None, ENGINE_WATCHED):
+            raise ValueError("CDCL requires the '{}' engine.".format(ENGINE_WATCHED))
+        super().__init__(problem, pure_literals, ENGINE_WATCHED, restarts, phase_saving)
+
+        # Decisions follow the variables that took part in the most recent conflicts. Like the conflict analysis, the
+        # heap works on the dense variables of the clause database.
+        self.heap: ActivityHeap = ActivityHeap(range(1, len(self.database.names)))
+
+        # Benchmark variables.
+        self.learned_clauses: int = 0
+        self.backjumps: int = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            **super().stats(),
+            'Learned clauses': self.learned_clauses,
+            'Backjumps': self.backjumps,
+        }
+
+    def _reset_stats(self):
+        super()._reset_stats()
+        self.learned_clauses = 0
+        self.backjumps = 0
+
+    def _add_variables(self, variables: Iterable[int]):
+        variables: List[int] = [*variables]
+        super()._add_variables(variables)
+        for variable in variables:
+            self.heap.push(self.database.index[variable])
+
+    def iter_solutions(
+            self,
+            limit: Optional[int] = None,
+            assumptions: Iterable[int] = (),
+            **solve_vars
+    ) -> Iterator[Dict[int, Optional[bool]]]:
+        """
+        Yields different solutions, at most limit, until there are no more (the status is UNSAT) or the search stops
+        early (UNKNOWN). Every call of solve() gets the full budget. A blocking clause of the decisions keeps the search
+        for the next solution away from the ones that were found, the learned clauses are kept. The blocking clauses
+        all contain the negation of a new selector variable, which is assumed to be True while enumerating and fixed to
+        False afterwards, so they don't affect later calls of solve(). The other splits learn nothing, so they don't
+        enumerate: every solution would be a complete search from the top again.
+        """
+        selector: int = min(self.selectors, default=MAX_VARIABLE + 1) - 1
+        self.selectors.add(selector)
+        assumptions: List[int] = [selector, *assumptions]
+        found: int = 0
+
+        try:
+            while limit is None or found < limit:
+                status, solution, clauses, conflict = self.solve(assumptions=assumptions, **solve_vars)
+                if not status:
+                    return
+                found += 1
+                yield solution
+                self.add_clause([selector * -1, *self._blocking_clause()])
+        finally:
+            self.add_clause([selector * -1])
+            self.assumptions = [literal for literal in self.assumptions if literal != selector]
+            if self.core is not None:
+                self.core = [literal for literal in self.core if literal != selector]
+
+    def count_solutions(self, limit: Optional[int] = 2, **solve_vars) -> int:
+        """
+        Counts the solutions up to the limit, e.g. 2 to find out if a problem has exactly one. The count is only exact
+        if the status is UNSAT afterwards, UNKNOWN means that the search stopped before it found them all.
+        """
+        return sum(1 for _ in self.iter_solutions(limit, **solve_vars))
+
+    def _blocking_clause(self) -> List[int]:
+        """
+        A clause that only the last solution violates. Every variable is assigned by the decisions and propagation, so
+        the negation of the decisions (the first assignment of every decision level that is not empty) suffices, and is
+        a lot shorter than the negation of the solution.
+        """
+        bounds: List[int] = [*self.trail_lim, len(self.trail)]
+        return [
+            self.database.decode(-variable if self.values[variable] == TRUE else variable)
+            for variable in dict.fromkeys(self.trail[start][0] for start, end in zip(bounds, bounds[1:]) if start < end)
+        ]
+
+    def _complete(self, **extra_vars) -> bool:
+        # Learned clauses force the other value after a conflict, whatever the preferred direction.
+        return True
+
+    # noinspection PyMethodOverriding
+    def _dp(
+            self,
+            clauses: List[Set[int]],
+            solution: Dict[int, Optional[bool]],
+            order: List[bool]
+    ) -> Tuple[bool, Optional[Dict[int, bool]], List[Set[int]], Optional[int]]:
+        while True:
+            self._count_dp_call()
+
+            success, conflicting_variable = self._propagate(solution)
+            if not success:
+                self._conflict(conflicting_variable)
+
+                # A conflict without any decisions means that the problem is unsatisfiable.
+                if self.decision_level == 0 or self.conflict_clause is None:
+                    self.core = []
+                    return False, solution, clauses, conflicting_variable
+
+                learned, level = self._analyze(self.conflict_clause, solution)
+                if self.decision_level - level > 1:
+                    self.backjumps += 1
+                self._backtrack(level)
+                self._learn(learned, solution)
+                # The learned clauses keep the search complete, so it can start over from the top at any time.
+                if self.restart_due:
+                    self._restart(0)
+                continue
+
+            # The assumptions are decided first, each on a level of its own, so backjumps only undo the ones that take
+            # part in a conflict. An assumption that is already True still gets its (empty) level.
+            if self.decision_level < len(self.assumptions):
+                literal: int = self.database.encode(self.assumptions[self.decision_level])
+                value: int = self.values[abs(literal)]
+                if value != UNASSIGNED and (value == TRUE) != (literal > 0):
+                    self.core = self._analyze_final(literal)
+                    return False, solution, clauses, None
+
+                self._new_decision_level()
+                if value == UNASSIGNED:
+                    self._assign(literal)
+                continue
+
+            literal: Optional[int] = next(self._split(clauses, solution, order=order), None)
+            if literal is None:
+                # Every variable is assigned without conflicts, so every clause is satisfied.
+                return True, solution, [], None
+
+            self.split_calls += 1
+            self._new_decision_level()
+            self._enqueue(literal, solution)
+
+    def _analyze(self, conflict_clause: int, solution: Dict[int, Optional[bool]]) -> Tuple[List[int], int]:
+        """
+        Resolves the conflicting clause with the reasons of its literals until only one literal of the current decision
+        level remains (the first unique implication point). Returns the learned clause of dense literals, with the
+        asserting literal first, and the level to backjump to.
+        """
+        seen: Set[int] = set()
+        learned: List[int] = []
+        pending: int = 0
+        position: int = len(self.trail) - 1
+        clause: Sequence[int] = self._explain(conflict_clause)
+        variable: Optional[int] = None
+
+        while True:
+            for literal in clause:
+                _variable: int = abs(literal)
+                if _variable == variable or _variable in seen or self.levels[_variable] == 0:
+                    continue
+
+                seen.add(_variable)
+                self.heap.bump(_variable)
+                if self.levels[_variable] == self.decision_level:
+                    pending += 1
+                else:
+                    learned.append(literal)
+
+            # Walk back over the trail to the most recent assignment that takes part in the conflict.
+            while self.trail[position][0] not in seen:
+                position -= 1
+            variable = self.trail[position][0]
+            position -= 1
+            pending -= 1
+
+            if pending == 0:
+                break
+            clause = self._explain(self.reasons[variable])
+
+        self.heap.decay()
+
+        # The negation of the first unique implication point becomes the asserting literal.
+        learned.insert(0, -variable if self.values[variable] == TRUE else variable)
+
+        if len(learned) == 1:
+            return learned, 0
+
+        # Watch the literal of the highest remaining level as well, since it is the last one to become unassigned.
+        highest: int = max(range(1, len(learned)), key=lambda i: self.levels[abs(learned[i])])
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def _analyze_final(self, literal: int) -> List[int]:
+        """
+        Finds the assumptions that force the dense literal of an assumption to be False, by following the reasons of
+        the assignments back to the decisions, which are all assumptions at this point. Returns the core: these
+        assumptions and the failed one, in the order in which they were given.
+        """
+        core: Set[int] = {literal}
+        seen: Set[int] = {abs(literal)}
+
+        if self.levels[abs(literal)] != 0:
+            for position in range(len(self.trail) - 1, self.trail_lim[0] - 1, -1):
+                variable: int = self.trail[position][0]
+                if variable not in seen:
+                    continue
+
+                if self.reasons[variable] == NO_REASON:
+                    core.add(variable if self.values[variable] == TRUE else -variable)
+                    continue
+                for _literal in self._explain(self.reasons[variable]):
+                    if self.levels[abs(_literal)] != 0:
+                        seen.add(abs(_literal))
+
+        core: Set[int] = {*map(self.database.decode, core)}
+        return [assumption for assumption in self.assumptions if assumption in core]
+
+    def _learn(self, learned: List[int], solution: Dict[int, Optional[bool]]):
+        """Adds the learned clause and assigns its asserting literal."""
+        self.learned_clauses += 1
+
+        if len(learned) == 1:
+            self.units.append(learned[0])
+            self._assign(learned[0])
+            return
+
+        index: int = self.database.add(learned)
+        self.watches[watch_index(learned[0])].append(index)
+        self.watches[watch_index(learned[1])].append(index)
+        self._assign(learned[0], index)
+
+    def _backtrack(self, level: int):
+        # Unassigned variables become available for decisions again.
+        if level < len(self.trail_lim):
+            for variable, removed, shrunk in self.trail[self.trail_lim[level]:]:
+                self.heap.push(variable)
+
+        super()._backtrack(level)
+
+    # noinspection PyMethodOverriding
+    def _split_literals(
+            self,
+            clauses: List[Set[int]],
+            solution: Dict[int, Optional[bool]],
+            order: List[bool]
+    ) -> Iterator[int]:
+        # Conflicts take care of the other direction, so only the preferred direction is used for decisions. Assigned
+        # variables are dropped from the heap here and pushed back when they are unassigned.
+        while len(self.heap) != 0:
+            variable: int = self.heap.pop()
+            if self.values[variable] == UNASSIGNED:
+                name: int = self.database.names[variable]
+                yield name if order[0] else name * -1
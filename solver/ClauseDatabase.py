@@ -0,0 +1,134 @@
+import itertools
+import sys
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, List, Iterable, Iterator, Optional
+
+# The values of a variable in an assignment byte array.
+UNASSIGNED = 0
+TRUE = 1
+FALSE = 2
+
+# The reason of a variable that was not implied by a clause.
+NO_REASON = -1
+
+
+def watch_index(literal: int) -> int:
+    """The position of the watch list of a dense literal: 2v for v and 2v + 1 for -v."""
+    return (literal << 1) if literal > 0 else ((-literal << 1) | 1)
+
+
+def constraint_reason(index: int) -> int:
+    """
+    The reason of a variable that was implied by the cardinality constraint with the given index. Reasons below
+    NO_REASON refer to constraints, the others to clauses. The mapping is its own inverse.
+    """
+    return NO_REASON - 1 - index
+
+
+class ClauseDatabase:
+    """
+    Clauses over densely renumbered variables, stored as one flat array with the literals of all clauses and an array
+    with the offset of every clause in it, like the compact form of read_dimacs. Clause i consists of
+    literals[offsets[i]:offsets[i + 1]]. Variable v stands for names[v], the variable in the original problem, and
+    index maps the original variables back to their dense number. Variable 0 is not used, so literals keep their sign.
+    """
+
+    __slots__ = ('names', 'index', 'literals', 'offsets')
+
+    def __init__(self, names: array, index: Dict[int, int], literals: array, offsets: array):
+        self.names: array = names
+        self.index: Dict[int, int] = index
+        self.literals: array = literals
+        self.offsets: array = offsets
+
+    @staticmethod
+    def from_clauses(clauses: Iterable[Iterable[int]], variables: Iterable[int]) -> 'ClauseDatabase':
+        """Numbers the variables in ascending order and stores the clauses with the new numbers."""
+        names: array = array('i', [0, *sorted(variables)])
+        index: Dict[int, int] = {name: variable for variable, name in enumerate(names) if variable != 0}
+
+        database: ClauseDatabase = ClauseDatabase(names, index, array('i'), array('i', [0]))
+        for clause in clauses:
+            database.add(map(database.encode, clause))
+        return database
+
+    def copy(self, variables: Iterable[int] = ()) -> 'ClauseDatabase':
+        """
+        Copies the clauses, which are mutated while solving. The numbering is shared, unless variables that don't occur
+        in the clauses are added, which are numbered after the existing ones.
+        """
+        database: ClauseDatabase = ClauseDatabase(self.names, self.index, self.literals[:], self.offsets[:])
+        database.add_variables(variables)
+        return database
+
+    def add_variables(self, variables: Iterable[int]):
+        """
+        Numbers the variables that are new after the existing ones. The numbering may be shared with other databases,
+        so it is replaced rather than changed in place.
+        """
+        variables: List[int] = [variable for variable in dict.fromkeys(variables) if variable not in self.index]
+        if variables:
+            self.index = {**self.index, **{name: variable for variable, name in enumerate(variables, len(self.names))}}
+            self.names = self.names + array('i', variables)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_vars(self) -> int:
+        return len(self.names) - 1
+
+    def add(self, literals: Iterable[int]) -> int:
+        """Appends a clause of dense literals. Returns its index."""
+        self.literals.extend(literals)
+        self.offsets.append(len(self.literals))
+        return len(self.offsets) - 2
+
+    def clause(self, index: int) -> array:
+        return self.literals[self.offsets[index]:self.offsets[index + 1]]
+
+    def encode(self, literal: int) -> int:
+        """The dense literal of an original literal."""
+        return self.index[literal] if literal > 0 else -self.index[-literal]
+
+    def decode(self, literal: int) -> int:
+        """The original literal of a dense literal."""
+        return self.names[literal] if literal > 0 else -self.names[-literal]
+
+    def decode_clause(self, index: int) -> List[int]:
+        return [*map(self.decode, self.clause(index))]
+
+    def nbytes(self) -> int:
+        """The memory taken by the clauses. The numbering is left out, because it is usually shared."""
+        return sys.getsizeof(self.literals) + sys.getsizeof(self.offsets)
+
+
+class Assignment(MutableMapping):
+    """
+    The values of the dense variables of a clause database in a byte array, read and written by the original variables.
+    Can be used wherever a solution dictionary is used.
+    """
+
+    __slots__ = ('names', 'index', 'values')
+
+    def __init__(self, database: ClauseDatabase, values: Optional[bytearray] = None):
+        self.names: array = database.names
+        self.index: Dict[int, int] = database.index
+        self.values: bytearray = values if values is not None else bytearray(len(database.names))
+
+    def __getitem__(self, variable: int) -> Optional[bool]:
+        value: int = self.values[self.index[variable]]
+        return None if value == UNASSIGNED else value == TRUE
+
+    def __setitem__(self, variable: int, value: Optional[bool]):
+        self.values[self.index[variable]] = UNASSIGNED if value is None else TRUE if value else FALSE
+
+    def __delitem__(self, variable: int):
+        raise TypeError("Variables can't be removed from an assignment.")
+
+    def __iter__(self) -> Iterator[int]:
+        return itertools.islice(self.names, 1, None)
+
+    def __len__(self) -> int:
+        return len(self.names) - 1
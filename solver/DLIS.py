@@ -1,5 +1,4 @@
-import copy
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Dict, Set, Tuple, Optional, Iterator
 from solver.Solver import Solver
 
 
@@ -7,30 +6,33 @@ class DLIS(Solver):
     """Dynamic Largest Individual Sum split."""
 
     # noinspection PyMethodOverriding, DuplicatedCode
-    def _split(
+    def _split_literals(
             self,
             clauses: List[Set[int]],
-            solution: Dict[int, bool],
+            solution: Dict[int, Optional[bool]],
             order: List[bool]
-    ) -> Tuple[bool, Dict[int, bool], List[Set[int]], Optional[int]]:
-        # Get all variables from the clauses.
-        unresolved_variables = {variable for variable, polarity in solution.items() if polarity is None}
+    ) -> Iterator[int]:
+        # Read the occurrences of both literals of every open variable that still occurs in the clauses.
+        occurrences: Dict[int, int] = self._literal_occurrences(clauses)
         frequencies: Dict[int, int] = {}
 
-        for clause in clauses:
-            for literal in clause:
-                variable = abs(literal)
+        for variable, polarity in solution.items():
+            if polarity is not None:
+                continue
 
-                if variable not in unresolved_variables:
-                    continue
+            if occurrences[variable] == 0 and occurrences[variable * -1] == 0:
+                continue
 
-                if literal not in frequencies:
-                    frequencies[literal] = 0
+            frequencies[variable] = occurrences[variable]
+            frequencies[variable * -1] = occurrences[variable * -1]
 
-                if literal * -1 not in frequencies:
-                    # This should never happen, because it indicates the existence of a pure literal.
-                    frequencies[literal * -1] = 0
-                frequencies[literal] += 1
+        # The variables that are left occur in no open clause, they only need a value (see Solver._solved).
+        if len(frequencies) == 0:
+            unresolved_variables: List[int] = [variable for variable, polarity in solution.items() if polarity is None]
+            for direction in order:
+                for variable in unresolved_variables:
+                    yield variable if direction else variable * -1
+            return
 
         # We will resolve the open variables in order of total frequency (both negative and positive literals
         # combined).
@@ -38,21 +40,4 @@ class DLIS(Solver):
 
         for direction in order:
             for literal, frq in sort:
-                _literal = literal if frequencies[literal] > frequencies[literal * -1] and direction else literal * -1
-
-                # Make a deep copy, because otherwise it gets stuck with clause simplifications from previous
-                # attempts.
-                clauses_copy = copy.deepcopy(clauses)
-                solution_copy = {**solution}
-
-                # Add the literal to the solution.
-                if not self._resolve(_literal, clauses_copy, solution_copy):
-                    continue
-
-                # Re-run the DP algorithm with the new literal value added to the solution.
-                success, _solution, _clauses, conflict = self._dp(clauses_copy, solution_copy, order=order)
-
-                if success:
-                    return success, _solution, _clauses, None
-
-        return False, solution, clauses, None
+                yield literal if frequencies[literal] > frequencies[literal * -1] and direction else literal * -1
@@ -1,6 +1,5 @@
 import collections
-import copy
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Dict, Set, Optional, Iterator
 
 from solver.Solver import Solver
 
@@ -9,13 +8,13 @@ class MFLD(Solver):
     """Most Frequent Last Digit split"""
 
     # noinspection PyMethodOverriding,DuplicatedCode
-    def _split(
+    def _split_literals(
             self,
             clauses: List[Set[int]],
-            solution: Dict[int, bool],
+            solution: Dict[int, Optional[bool]],
             order: List[bool],
             reverse: bool = False
-    ) -> Tuple[bool, Dict[int, bool], List[Set[int]], Optional[int]]:
+    ) -> Iterator[int]:
         most_common = collections.Counter([
             variable % 10 for variable, polarity in solution.items()
             if polarity is True
@@ -30,21 +29,4 @@ class MFLD(Solver):
 
         for direction in order:
             for variable in unresolved_variables:
-                literal: int = variable if direction else variable * -1
-
-                # Make a deep copy, because otherwise it gets stuck with clause simplifications from previous
-                # attempts.
-                clauses_copy = copy.deepcopy(clauses)
-                solution_copy = {**solution}
-
-                # Add the literal to the solution.
-                if not self._resolve(literal, clauses_copy, solution_copy):
-                    continue
-
-                # Re-run the DP algorithm with the new literal value added to the solution.
-                success, _solution, _clauses, conflict = self._dp(clauses_copy, solution_copy, order=order)
-
-                if success:
-                    return success, _solution, _clauses, None
-
-        return False, solution, clauses, None
+                yield variable if direction else variable * -1
@@ -0,0 +1,193 @@
+import collections
+import functools
+import time
+from typing import Dict, List, Iterator, Callable, Optional, Any
+
+# The parts of the search that the time is divided into.
+PROPAGATION = 'propagation'
+SPLIT = 'split'
+BACKTRACK = 'backtrack'
+ANALYSIS = 'analysis'
+OTHER = 'other'
+PARTS = [PROPAGATION, SPLIT, BACKTRACK, ANALYSIS, OTHER]
+
+# The methods of a solver that are timed and the part that their time counts for. The split generators returned by
+# _split are timed on every literal they yield. Methods that call each other are timed exclusively, e.g. the time that
+# the sets engine spends resolving literals while simplifying only counts once, and time that is not spent in any of
+# them counts as other.
+TIMED = {
+    '_simplify': PROPAGATION,
+    '_resolve': PROPAGATION,
+    '_propagate': PROPAGATION,
+    '_open_clauses': SPLIT,
+    '_backtrack': BACKTRACK,
+    '_analyze': ANALYSIS,
+    '_analyze_final': ANALYSIS,
+    '_learn': ANALYSIS,
+}
+
+
+class Metrics:
+    """
+    Measures where a solver spends its time (propagation, split selection, backtracking and conflict analysis), the
+    number of assignments made while propagating, and how deep the decisions and conflicts are. Attaching it wraps the
+    methods of one solver instance, so solvers without metrics run the same code as before. Like the other benchmark
+    variables, the metrics describe the last call of solve().
+
+    The events of the search are reported to decision(), conflict() and restart(), which can be overridden to follow
+    the search as it happens.
+    """
+
+    def __init__(self):
+        self.times: Dict[str, float] = dict.fromkeys(PARTS, 0.0)
+        self.propagations: int = 0
+        # The number of decisions and conflicts on every decision level, and the levels that restarts returned to.
+        self.decision_levels: Dict[int, int] = collections.Counter()
+        self.conflict_levels: Dict[int, int] = collections.Counter()
+        self.restart_levels: Dict[int, int] = collections.Counter()
+
+        # The parts that are being timed, innermost last, and the moment the innermost one was entered or resumed.
+        self.stack: List[str] = []
+        self.since: float = 0
+
+    def attach(self, solver) -> 'Metrics':
+        """Instruments a solver. Its stats include the metrics from now on."""
+        for name, part in TIMED.items():
+            if hasattr(solver, name):
+                setattr(solver, name, self._timed(getattr(solver, name), part, solver))
+        solver._dp = self._timed(solver._dp, OTHER, solver)
+        solver._split = self._timed_split(solver._split)
+        solver._new_decision_level = self._decision_hook(solver._new_decision_level, solver)
+        solver._conflict = self._conflict_hook(solver._conflict, solver)
+        solver._restart = self._restart_hook(solver._restart, solver)
+        solver.metrics = self
+        return self
+
+    def detach(self, solver):
+        """Removes the instrumentation, the methods of the class are used again."""
+        for name in [*TIMED, '_dp', '_split', '_new_decision_level', '_conflict', '_restart']:
+            solver.__dict__.pop(name, None)
+        solver.metrics = None
+
+    def reset(self):
+        self.times = dict.fromkeys(PARTS, 0.0)
+        self.propagations = 0
+        self.decision_levels.clear()
+        self.conflict_levels.clear()
+        self.restart_levels.clear()
+
+    def decision(self, level: int):
+        """Called for every new decision level, with its level."""
+        self.decision_levels[level] += 1
+
+    def conflict(self, level: int):
+        """Called for every conflict, with the decision level on which it happened."""
+        self.conflict_levels[level] += 1
+
+    def restart(self, level: int):
+        """Called for every restart, with the decision level that it returns to."""
+        self.restart_levels[level] += 1
+
+    @property
+    def total(self) -> float:
+        return sum(self.times.values())
+
+    def propagations_per_second(self) -> float:
+        return self.propagations / self.times[PROPAGATION] if self.times[PROPAGATION] else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """A summary for print_stats, the full metrics are in to_dict()."""
+        return {
+            **{'{} time'.format(part.capitalize()): self.times[part] for part in PARTS},
+            'Propagations per second': round(self.propagations_per_second()),
+            'Deepest decision': max(self.decision_levels, default=0),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The metrics as plain values, to be exported as JSON."""
+        return {
+            'times': {**self.times},
+            'total': self.total,
+            'propagations': self.propagations,
+            'propagations_per_second': self.propagations_per_second(),
+            'decision_levels': dict(sorted(self.decision_levels.items())),
+            'conflict_levels': dict(sorted(self.conflict_levels.items())),
+            'restart_levels': dict(sorted(self.restart_levels.items())),
+        }
+
+    def _enter(self, part: str):
+        now: float = time.perf_counter()
+        if len(self.stack) != 0:
+            self.times[self.stack[-1]] += now - self.since
+        self.stack.append(part)
+        self.since = now
+
+    def _exit(self):
+        now: float = time.perf_counter()
+        self.times[self.stack.pop()] += now - self.since
+        self.since = now
+
+    def _timed(self, method: Callable, part: str, solver) -> Callable:
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            # Assignments are counted by the outermost propagation only, nested ones are part of it.
+            counting: bool = part == PROPAGATION and PROPAGATION not in self.stack
+            trail: int = len(solver.trail)
+            self._enter(part)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._exit()
+                if counting:
+                    self.propagations += len(solver.trail) - trail
+
+        return timed
+
+    def _timed_split(self, split: Callable) -> Callable:
+        @functools.wraps(split)
+        def timed(*args, **kwargs) -> Iterator[int]:
+            return self._timed_literals(split(*args, **kwargs))
+
+        return timed
+
+    def _timed_literals(self, literals: Iterator[int]) -> Iterator[int]:
+        # The heuristic does its work lazily, when the next literal is asked for.
+        try:
+            while True:
+                self._enter(SPLIT)
+                try:
+                    literal: Optional[int] = next(literals, None)
+                finally:
+                    self._exit()
+                if literal is None:
+                    return
+                yield literal
+        finally:
+            # Closing a split undoes its bookkeeping, which has to happen right away (see VSIDS).
+            literals.close()
+
+    def _decision_hook(self, method: Callable, solver) -> Callable:
+        @functools.wraps(method)
+        def hooked(*args, **kwargs):
+            level: int = method(*args, **kwargs)
+            self.decision(solver.decision_level)
+            return level
+
+        return hooked
+
+    def _conflict_hook(self, method: Callable, solver) -> Callable:
+        @functools.wraps(method)
+        def hooked(*args, **kwargs):
+            # Reported before the budget of conflicts is checked, the conflict happened either way.
+            self.conflict(solver.decision_level)
+            return method(*args, **kwargs)
+
+        return hooked
+
+    def _restart_hook(self, method: Callable, solver) -> Callable:
+        @functools.wraps(method)
+        def hooked(level: int):
+            self.restart(level)
+            return method(level)
+
+        return hooked
@@ -0,0 +1,179 @@
+import multiprocessing
+import queue
+import time
+from typing import List, Dict, Set, Optional, Iterator, Iterable, Tuple
+
+from mxklabs.dimacs import Dimacs
+
+from solver.Solver import Solver, Status, CancellationToken, BudgetExceeded, PURE_LITERALS, DP_LIMIT
+
+# The heuristic/direction combinations that race each other by default.
+PORTFOLIO = [
+    'cdcl__positive_only',
+    'vsids__positive_only__watched',
+    'fifo__positive_only__watched',
+    'mfld__positive_only__watched',
+    'dlis__positive_only__watched',
+    'dlcs__positive_only__watched',
+]
+
+
+def _run_member(
+        split: str,
+        problem: Dimacs,
+        results: multiprocessing.Queue,
+        budget: Dict[str, Optional[float]],
+        added_clauses: List[Tuple[int, ...]],
+        assumptions: List[int]
+):
+    """Solves the problem with one split in a worker process and reports the outcome with its benchmark variables."""
+    # Imported here, because get_solver itself knows about the Portfolio.
+    from tools.get_solver import create_solver, get_order
+
+    member = create_solver(split, problem)
+    for clause in added_clauses:
+        member.add_clause(clause)
+    status, solution, clauses, conflict = member.solve(order=get_order(split), assumptions=assumptions, **budget)
+
+    results.put((split, status, solution if status else None, member.core, member.dp_calls, member.split_calls,
+                 member.solution_attempts, member.stats()))
+
+
+class Portfolio(Solver):
+    """Races several splits in parallel processes and takes the first solution."""
+
+    def __init__(
+            self,
+            problem: Dimacs,
+            pure_literals: bool = PURE_LITERALS,
+            engine: Optional[str] = None,
+            restarts: Optional[str] = None,
+            phase_saving: bool = False,
+            splits: List[str] = None
+    ):
+        # Every member picks its own engine, restarts and phase saving through its split.
+        if engine is not None or restarts is not None or phase_saving:
+            raise ValueError("The portfolio does not take an engine, restarts or phase saving, set them on its splits "
+                             "instead.")
+        super().__init__(problem, pure_literals)
+
+        self.problem: Dimacs = problem
+        self.splits: List[str] = splits or PORTFOLIO
+        # The members are created anew for every solve(), so they add the clauses that were added since themselves.
+        self.added_clauses: List[Tuple[int, ...]] = []
+
+        # Benchmark variables. The stats of the member that decided the last solve(), the portfolio itself does not
+        # search.
+        self.winner: Optional[str] = None
+        self.winner_stats: Dict[str, float] = {}
+        self.outcomes: Dict[str, str] = {}
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            **super().stats(),
+            # The time and the status are those of the race.
+            **{name: value for name, value in self.winner_stats.items() if name not in ('Time', 'Status', 'Stopped')},
+            'Winner': self.winner,
+            **self.outcomes,
+        }
+
+    def solve(
+            self,
+            max_calls: Optional[int] = DP_LIMIT,
+            max_conflicts: Optional[int] = None,
+            max_decisions: Optional[int] = None,
+            time_limit: Optional[float] = None,
+            cancel: Optional[CancellationToken] = None,
+            assumptions: Iterable[int] = (),
+            **extra_vars
+    ):
+        # The members run in other processes, so the wall time is measured instead of the process time. Every member
+        # gets the whole budget, the cancellation token is watched here.
+        self.start = time.perf_counter()
+        # A race that nobody decides reports no search at all, not that of the previous solve().
+        self._reset_stats()
+        self.winner, self.winner_stats = None, {}
+        self.outcomes = {split: 'cancelled' for split in self.splits}
+        self.status, self.stopped_by, self.stop_reason = Status.UNKNOWN, None, None
+        self.assumptions, self.core = [*dict.fromkeys(assumptions)], None
+        budget: Dict[str, Optional[float]] = {
+            'max_calls': max_calls,
+            'max_conflicts': max_conflicts,
+            'max_decisions': max_decisions,
+            'time_limit': time_limit,
+        }
+
+        results: multiprocessing.Queue = multiprocessing.Queue()
+        members: List[multiprocessing.Process] = [
+            multiprocessing.Process(
+                target=_run_member,
+                args=(split, self.problem, results, budget, self.added_clauses, self.assumptions),
+                daemon=True
+            )
+            for split in self.splits
+        ]
+        for member in members:
+            member.start()
+
+        solution: Optional[Dict[int, bool]] = None
+        try:
+            for _ in members:
+                try:
+                    split, status, solution, core, dp_calls, split_calls, solution_attempts, stats = self._next_result(
+                        results, members, cancel
+                    )
+                except queue.Empty:
+                    # Every remaining member died without reporting back.
+                    break
+
+                self.outcomes[split] = "{} in {:.3f}s, {} DP calls".format(status.name, stats['Time'], dp_calls)
+                # The first member that finds a solution or proves that there is none decides.
+                if status is not Status.UNKNOWN:
+                    self.status, self.winner, self.winner_stats, self.core = status, split, stats, core
+                    self.dp_calls, self.split_calls, self.solution_attempts = dp_calls, split_calls, solution_attempts
+                    break
+        except BudgetExceeded as e:
+            self.stopped_by, self.stop_reason = e.budget, str(e)
+        finally:
+            # Cancel everyone that is still running.
+            for member in members:
+                if member.is_alive():
+                    member.terminate()
+                member.join()
+
+        self.end = time.perf_counter()
+        if self.status is not Status.SAT:
+            return self.status, None, None, None
+        return self.status, solution, [], None
+
+    def add_clause(self, literals: Iterable[int]):
+        self.added_clauses.append(tuple(literals))
+
+    @staticmethod
+    def _next_result(
+            results: multiprocessing.Queue,
+            members: List[multiprocessing.Process],
+            cancel: Optional[CancellationToken] = None
+    ) -> Tuple:
+        """
+        Waits for the next member to report, as long as at least one member is still alive and the solve is not
+        cancelled.
+        """
+        while True:
+            if cancel is not None and cancel.cancelled:
+                raise BudgetExceeded('cancelled', "cancelled")
+            try:
+                return results.get(timeout=0.1)
+            except queue.Empty:
+                if not any(member.is_alive() for member in members):
+                    # A member may have reported just before exiting.
+                    return results.get(timeout=0.1)
+
+    def _split_literals(
+            self,
+            clauses: List[Set[int]],
+            solution: Dict[int, Optional[bool]],
+            **extra_vars
+    ) -> Iterator[int]:
+        # The portfolio never splits itself, its members do.
+        return iter(())
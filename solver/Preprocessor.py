@@ -0,0 +1,273 @@
+import collections
+import time
+from typing import List, Dict, Set, Tuple, Iterable, Optional, FrozenSet
+
+TIME_LIMIT = 10.0
+# Variables are only eliminated if they occur in at most this many clauses of either polarity.
+ELIMINATION_LIMIT = 10
+
+
+class Preprocessor:
+    """
+    Simplifies a CNF formula before it is solved: unit propagation, subsumption, self-subsuming resolution, bounded
+    variable elimination and failed literal probing. Every step keeps the formula satisfiable if and only if it was,
+    and the eliminated variables are recorded, so that a solution of the simplified formula can be extended to one of
+    the original formula. The steps stop early when the time limit (in seconds of process time) runs out.
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]], time_limit: float = TIME_LIMIT):
+        self.clauses: List[Optional[Set[int]]] = []
+        self.occurrences: Dict[int, Set[int]] = collections.defaultdict(set)
+        self.fixed: Set[int] = set()
+        self.queue: List[int] = []
+        self.inconsistent: bool = False
+        # The eliminated variables in order, each with the clauses it occurred in at that moment.
+        self.eliminated: List[Tuple[int, List[FrozenSet[int]]]] = []
+
+        original_clauses: int = 0
+        variables: Set[int] = set()
+        for clause in clauses:
+            clause: Set[int] = {*clause}
+            variables.update(map(abs, clause))
+            self._add(clause)
+            original_clauses += 1
+        self.variables: FrozenSet[int] = frozenset(variables)
+
+        # Benchmark variables.
+        self.time_limit: float = time_limit
+        self.deadline: float = 0
+        self.time: float = 0
+        self.original_clauses: int = original_clauses
+        self.subsumed: int = 0
+        self.strengthened: int = 0
+        self.failed_literals: int = 0
+
+    def run(self) -> List[Tuple[int, ...]]:
+        """Simplifies the formula as far as the time limit allows and returns the simplified clauses."""
+        start: float = time.process_time()
+        self.deadline = start + self.time_limit
+
+        # Repeat while the steps keep finding something, since every step can enable the others.
+        progress: Optional[Tuple[int, ...]] = None
+        while progress != self._progress() and not self.inconsistent and not self._expired():
+            progress = self._progress()
+            self._propagate()
+            self._subsume()
+            self._eliminate()
+            self._probe()
+
+        self.time = time.process_time() - start
+        return self.result()
+
+    def result(self) -> List[Tuple[int, ...]]:
+        if self.inconsistent:
+            return [()]
+        return [(literal,) for literal in sorted(self.fixed, key=abs)] + [
+            tuple(sorted(clause, key=abs)) for clause in self.clauses if clause is not None
+        ]
+
+    def extend(self, solution: Dict[int, Optional[bool]]) -> Dict[int, bool]:
+        """Extends a solution of the simplified formula to the variables that were fixed or eliminated."""
+        model: Dict[int, bool] = {variable: bool(solution.get(variable)) for variable in self.variables}
+        for literal in self.fixed:
+            model[abs(literal)] = literal > 0
+
+        # Every eliminated variable can satisfy the clauses it occurred in, given the variables eliminated after it.
+        for variable, clauses in reversed(self.eliminated):
+            model[variable] = False
+            if not all(any(model[abs(literal)] == (literal > 0) for literal in clause) for clause in clauses):
+                model[variable] = True
+
+        return dict(sorted(model.items()))
+
+    def stats(self) -> Dict[str, float]:
+        # Fixed variables count as removed, their unit clauses are only there to pass their values on to the solver.
+        remaining: List[Set[int]] = [clause for clause in self.clauses if clause is not None]
+        return {
+            'Preprocessing time': self.time,
+            'Removed clauses': self.original_clauses - len(remaining),
+            'Removed variables': len(self.variables) - len({abs(literal) for clause in remaining for literal in clause}),
+            'Subsumed clauses': self.subsumed,
+            'Strengthened clauses': self.strengthened,
+            'Eliminated variables': len(self.eliminated),
+            'Failed literals': self.failed_literals,
+        }
+
+    def _progress(self) -> Tuple[int, ...]:
+        return len(self.fixed), len(self.eliminated), self.subsumed, self.strengthened
+
+    def _expired(self) -> bool:
+        return time.process_time() > self.deadline
+
+    def _add(self, clause: Set[int]):
+        # Tautologies are always satisfied.
+        if any(literal * -1 in clause for literal in clause):
+            return
+
+        if len(clause) == 0:
+            self.inconsistent = True
+        elif len(clause) == 1:
+            self.queue.append(next(iter(clause)))
+            return
+
+        index: int = len(self.clauses)
+        self.clauses.append(clause)
+        for literal in clause:
+            self.occurrences[literal].add(index)
+
+    def _remove(self, index: int):
+        for literal in self.clauses[index]:
+            self.occurrences[literal].discard(index)
+        self.clauses[index] = None
+
+    def _strengthen(self, index: int, literal: int):
+        """Removes a literal that can't be True in any solution from a clause."""
+        clause: Set[int] = self.clauses[index]
+        clause.discard(literal)
+        self.occurrences[literal].discard(index)
+
+        if len(clause) == 0:
+            self.inconsistent = True
+        elif len(clause) == 1:
+            self.queue.append(next(iter(clause)))
+            self._remove(index)
+
+    def _propagate(self):
+        """Fixes the queued units, removes the clauses they satisfy and the literals they falsify."""
+        while len(self.queue) != 0 and not self.inconsistent:
+            literal: int = self.queue.pop()
+            if literal in self.fixed:
+                continue
+            if literal * -1 in self.fixed:
+                self.inconsistent = True
+                return
+
+            self.fixed.add(literal)
+            for index in [*self.occurrences[literal]]:
+                self._remove(index)
+            for index in [*self.occurrences[literal * -1]]:
+                self._strengthen(index, literal * -1)
+
+    def _subsume(self):
+        """
+        Removes the clauses that contain another clause, and removes literal l from the clauses D for which another
+        clause C contains -l and C without -l is contained in D (self-subsuming resolution).
+        """
+        order: List[int] = sorted(
+            (index for index, clause in enumerate(self.clauses) if clause is not None),
+            key=lambda _index: len(self.clauses[_index])
+        )
+
+        for index in order:
+            if self._expired() or self.inconsistent:
+                return
+            clause: Set[int] = self.clauses[index]
+            if clause is None:
+                continue
+
+            # Every candidate contains the literal of the clause that occurs least, or its negation.
+            literal: int = min(clause, key=lambda _literal: len(self.occurrences[_literal]) +
+                               len(self.occurrences[_literal * -1]))
+            candidates: Set[int] = self.occurrences[literal] | self.occurrences[literal * -1]
+
+            for other_index in candidates:
+                other: Optional[Set[int]] = self.clauses[other_index]
+                if other_index == index or other is None or len(other) < len(clause):
+                    continue
+
+                missing: Set[int] = clause - other
+                if len(missing) == 0:
+                    self._remove(other_index)
+                    self.subsumed += 1
+                elif len(missing) == 1 and next(iter(missing)) * -1 in other:
+                    self._strengthen(other_index, next(iter(missing)) * -1)
+                    self.strengthened += 1
+
+            self._propagate()
+
+    def _eliminate(self):
+        """
+        Replaces the clauses of a variable by all their non-tautological resolvents on it, as long as that does not
+        increase the number of clauses.
+        """
+        variables: List[int] = sorted(
+            (variable for variable in self.variables if variable not in self.fixed and variable * -1 not in self.fixed),
+            key=lambda _variable: len(self.occurrences[_variable]) * len(self.occurrences[_variable * -1])
+        )
+
+        for variable in variables:
+            if self._expired() or self.inconsistent:
+                return
+
+            positive: List[int] = [*self.occurrences[variable]]
+            negative: List[int] = [*self.occurrences[variable * -1]]
+            if len(positive) == 0 and len(negative) == 0:
+                continue
+            if len(positive) > ELIMINATION_LIMIT or len(negative) > ELIMINATION_LIMIT:
+                continue
+
+            resolvents: List[Set[int]] = []
+            for p in positive:
+                for n in negative:
+                    resolvent: Set[int] = (self.clauses[p] | self.clauses[n]) - {variable, variable * -1}
+                    if not any(literal * -1 in resolvent for literal in resolvent):
+                        resolvents.append(resolvent)
+                if len(resolvents) > len(positive) + len(negative):
+                    break
+            else:
+                self.eliminated.append(
+                    (variable, [frozenset(self.clauses[index]) for index in positive + negative])
+                )
+                for index in positive + negative:
+                    self._remove(index)
+                for resolvent in resolvents:
+                    self._add(resolvent)
+                self._propagate()
+
+    def _probe(self):
+        """
+        Assigns every literal in turn and propagates it. If that leads to a conflict, its negation is a unit. If both
+        polarities of a variable imply the same literal, that literal is a unit as well.
+        """
+        for variable in sorted(self.variables):
+            if self._expired() or self.inconsistent:
+                return
+            if variable in self.fixed or variable * -1 in self.fixed:
+                continue
+            if len(self.occurrences[variable]) == 0 and len(self.occurrences[variable * -1]) == 0:
+                continue
+
+            positive: Optional[Set[int]] = self._implied(variable)
+            negative: Optional[Set[int]] = self._implied(variable * -1)
+            if positive is None or negative is None:
+                self.failed_literals += 1
+                if positive is None and negative is None:
+                    self.inconsistent = True
+                    return
+                self.queue.append(variable * -1 if positive is None else variable)
+            else:
+                self.queue.extend(positive & negative)
+            self._propagate()
+
+    def _implied(self, literal: int) -> Optional[Set[int]]:
+        """The literals that unit propagation derives from a literal, or None if it runs into a conflict."""
+        assigned: Set[int] = {literal}
+        queue: List[int] = [literal]
+
+        while len(queue) != 0:
+            for index in self.occurrences[queue.pop() * -1]:
+                unassigned: Optional[int] = None
+                for _literal in self.clauses[index]:
+                    if _literal in assigned:
+                        break
+                    if _literal * -1 not in assigned:
+                        if unassigned is not None:
+                            break
+                        unassigned = _literal
+                else:
+                    if unassigned is None:
+                        return None
+                    assigned.add(unassigned)
+                    queue.append(unassigned)
+
+        return assigned
@@ -0,0 +1,123 @@
+import collections
+from abc import ABC, abstractmethod
+from typing import Deque
+
+# Split options that select a restart policy.
+LUBY = 'luby'
+GEOMETRIC = 'geometric'
+GLUCOSE = 'glucose'
+RESTARTS = [LUBY, GEOMETRIC, GLUCOSE]
+
+# The number of conflicts that one step of the Luby sequence stands for.
+LUBY_UNIT = 100
+# The number of conflicts before the first geometric restart, and the factor by which it grows after every restart.
+GEOMETRIC_FIRST = 100
+GEOMETRIC_FACTOR = 1.5
+# Glucose restarts when the last GLUCOSE_WINDOW conflicts span more decision levels on average than all conflicts so
+# far, by more than a factor 1 / GLUCOSE_MARGIN, since the search has gone astray then.
+GLUCOSE_WINDOW = 50
+GLUCOSE_MARGIN = 0.8
+
+
+def luby(index: int) -> int:
+    """The element at an index (from 0) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ..."""
+    # Find the finite subsequence that contains the index, and its size.
+    size: int = 1
+    sequence: int = 0
+    while size < index + 1:
+        sequence += 1
+        size = 2 * size + 1
+
+    while size - 1 != index:
+        size = (size - 1) >> 1
+        sequence -= 1
+        index = index % size
+
+    return 2 ** sequence
+
+
+class RestartPolicy(ABC):
+    """Decides after every conflict whether the search should start over from the top."""
+
+    def __init__(self):
+        self.conflicts: int = 0
+        self.restarts: int = 0
+
+    def reset(self):
+        """Starts the schedule over, for a new call of solve()."""
+        self.conflicts = 0
+        self.restarts = 0
+
+    def conflict(self, levels: int) -> bool:
+        """
+        Records a conflict that spans the given number of decision levels. Returns True if the search should restart.
+        """
+        self.conflicts += 1
+        if not self._due(levels):
+            return False
+
+        self.conflicts = 0
+        self.restarts += 1
+        return True
+
+    @abstractmethod
+    def _due(self, levels: int) -> bool:
+        pass
+
+
+class LubyRestarts(RestartPolicy):
+    """Restarts after a number of conflicts that follows the Luby sequence."""
+
+    def _due(self, levels: int) -> bool:
+        return self.conflicts >= LUBY_UNIT * luby(self.restarts)
+
+
+class GeometricRestarts(RestartPolicy):
+    """Restarts after a number of conflicts that grows geometrically."""
+
+    def _due(self, levels: int) -> bool:
+        return self.conflicts >= GEOMETRIC_FIRST * GEOMETRIC_FACTOR ** self.restarts
+
+
+class GlucoseRestarts(RestartPolicy):
+    """
+    Restarts when the recent conflicts are worse than usual. Glucose measures the literal block distance of the learned
+    clauses, here it is the number of decision levels in the clause that became empty, or the depth of the search if
+    the engine does not know that clause.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.recent: Deque[int] = collections.deque(maxlen=GLUCOSE_WINDOW)
+        self.total: int = 0
+        self.count: int = 0
+
+    def reset(self):
+        super().reset()
+        self.recent.clear()
+        self.total = 0
+        self.count = 0
+
+    def _due(self, levels: int) -> bool:
+        self.recent.append(levels)
+        self.total += levels
+        self.count += 1
+
+        if len(self.recent) < GLUCOSE_WINDOW:
+            return False
+        if sum(self.recent) / GLUCOSE_WINDOW * GLUCOSE_MARGIN <= self.total / self.count:
+            return False
+
+        self.recent.clear()
+        return True
+
+
+def get_restart_policy(name: str) -> RestartPolicy:
+    policies = {
+        LUBY: LubyRestarts,
+        GEOMETRIC: GeometricRestarts,
+        GLUCOSE: GlucoseRestarts,
+    }
+    if name not in policies:
+        raise ValueError("Unknown restart policy '{}', expected one of {}.".format(name, ", ".join(RESTARTS)))
+    return policies[name]()
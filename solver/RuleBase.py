@@ -0,0 +1,198 @@
+import collections
+import functools
+import itertools
+from array import array
+from typing import Dict, List, Set, Tuple, Iterable, Optional, FrozenSet, Union
+
+from mxklabs.dimacs import Dimacs
+
+from solver.ClauseDatabase import ClauseDatabase, watch_index
+from solver.Preprocessor import Preprocessor
+from tools.dimacs_reader import read_dimacs, CompactCNF
+
+# A cardinality constraint: at most bound of the literals are True.
+Constraint = Tuple[Tuple[int, ...], int]
+
+
+class RuleBase:
+    """
+    Clauses that are parsed and normalised once and shared by many solvers. Duplicate literals and tautologies are
+    removed, and everything that solvers derive from the clauses before they start (variables, occurrences, units and
+    the initial watch lists) is computed here, so a solver only has to copy the parts it mutates. Cardinality
+    constraints (at most k of some literals are True) are kept apart from the clauses, they are never mutated.
+    """
+
+    def __init__(
+            self,
+            clauses: Iterable[Iterable[int]],
+            filename: Optional[str] = None,
+            constraints: Iterable[Tuple[Iterable[int], int]] = ()
+    ):
+        self.filename: Optional[str] = filename
+
+        normalised: List[Tuple[int, ...]] = []
+        for clause in clauses:
+            # Keep the order of the literals, the first two are the ones that will be watched.
+            clause: Tuple[int, ...] = tuple(dict.fromkeys(clause))
+            if len({abs(literal) for literal in clause}) != len(clause):
+                continue
+            normalised.append(clause)
+
+        normalised_constraints: List[Constraint] = []
+        constraint_variables: Set[int] = set()
+        for literals, bound in constraints:
+            literals: Tuple[int, ...] = tuple(literals)
+            # A literal that occurs twice would count twice, which the propagators don't do.
+            if len(set(literals)) != len(literals):
+                raise ValueError("A literal occurs more than once in the cardinality constraint {}.".format(literals))
+            constraint_variables.update(map(abs, literals))
+            # Exactly one of a literal and its negation is True, which leaves one less for the other literals.
+            complementary: Set[int] = {abs(literal) for literal in literals if literal * -1 in literals}
+            literals = tuple(literal for literal in literals if abs(literal) not in complementary)
+            bound -= len(complementary)
+
+            # Bounds of zero are unit clauses, bounds that all literals together can't exceed are no constraint.
+            if bound < 0:
+                normalised.append(())
+            elif bound == 0:
+                normalised.extend((literal * -1,) for literal in literals)
+            elif bound < len(literals):
+                normalised_constraints.append((literals, bound))
+
+        self.clauses: Tuple[Tuple[int, ...], ...] = tuple(normalised)
+        self.constraints: Tuple[Constraint, ...] = tuple(normalised_constraints)
+        self.variables: FrozenSet[int] = frozenset(
+            abs(literal) for clause in self.clauses for literal in clause
+        ).union(constraint_variables)
+        self.occurrences: Dict[int, int] = collections.Counter(
+            literal for clause in self.clauses for literal in clause
+        )
+        self.inconsistent: bool = any(len(clause) == 0 for clause in self.clauses)
+        self.units: Tuple[int, ...] = tuple(clause[0] for clause in self.clauses if len(clause) == 1)
+
+        # The clauses with at least two literals over densely numbered variables and their initial watch lists, for
+        # the watched literals engine. The watch list of a dense literal is at watch_index(literal).
+        self.database: ClauseDatabase = ClauseDatabase.from_clauses(
+            (clause for clause in self.clauses if len(clause) > 1), self.variables
+        )
+        watches: List[array] = [array('i') for _ in range(2 * len(self.database.names))]
+        for index in range(len(self.database)):
+            clause: array = self.database.clause(index)
+            watches[watch_index(clause[0])].append(index)
+            watches[watch_index(clause[1])].append(index)
+        self.watches: Tuple[array, ...] = tuple(watches)
+
+        # The constraints that contain every literal, for the sets engine, and a dense copy of the constraints with the
+        # same numbering as the clauses, for the watched literals engine. A constraint is visited when one of its
+        # literals becomes True, so the constraints that contain a dense literal are at watch_index(literal).
+        constraint_occurrences: Dict[int, List[int]] = collections.defaultdict(list)
+        for index, (literals, bound) in enumerate(self.constraints):
+            for literal in literals:
+                constraint_occurrences[literal].append(index)
+        self.constraint_occurrences: Dict[int, List[int]] = dict(constraint_occurrences)
+        self.constraint_database: ClauseDatabase = ClauseDatabase(
+            self.database.names, self.database.index, array('i'), array('i', [0])
+        )
+        self.bounds: array = array('i', (bound for literals, bound in self.constraints))
+        constraint_watches: List[array] = [array('i') for _ in range(2 * len(self.database.names))]
+        for literals, bound in self.constraints:
+            index: int = self.constraint_database.add(map(self.database.encode, literals))
+            for literal in self.constraint_database.clause(index):
+                constraint_watches[watch_index(literal)].append(index)
+        self.constraint_watches: Tuple[array, ...] = tuple(constraint_watches)
+
+        # The same rules with the exactly-one groups of the clauses as constraints, and the other way around.
+        self.detected: Optional[RuleBase] = None
+        self.source: Optional[RuleBase] = None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def load(filename: str) -> 'RuleBase':
+        """
+        Parses a DIMACS file once per process. Worker processes that are forked after loading inherit the parsed rules.
+        """
+        cnf: CompactCNF = read_dimacs(filename)
+        return RuleBase(cnf, filename, cnf.constraints)
+
+    def problem(self, givens: Iterable[int]) -> 'Problem':
+        """Combines the rules with the unit clauses of one instance."""
+        return Problem(self, tuple(givens))
+
+    def with_constraints(self) -> 'RuleBase':
+        """
+        The same rules with their exactly-one groups as cardinality constraints. A clause of at least three literals for
+        which the negations of every pair of its literals form a clause as well (the pairwise encoding of at most one)
+        is such a group: the clause stays, its pairs are replaced by one constraint with a bound of one. Detected once
+        per rule base.
+        """
+        if self.detected is None:
+            pairs: Set[FrozenSet[int]] = {frozenset(clause) for clause in self.clauses if len(clause) == 2}
+            constraints: List[Constraint] = [*self.constraints]
+            covered: Set[FrozenSet[int]] = set()
+
+            for clause in self.clauses:
+                if len(clause) < 3:
+                    continue
+                group: List[FrozenSet[int]] = [
+                    frozenset((first * -1, second * -1)) for first, second in itertools.combinations(clause, 2)
+                ]
+                if all(pair in pairs for pair in group):
+                    constraints.append((clause, 1))
+                    covered.update(group)
+
+            self.detected = RuleBase(
+                (clause for clause in self.clauses if len(clause) != 2 or frozenset(clause) not in covered),
+                constraints=constraints
+            )
+            self.detected.source = self
+        return self.detected
+
+    def __reduce__(self):
+        # Rules from a file are sent to other processes by name and parsed there at most once, and so are the
+        # constraints detected in them.
+        if self.source is not None:
+            return RuleBase.with_constraints, (self.source,)
+        if self.filename is not None:
+            return RuleBase.load, (self.filename,)
+        return RuleBase, (self.clauses, None, self.constraints)
+
+
+class Problem:
+    """
+    A shared rule base together with the givens of one instance. Can be used wherever a Dimacs problem is used. If the
+    clauses were simplified by a preprocessor, the solver extends its solution to the original problem with it.
+    """
+
+    def __init__(self, rules: RuleBase, givens: Tuple[int, ...], preprocessor: Optional[Preprocessor] = None):
+        self.rules: RuleBase = rules
+        self.givens: Tuple[int, ...] = givens
+        self.preprocessor: Optional[Preprocessor] = preprocessor
+
+    @staticmethod
+    def simplify(problem, time_limit: Optional[float] = None) -> 'Problem':
+        """Runs the preprocessor on the clauses of any problem and returns the simplified problem."""
+        if len(getattr(problem, 'constraints', ())) != 0:
+            raise ValueError("The preprocessor only simplifies clauses, not cardinality constraints.")
+        preprocessor: Preprocessor = Preprocessor(problem.clauses, *(() if time_limit is None else (time_limit,)))
+        return Problem(RuleBase(preprocessor.run()), (), preprocessor)
+
+    @staticmethod
+    def with_constraints(problem) -> 'Problem':
+        """Any problem with the exactly-one groups of its rules as cardinality constraints (see RuleBase)."""
+        problem = as_problem(problem)
+        return Problem(problem.rules.with_constraints(), problem.givens, problem.preprocessor)
+
+    @property
+    def clauses(self) -> List[Tuple[int, ...]]:
+        return [(literal,) for literal in self.givens] + [*self.rules.clauses]
+
+    @property
+    def constraints(self) -> Tuple[Constraint, ...]:
+        return self.rules.constraints
+
+
+def as_problem(problem: Union[Dimacs, CompactCNF, Problem]) -> Problem:
+    """Any problem as a Problem. Dimacs problems and the compact form of read_dimacs get a rule base of their own."""
+    if isinstance(problem, Problem):
+        return problem
+    return RuleBase(problem.clauses, constraints=getattr(problem, 'constraints', ())).problem(())
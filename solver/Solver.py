@@ -1,52 +1,382 @@
 import collections
+import enum
+import itertools
+import sys
 import time
 import traceback
+from array import array
 
 from mxklabs.dimacs import Dimacs
 from abc import ABC, abstractmethod
-from typing import Set, Dict, List, Tuple, Optional
+from typing import Set, Dict, List, Tuple, Optional, Iterator, Iterable, Union, Sequence
 
+from solver.ClauseDatabase import ClauseDatabase, Assignment, watch_index, constraint_reason, UNASSIGNED, TRUE, FALSE, \
+    NO_REASON
+from solver.Metrics import Metrics
+from solver.Preprocessor import Preprocessor
+from solver.RestartPolicy import RestartPolicy, get_restart_policy
+from solver.RuleBase import RuleBase, Problem, as_problem
+from tools.dimacs_reader import CompactCNF
+
+# The default budget of solve(): the number of DP calls after which the search gives up.
 DP_LIMIT = 10000
+# The number of DP calls between the progress lines of a verbose solver.
+PROGRESS_INTERVAL = 1000
 PURE_LITERALS = False
 
+# Unit propagation engines. The 'sets' engine removes satisfied clauses and falsified literals from the clause sets on
+# every assignment, the 'watched' engine only visits the clauses that watch the negation of an assigned literal.
+ENGINE_SETS = 'sets'
+ENGINE_WATCHED = 'watched'
+ENGINES = [ENGINE_SETS, ENGINE_WATCHED]
+ENGINE = ENGINE_SETS
+
+# The selector variables of solution enumeration (see CDCL) are numbered down from the largest variable that the clause
+# database can hold, far away from the variables of any problem.
+MAX_VARIABLE = 2 ** 31 - 1
+
+
+class Status(enum.Enum):
+    """The outcome of solve(). Only SAT is truthy, so it can be used wherever a success flag is used."""
+    SAT = 'SAT'
+    UNSAT = 'UNSAT'
+    UNKNOWN = 'UNKNOWN'
+
+    def __bool__(self) -> bool:
+        return self is Status.SAT
+
+
+class CancellationToken:
+    """
+    Asks a running solve() to stop, which it checks on every DP call. Cancelling only sets a flag, so it is safe to do
+    from another thread or from a signal handler.
+    """
+
+    def __init__(self):
+        self.cancelled: bool = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, budget: str, message: str):
+        super().__init__(message)
+        # The budget that ran out: 'calls', 'conflicts', 'decisions', 'time' or 'cancelled'.
+        self.budget: str = budget
+
 
 class Solver(ABC):
     def __init__(
             self,
-            problem: Dimacs,
-            pure_literals: bool = PURE_LITERALS
+            problem: Union[Dimacs, CompactCNF, Problem],
+            pure_literals: bool = PURE_LITERALS,
+            engine: Optional[str] = None,
+            restarts: Optional[str] = None,
+            phase_saving: bool = False
     ):
-        # Optimisation flag.
+        engine = engine or ENGINE
+        if engine not in ENGINES:
+            raise ValueError("Unknown engine '{}', expected one of {}.".format(engine, ", ".join(ENGINES)))
+
+        # Optimisation flags.
         self.pure_literals: bool = pure_literals
+        self.engine: str = engine
+
+        # The restart policy, if any. A restart undoes all decisions after a number of conflicts that the policy
+        # decides, restart_due is set by the conflict that makes it due. With phase saving, the split tries the value
+        # that a variable had when it was last unassigned first, instead of the direction of the split, so a restart
+        # does not have to find its way back to the part of the assignment that worked.
+        self.restart_policy: Optional[RestartPolicy] = get_restart_policy(restarts) if restarts is not None else None
+        self.restart_due: bool = False
+        self.restart_conflicts: int = 0
+        self.phase_saving: bool = phase_saving
+        self.phases: Dict[int, bool] = {}
 
-        # Initialisation of class properties.
-        self.clauses: List[Set[int]] = [*map(lambda _clause: {*_clause}, problem.clauses)]
+        # A problem on a shared rule base only brings its givens, other problems (Dimacs or the compact form of
+        # read_dimacs) get a rule base of their own.
+        problem: Problem = as_problem(problem)
+        self.rules: RuleBase = problem.rules
+        givens: Tuple[int, ...] = problem.givens
+        self.preprocessor: Optional[Preprocessor] = problem.preprocessor
+
+        # Initialisation of class properties. Only the sets engine works on (and therefore copies) the clause sets.
+        self.clauses: List[Set[int]] = []
+        if self.engine == ENGINE_SETS:
+            self.clauses = [{literal} for literal in givens] + [*map(lambda _clause: {*_clause}, self.rules.clauses)]
         self.solution: Dict[int, Optional[bool]] = dict.fromkeys(
-            sorted({abs(literal) for clause in self.clauses for literal in clause}),
+            sorted(self.rules.variables.union(abs(literal) for literal in givens)),
             None
         )
 
+        # The assignment trail. Every entry records an assigned variable (or None if only clauses were purged), the
+        # clauses that were removed together with their original index and the clauses from which a literal was
+        # removed together with that literal. Popping an entry restores the clauses to their state before it. The
+        # watched literals engine records its dense variables and never touches the clauses.
+        self.trail: List[Tuple[Optional[int], List[Tuple[int, Set[int]]], List[Tuple[Set[int], int]]]] = []
+        # The length of the trail at the start of every decision level.
+        self.trail_lim: List[int] = []
+
+        # The number of occurrences of every literal in the remaining clauses. The sets engine keeps these up to date
+        # while it removes clauses and literals, so split heuristics don't have to count them again.
+        self.occurrences: Dict[int, int] = collections.Counter(self.rules.occurrences)
+        self.occurrences.update(givens)
+
+        # Two watched literals engine. It works on a compact copy of the clauses with densely numbered variables (see
+        # ClauseDatabase) and keeps their values in a byte array, which the solution maps to the original variables.
+        # The first two literals of every clause are watched, the watch list at watch_index(literal) holds the indexes
+        # of the clauses watching a literal and queue_head points to the first trail entry whose consequences have not
+        # been propagated yet. For every assigned variable the decision level and the index of the clause that
+        # implied it (NO_REASON for decisions and unit clauses) are kept, to be able to analyse conflicts.
+        self.database: Optional[ClauseDatabase] = None
+        self.values: bytearray = bytearray()
+        self.watches: List[array] = []
+        self.units: List[int] = []
+        self.queue_head: int = 0
+        self.inconsistent: bool = False
+        self.levels: array = array('i')
+        self.reasons: array = array('i')
+        self.conflict_clause: Optional[int] = None
+        # The cardinality constraints of the rules, which are shared, and the constraints that contain every dense
+        # literal, at watch_index(literal). Constraints that imply a literal or conflict are referred to by their
+        # constraint_reason in the reasons and the conflict clause.
+        self.constraints: Optional[ClauseDatabase] = None
+        self.bounds: array = array('i')
+        self.constraint_watches: List[array] = []
+        if self.engine == ENGINE_WATCHED:
+            self._init_watches(givens)
+
+        # The budget of the search, set by solve(). None means unlimited.
+        self.max_calls: Optional[int] = DP_LIMIT
+        self.max_conflicts: Optional[int] = None
+        self.max_decisions: Optional[int] = None
+        self.deadline: Optional[float] = None
+        self.cancel: Optional[CancellationToken] = None
+
+        # The outcome of the last solve() and, if it is unknown, why the search stopped.
+        self.status: Optional[Status] = None
+        self.stopped_by: Optional[str] = None
+        self.stop_reason: Optional[str] = None
+
+        # The literals that the last solve() assumed to be True and, if it is unsatisfiable, the assumptions that
+        # together led to that (the failed-assumption core). An empty core means that the clauses have no solution at
+        # all. Assumptions only hold for one call, the clauses, the assignments they imply on their own and the clauses
+        # that CDCL learned from them are kept between calls.
+        self.assumptions: List[int] = []
+        self.core: Optional[List[int]] = None
+        # Variables that the solver added itself, which are left out of the solutions.
+        self.selectors: Set[int] = set()
+
         # Benchmark variables.
         self.start: float = 0
         self.end: float = 0
         self.dp_calls: int = 0
         self.split_calls: int = 0
         self.solution_attempts: int = 0
-        self.known: Set[int] = {[*clause][0] for clause in self.clauses if len(clause) == 1}
+        self.conflicts: int = 0
+        self.decisions: int = 0
+        self.restarts: int = 0
+        self.known: Set[int] = {*self.rules.units, *givens}
         self.frequencies = collections.Counter([literal % 10 for literal in self.known]).most_common()
+        # Timings and histograms of the search, only measured if metrics were attached (see Metrics.attach).
+        self.metrics: Optional[Metrics] = None
+        # Prints the progress of the search every PROGRESS_INTERVAL DP calls, for the command line scripts.
+        self.verbose: bool = False
+
+    def solve(
+            self,
+            max_calls: Optional[int] = DP_LIMIT,
+            max_conflicts: Optional[int] = None,
+            max_decisions: Optional[int] = None,
+            time_limit: Optional[float] = None,
+            cancel: Optional[CancellationToken] = None,
+            assumptions: Iterable[int] = (),
+            **extra_vars
+    ) -> Tuple[Status, Optional[Dict[int, bool]], Optional[List[Set[int]]], Optional[int]]:
+        """
+        Searches for a solution in which the assumed literals are True, within a budget of DP calls, conflicts,
+        decisions and wall-clock seconds, any of which can be None for no limit, until the cancellation token is
+        cancelled. Returns SAT with the solution, UNSAT if the search proved that there is none, or UNKNOWN if it
+        stopped before that. The stats of the search so far are available in either case. The solver can be solved
+        again, with other assumptions or after adding clauses.
+        """
+        # Start again from the top level, keeping what follows from the clauses alone.
+        self._backtrack(0)
+        self._reset_stats()
+        self.assumptions = [*dict.fromkeys(assumptions)]
+        self.core = None
+        if len(self.assumptions) != 0:
+            self._check_incremental()
+            self._add_variables(map(abs, self.assumptions))
 
-    def solve(self, **extra_vars):
         self.start = time.process_time()
+        self.max_calls = max_calls
+        self.max_conflicts = max_conflicts
+        self.max_decisions = max_decisions
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.cancel = cancel
+        self.stopped_by = self.stop_reason = None
 
         try:
             success, solution, clauses, conflict = self._dp(self.clauses, self.solution, **extra_vars)
-        except Exception as e:
+        except BudgetExceeded as e:
             self.end = time.process_time()
-            print(e)
-            return False, None, None, None
+            self.status, self.stopped_by, self.stop_reason = Status.UNKNOWN, e.budget, str(e)
+            return self.status, None, None, None
 
         self.end = time.process_time()
-        return success, solution, clauses, conflict
+        # Running out of literals to split on only proves that there is no solution if the split tries both values.
+        if success:
+            self.status = Status.SAT
+        elif self.split_calls == 0 or self._complete(**extra_vars):
+            self.status = Status.UNSAT
+        else:
+            self.status = Status.UNKNOWN
+            self.stop_reason = "the split only tries one value of every variable"
+        # Without an implication graph every assumption is taken to be part of the conflict.
+        if self.status is Status.UNSAT and self.core is None:
+            self.core = [*self.assumptions]
+
+        # The watched literals engine assigns dense variables, the solution is handed out with the original ones.
+        if solution is not None:
+            solution = dict(solution)
+            for selector in self.selectors:
+                del solution[selector]
+        # The preprocessor knows the values of the variables it removed.
+        if success and self.preprocessor is not None:
+            solution = self.preprocessor.extend(solution)
+        return self.status, solution, clauses, conflict
+
+    def add_clause(self, literals: Iterable[int]):
+        """
+        Adds a clause to the problem for all following calls of solve(). Variables that are new are added as well.
+        Everything that was learned so far still follows from the clauses and is kept.
+        """
+        self._check_incremental()
+        self._backtrack(0)
+
+        clause: Tuple[int, ...] = tuple(dict.fromkeys(literals))
+        self._add_variables(map(abs, clause))
+        # Tautologies and clauses that are satisfied on the top level are not needed, literals that are False on the
+        # top level can be left out, since the top level is never undone.
+        if any(literal * -1 in clause for literal in clause):
+            return
+        if any(self.solution[abs(literal)] == (literal > 0) for literal in clause):
+            return
+        clause = tuple(literal for literal in clause if self.solution[abs(literal)] is None)
+        self.occurrences.update(clause)
+
+        # The sets engine finds empty and unit clauses itself while simplifying.
+        if self.engine == ENGINE_SETS:
+            self.clauses.append({*clause})
+        elif len(clause) == 0:
+            self.inconsistent = True
+        elif len(clause) == 1:
+            self.units.append(self.database.encode(clause[0]))
+        else:
+            # Both watches are unassigned, because the clause has no False literals left.
+            index: int = self.database.add(map(self.database.encode, clause))
+            start: int = self.database.offsets[index]
+            self.watches[watch_index(self.database.literals[start])].append(index)
+            self.watches[watch_index(self.database.literals[start + 1])].append(index)
+
+    def _check_incremental(self):
+        if self.preprocessor is not None:
+            raise ValueError("Clauses and assumptions can't be added to a simplified problem, the preprocessor may "
+                             "have eliminated their variables.")
+
+    def _add_variables(self, variables: Iterable[int]):
+        """Makes room for variables that the problem does not have yet."""
+        variables: List[int] = [variable for variable in dict.fromkeys(variables) if variable not in self.solution]
+        if len(variables) == 0:
+            return
+
+        if self.engine == ENGINE_SETS:
+            self.solution.update(dict.fromkeys(variables))
+            return
+
+        # The solution is a view on the numbering of the database, which is replaced.
+        self.database.add_variables(variables)
+        size: int = len(self.database.names)
+        self.values.extend(bytes(size - len(self.values)))
+        self.levels.extend(array('i', [0]) * (size - len(self.levels)))
+        self.reasons.extend(array('i', [NO_REASON]) * (size - len(self.reasons)))
+        self.watches.extend(array('i') for _ in range(2 * size - len(self.watches)))
+        self.constraint_watches.extend(array('i') for _ in range(2 * size - len(self.constraint_watches)))
+        self.solution = Assignment(self.database, self.values)
+
+    def _reset_stats(self):
+        """The benchmark variables describe the last call of solve()."""
+        self.dp_calls = 0
+        self.split_calls = 0
+        self.solution_attempts = 0
+        self.conflicts = 0
+        self.decisions = 0
+        self.restarts = 0
+        self.restart_due = False
+        self.restart_conflicts = 0
+        if self.restart_policy is not None:
+            self.restart_policy.reset()
+        if self.metrics is not None:
+            self.metrics.reset()
+
+    # noinspection PyMethodMayBeStatic
+    def _complete(self, order: List[bool] = (), **extra_vars) -> bool:
+        """Whether the search tries every value of every variable, given the arguments of solve()."""
+        return set(order) == {True, False}
+
+    def stats(self) -> Dict[str, float]:
+        """The benchmark variables as reported by print_stats."""
+        return {
+            'Time': self.end - self.start,
+            'DP calls': self.dp_calls,
+            'Split calls': self.split_calls,
+            'Solution attempts': self.solution_attempts,
+            'Conflicts': self.conflicts,
+            'Decisions': self.decisions,
+            **({'Restarts': self.restarts} if self.restart_policy is not None else {}),
+            'Memory (bytes)': self.memory(),
+            **(self.preprocessor.stats() if self.preprocessor is not None else {}),
+            **(self.metrics.stats() if self.metrics is not None else {}),
+            'Status': self.status.name if self.status is not None else None,
+            **({'Stopped': self.stop_reason} if self.stop_reason is not None else {}),
+        }
+
+    def memory(self) -> int:
+        """An estimate of the memory taken by this instance, leaving out the rule base that instances share."""
+        if self.engine == ENGINE_WATCHED:
+            return (self.database.nbytes() + sys.getsizeof(self.watches) + sum(map(sys.getsizeof, self.watches)) +
+                    sys.getsizeof(self.values) + sys.getsizeof(self.levels) + sys.getsizeof(self.reasons) +
+                    sys.getsizeof(self.constraint_watches))
+
+        # Removed clauses live on in the trail.
+        clauses: List[Set[int]] = [*self.clauses, *(clause for _, removed, _ in self.trail for _, clause in removed)]
+        return (sys.getsizeof(clauses) + sum(map(sys.getsizeof, clauses)) + sys.getsizeof(self.solution) +
+                sys.getsizeof(self.occurrences))
+
+    @property
+    def decision_level(self) -> int:
+        return len(self.trail_lim)
+
+    def _init_watches(self, givens: Tuple[int, ...]):
+        # The rule base already dropped the tautologies and set up the initial watches, only copy what gets mutated.
+        # Givens of variables that don't occur in the rules get a number of their own.
+        self.database = self.rules.database.copy(sorted({abs(literal) for literal in givens}))
+        self.watches = [watchers[:] for watchers in self.rules.watches]
+        self.watches.extend(array('i') for _ in range(2 * len(self.database.names) - len(self.watches)))
+        self.values = bytearray(len(self.database.names))
+        self.levels = array('i', [0]) * len(self.database.names)
+        self.reasons = array('i', [NO_REASON]) * len(self.database.names)
+        self.solution = Assignment(self.database, self.values)
+        self.units = [*map(self.database.encode, (*self.rules.units, *givens))]
+        self.inconsistent = self.rules.inconsistent
+        # The constraints are never mutated, only the list of watch lists is extended for new variables.
+        self.constraints = self.rules.constraint_database
+        self.bounds = self.rules.bounds
+        self.constraint_watches = [*self.rules.constraint_watches]
+        self.constraint_watches.extend(
+            array('i') for _ in range(2 * len(self.database.names) - len(self.constraint_watches))
+        )
 
     def _dp(
             self,
@@ -54,41 +384,218 @@ class Solver(ABC):
             solution: Dict[int, Optional[bool]],
             **extra_vars
     ) -> Tuple[bool, Optional[Dict[int, bool]], List[Set[int]], Optional[int]]:
-        self.dp_calls += 1
-        if self.dp_calls > DP_LIMIT:
-            self.end = time.process_time()
-            raise Exception("Unsolvable, limit of {} DP calls exceeded.".format(DP_LIMIT))
+        """
+        Runs the DP algorithm as a loop over an explicit stack of splits, so the depth of the search is not limited by
+        the recursion limit. Every split keeps the literals proposed by the split heuristic that were not tried yet.
+        The assumptions are assigned on a decision level of their own, after which the attempt of the split at
+        position i of the stack opens decision level base + i, which is undone through the trail before the next
+        literal of that split is tried.
+        """
+        splits: List[Iterator[int]] = []
+        if len(self.assumptions) != 0 and not self._assume(clauses, solution):
+            return False, solution, clauses, None
+        base: int = self.decision_level
 
-        if self.dp_calls % 1000 == 0:
-            print("Time: {:.3f}, DP calls: {}, Split calls: {}, Solution attempts: {}".format(
-                time.process_time() - self.start,
-                self.dp_calls,
-                self.split_calls,
-                self.solution_attempts
-            ))
+        while True:
+            self._count_dp_call()
+
+            success, open_clauses, conflicting_variable = self._simplify(clauses, solution)
+            if success and self._solved(open_clauses):
+                # Found a solution!
+                return True, solution, open_clauses, None
+
+            if success:
+                self.split_calls += 1
+                splits.append(self._split(open_clauses, solution, **extra_vars))
+            else:
+                self._conflict(conflicting_variable)
+                if len(splits) == 0:
+                    return False, solution, clauses, conflicting_variable
+
+                # Drop all splits and start over from the assumptions. The splits are closed innermost first, like
+                # they would have run out. Without learned clauses a restart repeats the work before it, so every
+                # restart waits for more conflicts than there were restarts, or a policy could keep the search from
+                # ever finishing.
+                if self.restart_due and self.conflicts - self.restart_conflicts > self.restarts:
+                    while len(splits) != 0:
+                        splits.pop().close()
+                    self._restart(base)
+                    continue
+
+            # Find the next literal to try, dropping the splits that have run out of literals.
+            while True:
+                if len(splits) == 0:
+                    return False, solution, clauses, None
+
+                self._backtrack(base + len(splits) - 1)
+                literal: Optional[int] = next(splits[-1], None)
+                if literal is None:
+                    splits.pop()
+                    continue
+
+                # Add the literal to the solution and run the DP algorithm again with the new literal value added to it.
+                self._new_decision_level()
+                if self._resolve(literal, clauses, solution):
+                    break
+
+    def _assume(self, clauses: List[Set[int]], solution: Dict[int, Optional[bool]]) -> bool:
+        """
+        Simplifies the clauses on the top level and assigns the assumptions on a new decision level. Returns False and
+        sets the core if that already leads to a contradiction.
+        """
+        success, open_clauses, conflicting_variable = self._simplify(clauses, solution)
+        if not success:
+            self._conflict(conflicting_variable)
+            self.core = []
+            return False
+
+        # An assumption that is False on the top level fails by itself.
+        for literal in self.assumptions:
+            if solution[abs(literal)] == (literal < 0):
+                self.core = [literal]
+                return False
+
+        self._new_decision_level()
+        return all(self._resolve(literal, clauses, solution) for literal in self.assumptions)
+
+    def _simplify(
+            self,
+            clauses: List[Set[int]],
+            solution: Dict[int, Optional[bool]]
+    ) -> Tuple[bool, List[Set[int]], Optional[int]]:
+        """
+        Simplifies the clauses with the current solution. Returns False and the conflicting variable if that leads to a
+        contradiction, otherwise True and the clauses that are still open. The watched literals engine does not know
+        which clauses are open without visiting all of them, so it returns the clauses as they are and the heuristics
+        that count occurrences look for the open ones themselves (see _literal_occurrences).
+        """
+        if self.engine == ENGINE_WATCHED:
+            success, conflicting_variable = self._propagate(solution)
+            return success, clauses, conflicting_variable
 
         while True:
             # Copy the clauses, because otherwise the loop will break if we remove items from the iteration.
             for clause in [*clauses]:
                 success, conflicting_variable = self._simplify_clause(clause, clauses, solution)
                 if success is False:
-                    return False, solution, clauses, conflicting_variable
+                    return False, clauses, conflicting_variable
                 elif success is True:
                     # Break the loop, because something changed
                     break
 
-            # Nothing changed, because the loop was not broken or returned. Therefore stop running DP.
+            # Nothing changed, because the loop was not broken or returned. Therefore stop simplifying.
             else:
-                break
+                return True, clauses, None
+
+    def _solved(self, clauses: List[Set[int]]) -> bool:
+        """
+        Whether the assignment satisfies the problem, after simplifying without a contradiction. The sets engine removes
+        the satisfied clauses, so none may be left, and the cardinality constraints are only satisfied once their
+        variables are assigned: an unassigned one would end up False in the solution, which exceeds the bound of a
+        constraint with negative literals. The watched literals engine counts the assigned variables on its trail
+        instead: once every variable is assigned without a conflict, every clause and constraint is satisfied.
+        """
+        if self.engine == ENGINE_WATCHED:
+            return len(self.trail) == len(self.database.names) - 1
+        return len(clauses) == 0 and all(
+            self.solution[abs(literal)] is not None for literal in self.rules.constraint_occurrences
+        )
 
-        # Test if there are still unresolved clauses, which means that we're not done yet with parsing.
-        if len(clauses) != 0:
-            self.split_calls += 1
-            # Perform a Split operation.
-            return self._split(clauses, solution, **extra_vars)
+    def _count_dp_call(self):
+        self.dp_calls += 1
+        if self.max_calls is not None and self.dp_calls > self.max_calls:
+            raise BudgetExceeded('calls', "limit of {} DP calls exceeded".format(self.max_calls))
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise BudgetExceeded('time', "time limit exceeded after {} DP calls".format(self.dp_calls))
+        if self.cancel is not None and self.cancel.cancelled:
+            raise BudgetExceeded('cancelled', "cancelled after {} DP calls".format(self.dp_calls))
+
+        if self.verbose and self.dp_calls % PROGRESS_INTERVAL == 0:
+            print("Time: {:.3f}, DP calls: {}, Split calls: {}, Solution attempts: {}".format(
+                time.process_time() - self.start,
+                self.dp_calls,
+                self.split_calls,
+                self.solution_attempts
+            ))
 
-        # Found a solution!
-        return True, solution, clauses, None
+    def _conflict(self, conflicting_variable: Optional[int]):
+        """Called for every contradiction that the simplification runs into."""
+        self.conflicts += 1
+        if self.max_conflicts is not None and self.conflicts > self.max_conflicts:
+            raise BudgetExceeded('conflicts', "limit of {} conflicts exceeded".format(self.max_conflicts))
+
+        if self.restart_policy is not None and self.restart_policy.conflict(self._conflict_levels()):
+            self.restart_due = True
+
+    def _conflict_levels(self) -> int:
+        """The number of decision levels that the last conflict spans, as far as the engine knows."""
+        if self.conflict_clause is not None:
+            return len({self.levels[abs(literal)] for literal in self._explain(self.conflict_clause)})
+        return self.decision_level
+
+    def _restart(self, level: int):
+        """Undoes all decisions after the given decision level."""
+        self.restarts += 1
+        self.restart_due = False
+        self.restart_conflicts = self.conflicts
+        self._backtrack(level)
+
+    def _new_decision_level(self) -> int:
+        """Opens a new decision level and returns the level that has to be restored to undo it."""
+        self.decisions += 1
+        if self.max_decisions is not None and self.decisions > self.max_decisions:
+            raise BudgetExceeded('decisions', "limit of {} decisions exceeded".format(self.max_decisions))
+
+        self.trail_lim.append(len(self.trail))
+        return len(self.trail_lim) - 1
+
+    def _backtrack(self, level: int):
+        """Undoes all assignments and clause simplifications made after the given decision level."""
+        if level >= len(self.trail_lim):
+            return
+
+        while len(self.trail) > self.trail_lim[level]:
+            variable, removed, shrunk = self.trail.pop()
+
+            for clause, polar_literal in shrunk:
+                clause.add(polar_literal)
+                self.occurrences[polar_literal] += 1
+
+            if removed:
+                for index, clause in removed:
+                    for literal in clause:
+                        self.occurrences[literal] += 1
+                self._restore_clauses(removed)
+
+            if variable is None:
+                continue
+            if self.engine == ENGINE_WATCHED:
+                if self.phase_saving:
+                    self.phases[self.database.names[variable]] = self.values[variable] == TRUE
+                self.values[variable] = UNASSIGNED
+            else:
+                if self.phase_saving:
+                    self.phases[variable] = self.solution[variable]
+                self.solution[variable] = None
+
+        del self.trail_lim[level:]
+        self.queue_head = min(self.queue_head, len(self.trail))
+
+    def _restore_clauses(self, removed: List[Tuple[int, Set[int]]]):
+        """Merges removed clauses back into the clause list at their original positions."""
+        restored: List[Set[int]] = []
+        position: int = 0
+        remaining = iter(self.clauses)
+
+        for index, clause in removed:
+            while position < index:
+                restored.append(next(remaining))
+                position += 1
+            restored.append(clause)
+            position += 1
+        restored.extend(remaining)
+
+        self.clauses[:] = restored
 
     def _simplify_clause(
             self,
@@ -115,7 +622,11 @@ class Solver(ABC):
 
         # Remove all tautologies (clauses that will always resolve to True).
         if length != len(Solver.extract_clause_vars(clause)):
-            clauses.remove(clause)
+            index: int = next(index for index, _clause in enumerate(clauses) if _clause is clause)
+            del clauses[index]
+            for literal in clause:
+                self.occurrences[literal] -= 1
+            self.trail.append((None, [(index, clause)], []))
             return True, None
 
         # Nothing has changed.
@@ -123,6 +634,21 @@ class Solver(ABC):
 
     def _resolve(self, literal: int, clauses: List[Set[int]], solution: Dict[int, Optional[bool]]) -> bool:
         """Adds a literal to the current solution, if possible."""
+        # The watched literals engine defers the clause updates to _propagate.
+        if self.engine == ENGINE_WATCHED:
+            return self._enqueue(literal, solution)
+
+        assigned: bool = solution[abs(literal)] is None
+        if not self._resolve_clauses(literal, clauses, solution):
+            return False
+
+        # The cardinality constraints of the literal may force their other literals to be False.
+        if assigned and literal in self.rules.constraint_occurrences:
+            return self._resolve_constraints(literal, clauses, solution)
+        return True
+
+    def _resolve_clauses(self, literal: int, clauses: List[Set[int]], solution: Dict[int, Optional[bool]]) -> bool:
+        """Adds a literal to the current solution and removes it and its negation from the clauses, if possible."""
         variable: int = abs(literal)
         polar_literal: int = literal * -1
         polarity: bool = variable == literal
@@ -131,17 +657,36 @@ class Solver(ABC):
         if solution[variable] is None:
             solution[variable]: bool = polarity
 
-            for _clause in [*clauses]:
+            # Record the changes on the trail before making them, so a contradiction halfway can be undone as well.
+            removed: List[Tuple[int, Set[int]]] = []
+            shrunk: List[Tuple[Set[int], int]] = []
+            self.trail.append((variable, removed, shrunk))
+            contradiction: bool = False
+            occurrences: Dict[int, int] = self.occurrences
+
+            for index, _clause in enumerate(clauses):
                 if literal in _clause:
                     # The literal will resolve to True and thus the whole clause will be True.
-                    clauses.remove(_clause)
+                    removed.append((index, _clause))
+                    for _literal in _clause:
+                        occurrences[_literal] -= 1
                 elif polar_literal in _clause:
                     if len(_clause) == 1:
                         # We encountered a contradiction, because we cannot expect unit clauses with the polar
                         # literal value, since we already added the literal to the solution.
-                        return False
+                        contradiction = True
+                        break
                     # The polar literal will resolve to False and thus can be purged from all clauses.
                     _clause.remove(polar_literal)
+                    shrunk.append((_clause, polar_literal))
+                    occurrences[polar_literal] -= 1
+
+            if removed:
+                purged: Set[int] = {index for index, _clause in removed}
+                clauses[:] = [_clause for index, _clause in enumerate(clauses) if index not in purged]
+
+            if contradiction:
+                return False
 
         # We encountered a contradiction, because the current solution already contains a different value for this
         # variable.
@@ -154,16 +699,276 @@ class Solver(ABC):
         # The current solution is still solvable.
         return True
 
+    def _resolve_constraints(self, literal: int, clauses: List[Set[int]], solution: Dict[int, Optional[bool]]) -> bool:
+        """
+        Counts the True literals of the cardinality constraints of a literal that just became True. The other literals
+        of a constraint that reached its bound become False, a constraint that exceeds it is a contradiction. Literals
+        that become False are handled in turn, since they may be in constraints as well.
+        """
+        constraints: Tuple[Tuple[Tuple[int, ...], int], ...] = self.rules.constraints
+        occurrences: Dict[int, List[int]] = self.rules.constraint_occurrences
+        pending: List[int] = [literal]
+
+        while len(pending) != 0:
+            for index in occurrences.get(pending.pop(), ()):
+                literals, bound = constraints[index]
+                count: int = sum(1 for _literal in literals if solution[abs(_literal)] == (_literal > 0))
+                if count > bound:
+                    return False
+                if count < bound:
+                    continue
+
+                for _literal in literals:
+                    if solution[abs(_literal)] is None:
+                        if not self._resolve_clauses(_literal * -1, clauses, solution):
+                            return False
+                        pending.append(_literal * -1)
+
+        return True
+
+    def _enqueue(
+            self,
+            literal: int,
+            solution: Dict[int, Optional[bool]],
+            reason: Optional[int] = None
+    ) -> bool:
+        """Adds a literal of the original problem to the current solution and the propagation queue, if possible."""
+        return self._assign(self.database.encode(literal), NO_REASON if reason is None else reason)
+
+    def _assign(self, literal: int, reason: int = NO_REASON) -> bool:
+        """Assigns a dense literal and adds it to the propagation queue. Returns False if it is already False."""
+        variable: int = literal if literal > 0 else -literal
+        value: int = TRUE if literal > 0 else FALSE
+        current: int = self.values[variable]
+
+        if current == UNASSIGNED:
+            self.values[variable] = value
+            self.levels[variable] = len(self.trail_lim)
+            self.reasons[variable] = reason
+            self.trail.append((variable, (), ()))
+        elif current != value:
+            return False
+
+        if literal > 0:
+            self.solution_attempts += 1
+
+        return True
+
+    def _propagate(self, solution: Dict[int, Optional[bool]]) -> (bool, int):
+        """
+        Performs unit propagation for all queued assignments with the two watched literals scheme. Returns False and
+        the conflicting variable if a clause became empty.
+        """
+        self.conflict_clause = None
+        if self.inconsistent:
+            return False, None
+
+        names: array = self.database.names
+        if self.decision_level == 0:
+            for literal in self.units:
+                if not self._assign(literal):
+                    self.inconsistent = True
+                    return False, names[abs(literal)]
+
+        values: bytearray = self.values
+        literals: array = self.database.literals
+        offsets: array = self.database.offsets
+        watches: List[array] = self.watches
+        constraint_watches: List[array] = self.constraint_watches
+
+        while self.queue_head < len(self.trail):
+            variable: int = self.trail[self.queue_head][0]
+            self.queue_head += 1
+            if variable is None:
+                continue
+
+            # All clauses watching the literal that just became False need a new watch or have become unit. The watch
+            # index is computed inline here (see watch_index), this is the hottest loop of the engine.
+            if values[variable] == TRUE:
+                false_literal: int = -variable
+                false_watch: int = (variable << 1) | 1
+            else:
+                false_literal: int = variable
+                false_watch: int = variable << 1
+
+            # The constraints that contain the literal that just became True, at the other watch index.
+            for index in constraint_watches[false_watch ^ 1]:
+                if not self._propagate_constraint(index):
+                    if self.decision_level == 0:
+                        self.inconsistent = True
+                    return False, names[variable]
+
+            watchers: array = watches[false_watch]
+            kept: array = array('i')
+            watches[false_watch] = kept
+
+            for position, index in enumerate(watchers):
+                start: int = offsets[index]
+
+                # Make sure the false literal is the second watch.
+                if literals[start] == false_literal:
+                    literals[start] = literals[start + 1]
+                    literals[start + 1] = false_literal
+
+                # The clause is already satisfied by the other watch.
+                other: int = literals[start]
+                value: int = values[other if other > 0 else -other]
+                if value != UNASSIGNED and (value == TRUE) == (other > 0):
+                    kept.append(index)
+                    continue
+
+                # Look for a literal that is not False to watch instead.
+                for k in range(start + 2, offsets[index + 1]):
+                    literal: int = literals[k]
+                    value = values[literal if literal > 0 else -literal]
+                    if value == UNASSIGNED or (value == TRUE) == (literal > 0):
+                        literals[start + 1] = literal
+                        literals[k] = false_literal
+                        watches[(literal << 1) if literal > 0 else ((-literal << 1) | 1)].append(index)
+                        break
+                else:
+                    # No replacement, so the clause is unit on the other watch or all its literals are False.
+                    kept.append(index)
+                    if not self._assign(other, index):
+                        self.conflict_clause = index
+                        kept.extend(watchers[position + 1:])
+                        # A conflict on the top level does not depend on any decision, the problem stays inconsistent
+                        # for all following calls of solve().
+                        if self.decision_level == 0:
+                            self.inconsistent = True
+                        return False, names[abs(other)]
+
+        return True, None
+
+    def _propagate_constraint(self, index: int) -> bool:
+        """
+        Counts the True literals of a cardinality constraint after one of them became True. When the count reaches the
+        bound, the other literals become False, when it exceeds the bound the constraint is the conflict. This takes
+        time in proportion to the size of the constraint and keeps no counters, so backtracking has nothing to undo.
+        """
+        values: bytearray = self.values
+        literals: array = self.constraints.literals
+        start: int = self.constraints.offsets[index]
+        end: int = self.constraints.offsets[index + 1]
+
+        count: int = 0
+        for k in range(start, end):
+            literal: int = literals[k]
+            if values[literal if literal > 0 else -literal] == (TRUE if literal > 0 else FALSE):
+                count += 1
+
+        bound: int = self.bounds[index]
+        if count > bound:
+            self.conflict_clause = constraint_reason(index)
+            return False
+        if count == bound:
+            for k in range(start, end):
+                literal: int = literals[k]
+                if values[literal if literal > 0 else -literal] == UNASSIGNED:
+                    self._assign(-literal, constraint_reason(index))
+        return True
+
+    def _explain(self, reason: int) -> Sequence[int]:
+        """
+        The dense literals of the clause behind a reason or conflict. For a cardinality constraint these are the
+        negations of its True literals: the clause that the constraint conflicts with, and for a literal that it
+        implied, the literals of the reason besides that literal. They are found when they are needed, since no more
+        literals of a constraint become True once its bound is reached.
+        """
+        if reason >= 0:
+            return self.database.clause(reason)
+
+        values: bytearray = self.values
+        return [
+            -literal for literal in self.constraints.clause(constraint_reason(reason))
+            if values[literal if literal > 0 else -literal] == (TRUE if literal > 0 else FALSE)
+        ]
+
+    def _open_clauses(self, solution: Dict[int, Optional[bool]]) -> List[Set[int]]:
+        """Returns the clauses that are not satisfied yet, reduced to their unassigned literals of the original problem."""
+        open_clauses: List[Set[int]] = []
+        names: array = self.database.names
+        values: bytearray = self.values
+        literals: array = self.database.literals
+        offsets: array = self.database.offsets
+
+        for start, end in zip(offsets, itertools.islice(offsets, 1, None)):
+            # Most satisfied clauses are satisfied by one of their watches, which is cheaper to check than all literals.
+            first: int = literals[start]
+            second: int = literals[start + 1]
+            if (values[first] == TRUE if first > 0 else values[-first] == FALSE) or \
+                    (values[second] == TRUE if second > 0 else values[-second] == FALSE):
+                continue
+
+            unassigned: Set[int] = set()
+            for literal in literals[start:end]:
+                if literal > 0:
+                    value: int = values[literal]
+                    if value == UNASSIGNED:
+                        unassigned.add(names[literal])
+                    elif value == TRUE:
+                        break
+                else:
+                    value: int = values[-literal]
+                    if value == UNASSIGNED:
+                        unassigned.add(-names[-literal])
+                    elif value == FALSE:
+                        break
+            else:
+                open_clauses.append(unassigned)
+
+        return open_clauses
+
+    def _literal_occurrences(self, clauses: List[Set[int]]) -> Dict[int, int]:
+        """
+        Returns the number of occurrences of every literal in the given remaining clauses. The sets engine maintains
+        these incrementally, the watched literals engine has to count them in the open clauses, which it only looks for
+        here.
+        """
+        if self.engine == ENGINE_SETS:
+            return self.occurrences
+
+        return collections.Counter(literal for clause in self._open_clauses(self.solution) for literal in clause)
+
     @staticmethod
     def extract_clause_vars(clause: Set[int]) -> Set[int]:
         """Get the variable name from all literals in the clause by removing any hyphens."""
         return {*map(lambda literal: abs(literal), clause)}
 
-    @abstractmethod
     def _split(
             self,
             clauses: List[Set[int]],
-            solution: Dict[int, bool],
+            solution: Dict[int, Optional[bool]],
+            **extra_vars
+    ) -> Iterator[int]:
+        """The literals to try when the DP algorithm has to split, with the saved phases if phase saving is on."""
+        literals: Iterator[int] = self._split_literals(clauses, solution, **extra_vars)
+        return self._saved_phases(literals) if self.phase_saving else literals
+
+    def _saved_phases(self, literals: Iterator[int]) -> Iterator[int]:
+        """
+        Replaces the direction of the literals of a split by the saved phases. The heuristic still picks the variables
+        and their order. The first literal of a variable gets its saved phase (or the direction of the split, if it
+        has not been assigned before), the second one the other value, which is what a split over both directions
+        tries.
+        """
+        first: Dict[int, Optional[int]] = {}
+        for literal in literals:
+            variable: int = abs(literal)
+            if variable not in first:
+                phase: Optional[bool] = self.phases.get(variable)
+                first[variable] = literal if phase is None else variable if phase else variable * -1
+                yield first[variable]
+            elif first[variable] is not None:
+                yield first[variable] * -1
+                first[variable] = None
+
+    @abstractmethod
+    def _split_literals(
+            self,
+            clauses: List[Set[int]],
+            solution: Dict[int, Optional[bool]],
             **extra_vars
-    ) -> Tuple[bool, Dict[int, bool], List[Set[int]], Optional[int]]:
+    ) -> Iterator[int]:
+        """Yields the literals to try, in order, when the DP algorithm has to split."""
         pass
@@ -0,0 +1,89 @@
+import collections
+from typing import List, Dict, Set, Optional, Iterator, Iterable
+
+from mxklabs.dimacs import Dimacs
+
+from solver.ActivityHeap import ActivityHeap
+from solver.Solver import Solver, PURE_LITERALS
+
+
+class VSIDS(Solver):
+    """Variable State Independent Decaying Sum split."""
+
+    def __init__(
+            self,
+            problem: Dimacs,
+            pure_literals: bool = PURE_LITERALS,
+            engine: Optional[str] = None,
+            restarts: Optional[str] = None,
+            phase_saving: bool = False
+    ):
+        super().__init__(problem, pure_literals, engine, restarts, phase_saving)
+
+        # Start with the number of occurrences of every variable, so the first splits behave like DLCS.
+        occurrences: Dict[int, int] = collections.Counter()
+        for literal, count in self.occurrences.items():
+            occurrences[abs(literal)] += count
+        self.heap: ActivityHeap = ActivityHeap(self.solution, occurrences)
+        # The variables that every active split took from the heap and tried, from the outermost split inwards.
+        self.tried: List[List[int]] = []
+
+    def _add_variables(self, variables: Iterable[int]):
+        variables: List[int] = [*variables]
+        super()._add_variables(variables)
+        for variable in variables:
+            self.heap.push(variable)
+
+    def _conflict(self, conflicting_variable: Optional[int]):
+        super()._conflict(conflicting_variable)
+
+        # The variables of the clause that became empty take part in the conflict, the sets engine only knows one.
+        if conflicting_variable is not None:
+            if self.conflict_clause is not None:
+                for literal in self._explain(self.conflict_clause):
+                    self.heap.bump(self.database.names[abs(literal)])
+            else:
+                self.heap.bump(conflicting_variable)
+            self.heap.decay()
+
+    # noinspection PyMethodOverriding
+    def _split_literals(
+            self,
+            clauses: List[Set[int]],
+            solution: Dict[int, Optional[bool]],
+            order: List[bool]
+    ) -> Iterator[int]:
+        # Variables are popped lazily, so bumps made while trying earlier variables count for the next one. Everything
+        # that was popped returns to the heap once this split is done, because it will be unassigned again by then.
+        popped: List[int] = []
+        unresolved_variables: List[int] = []
+        depth: int = len(self.tried)
+        self.tried.append(unresolved_variables)
+
+        try:
+            for direction in order:
+                for variable in unresolved_variables:
+                    yield variable if direction else variable * -1
+
+                while len(self.heap) != 0:
+                    variable: int = self.heap.pop()
+                    popped.append(variable)
+                    if solution[variable] is not None:
+                        continue
+
+                    unresolved_variables.append(variable)
+                    yield variable if direction else variable * -1
+
+                # The variables that the outer splits tried before their current attempt are unassigned, but not in
+                # the heap. Leaving them out would make the search incomplete.
+                if direction == order[0]:
+                    seen: Set[int] = {*unresolved_variables}
+                    for variable in [variable for tried in self.tried[:depth] for variable in tried]:
+                        if solution[variable] is None and variable not in seen:
+                            seen.add(variable)
+                            unresolved_variables.append(variable)
+                            yield variable if direction else variable * -1
+        finally:
+            del self.tried[depth:]
+            for variable in popped:
+                self.heap.push(variable)
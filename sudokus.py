@@ -0,0 +1,71 @@
+import argparse
+import time
+
+from tools.printer import print_solution, print_stats
+from tools.batch_solver import solve_sudokus_batched
+from tools.dimacs_writer import SolutionWriter, FORMATS, GRID
+from tools.solve_cache import SolveCache
+from tools.sudoku_solver import solve_sudokus
+
+parser = argparse.ArgumentParser(description="Solve every Sudoku in a file with one Sudoku per line.")
+parser.add_argument('sudoku_filename')
+parser.add_argument('rules_filename')
+parser.add_argument('split')
+parser.add_argument('--n', type=int, default=None, help="number of Sudokus to solve")
+parser.add_argument('--offset', type=int, default=0, help="index of the first Sudoku to solve")
+mode = parser.add_mutually_exclusive_group()
+mode.add_argument('--batch', type=int, default=None, metavar='SIZE',
+                  help="propagate SIZE Sudokus at a time with NumPy and only search the ones that stay open")
+mode.add_argument('--cache', type=int, default=None, metavar='CAPACITY',
+                  help="answer Sudokus that are equivalent to one solved before from a cache of CAPACITY results")
+parser.add_argument('--cache-file', default=None, metavar='FILE',
+                    help="also keep the cached results in a database file, to be reused by later runs")
+parser.add_argument('--output', default=None, metavar='FILE',
+                    help="write the solutions to one file, one line per Sudoku, compressed if it ends with .gz")
+parser.add_argument('--format', choices=FORMATS, default=GRID,
+                    help="a line with the digits of the grid, or a DIMACS value line with all literals")
+args = parser.parse_args()
+if args.batch is not None and args.cache_file is not None:
+    parser.error("argument --cache-file: not allowed with argument --batch")
+
+start = time.perf_counter()
+solved = 0
+total = 0
+# Sudokus that the batch solver decided without a search.
+propagated = 0
+
+cache = None
+if args.cache is not None or args.cache_file is not None:
+    cache = SolveCache(*([args.cache] if args.cache is not None else []), path=args.cache_file)
+
+if args.batch is None:
+    results = solve_sudokus(args.sudoku_filename, args.rules_filename, args.split, args.n, args.offset, cache)
+else:
+    results = solve_sudokus_batched(args.sudoku_filename, args.rules_filename, args.split, args.n, args.offset,
+                                    args.batch)
+
+writer = SolutionWriter(args.output, args.format) if args.output is not None else None
+
+for i, solver, success, solution in results:
+    print("Sudoku: {}".format(i))
+    print_solution(success, solution)
+    if writer is not None:
+        writer.write(success, solution)
+    if solver is not None or cache is not None:
+        print_stats(solver, cache)
+    if solver is None and args.batch is not None:
+        propagated += 1
+    solved += 1 if success else 0
+    total += 1
+
+if cache is not None:
+    cache.close()
+if writer is not None:
+    writer.close()
+
+elapsed = time.perf_counter() - start
+print("Solved {} of {} Sudokus in {:.3f}s ({:.1f} Sudokus per second).".format(
+    solved, total, elapsed, total / elapsed if elapsed else 0
+))
+if args.batch is not None:
+    print("{} of them were decided by propagation alone, {} needed a search.".format(propagated, total - propagated))
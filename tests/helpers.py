@@ -0,0 +1,79 @@
+# Small random formulas and a brute force solver, to check the solvers against.
+import itertools
+import os
+import random
+from typing import List, Tuple, Dict, Optional, Iterable
+
+# The directory of the repository, for the rules and the Sudoku files.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+Clause = Tuple[int, ...]
+# A cardinality constraint: at most bound of the literals are True.
+Constraint = Tuple[Tuple[int, ...], int]
+
+
+def random_cnf(
+        rng: random.Random,
+        num_vars: int,
+        num_clauses: int,
+        width: int = 3,
+        min_width: int = 1
+) -> List[Clause]:
+    """Clauses of min_width up to width distinct variables each, with random signs."""
+    return [
+        tuple(
+            variable * rng.choice((1, -1))
+            for variable in rng.sample(range(1, num_vars + 1), rng.randint(min_width, width))
+        )
+        for _ in range(num_clauses)
+    ]
+
+
+def random_constraints(rng: random.Random, num_vars: int, num_constraints: int) -> List[Constraint]:
+    """At-most-k constraints of two to five distinct variables with random signs, and a bound of zero to two."""
+    return [
+        (
+            tuple(
+                variable * rng.choice((1, -1))
+                for variable in rng.sample(range(1, num_vars + 1), rng.randint(2, min(5, num_vars)))
+            ),
+            rng.randint(0, 2)
+        )
+        for _ in range(num_constraints)
+    ]
+
+
+def to_dimacs(num_vars: int, clauses: Iterable[Clause], constraints: Iterable[Constraint] = ()) -> bytes:
+    """The clauses in DIMACS, in the cnf+ format if there are constraints."""
+    clauses, constraints = [*clauses], [*constraints]
+    lines: List[str] = ["p {} {} {}".format(
+        "cnf+" if constraints else "cnf", num_vars, len(clauses) + len(constraints)
+    )]
+    lines.extend(" ".join(map(str, [*clause, 0])) for clause in clauses)
+    lines.extend("{} <= {}".format(" ".join(map(str, literals)), bound) for literals, bound in constraints)
+    return "\n".join(lines).encode() + b"\n"
+
+
+def satisfies(
+        solution: Dict[int, Optional[bool]],
+        clauses: Iterable[Clause],
+        constraints: Iterable[Constraint] = ()
+) -> bool:
+    """
+    Whether the solution satisfies the clauses and constraints. An unassigned variable satisfies no clause, but counts
+    as False in a constraint, as it does in the written solution.
+    """
+    return all(any(solution.get(abs(literal)) == (literal > 0) for literal in clause) for clause in clauses) and all(
+        sum(bool(solution.get(abs(literal))) == (literal > 0) for literal in literals) <= bound
+        for literals, bound in constraints
+    )
+
+
+def models(num_vars: int, clauses: List[Clause], constraints: List[Constraint] = ()) -> List[Dict[int, bool]]:
+    """Every solution of the clauses and constraints, by trying every assignment."""
+    return [
+        solution
+        for values in itertools.product((False, True), repeat=num_vars)
+        for solution in [dict(zip(range(1, num_vars + 1), values))]
+        if satisfies(solution, clauses, constraints)
+    ]
@@ -0,0 +1,73 @@
+import os
+from typing import List, Tuple
+
+import pytest
+
+from solver.RuleBase import RuleBase
+from solver.Solver import Status
+from tests.helpers import ROOT, satisfies
+from tools.get_solver import create_solver
+from tools.sudoku_preprocessor import Grid, get_grid
+from tools.sudoku_to_dimacs import read_sudokus
+
+numpy = pytest.importorskip('numpy')
+
+from tools.batch_solver import solve_batch, solve_sudokus_batched, load_batch, propagate  # noqa: E402
+
+RULES = os.path.join(ROOT, 'input', 'rules', 'sudoku-rules-{0}x{0}.txt')
+SUDOKUS = os.path.join(ROOT, 'input', 'sudoku', '{}')
+
+
+def sudokus(filename: str, n: int) -> List[Tuple[int, int, List[int]]]:
+    return [sudoku for _, sudoku in zip(range(n), read_sudokus(SUDOKUS.format(filename)))]
+
+
+@pytest.mark.parametrize('filename, size, n', [('4x4.txt', 4, 200), ('1000sudokus.txt', 9, 50)])
+def test_agrees_with_solver(filename, size, n):
+    rules: RuleBase = RuleBase.load(RULES.format(size))
+    batch = sudokus(filename, n)
+
+    for (i, solver, status, solution), (j, _, literals) in zip(solve_batch(batch, rules, 'cdcl'), batch):
+        assert i == j
+        expected, _, _, _ = create_solver('cdcl', rules.problem(literals)).solve(max_calls=None, order=[True])
+        assert status is expected
+        if status is Status.SAT:
+            assert satisfies(solution, [*rules.clauses, *((literal,) for literal in literals)])
+
+
+def test_propagated_solutions_are_complete():
+    rules: RuleBase = RuleBase.load(RULES.format(9))
+    propagated = [solution for _, solver, status, solution in solve_batch(sudokus('1000sudokus.txt', 50), rules, 'cdcl')
+                  if solver is None and status is Status.SAT]
+    assert len(propagated) != 0
+    # One digit in every cell, and a value for every variable of the rules.
+    assert all(sum(solution.values()) == 81 and solution.keys() == rules.variables for solution in propagated)
+
+
+def test_contradiction():
+    rules: RuleBase = RuleBase.load(RULES.format(4))
+    grid: Grid = get_grid(4)
+    # The same digit twice in the first row, and two digits in the first cell.
+    batch = [
+        (0, 4, [grid.variables[0][0], grid.variables[1][0]]),
+        (1, 4, [grid.variables[0][0], grid.variables[0][1]]),
+        (2, 4, [grid.variables[0][0]]),
+    ]
+
+    candidates, failed = propagate(load_batch(4, batch))
+    assert failed.tolist() == [True, True, False]
+
+    statuses = [status for _, _, status, _ in solve_batch(batch, rules, 'cdcl')]
+    assert statuses == [Status.UNSAT, Status.UNSAT, Status.SAT]
+
+
+def test_batches_keep_the_order():
+    results = solve_sudokus_batched(SUDOKUS.format('4x4.txt'), RULES.format(4), 'cdcl', n=25, offset=10, batch_size=7)
+    assert [i for i, _, _, _ in results] == [*range(10, 35)]
+
+
+def test_other_encoding():
+    # The givens of the 16x16 file are not variables of the 16x16 rules.
+    rules: RuleBase = RuleBase.load(RULES.format(16))
+    with pytest.raises(ValueError):
+        solve_batch(sudokus('16x16.txt', 1), rules, 'cdcl')
@@ -0,0 +1,32 @@
+import pytest
+
+from tools.dimacs_reader import parse_dimacs, DimacsError
+
+
+@pytest.mark.parametrize('data, message, line, column', [
+    (b"", "missing problem statement", None, None),
+    (b"c only a comment\n1 2 0\n", "expected a problem statement or comment on this line", 2, 1),
+    (b"p dnf 2 1\n1 2 0\n", "expected 'p cnf <variables> <clauses>'", 1, 1),
+    (b"c header\np cnf x 1\n1 2 0\n", "invalid syntax", 2, 7),
+    (b"p cnf 3 2\n1 2 0\n  3 x 0\n", "invalid syntax", 3, 5),
+    (b"p cnf 3 2\n1 2 0\nc 1 x\n3 -1.5 0\n", "invalid syntax", 4, 3),
+    (b"p cnf 3 2\n1 2 0\nc comment\n 3  99999999999 0\n", "literal out of range", 4, 5),
+    (b"p cnf 3 1\n-2147483649 0\n", "literal out of range", 2, 1),
+    (b"p cnf 3 2\n1 2 0\n3 -1\n", "the last clause is not terminated by 0", 3, 3),
+    (b"p cnf 3 3\n1 2 0\n3 0\n", "the declared number of clauses (3) does not match", 1, 9),
+    (b"p cnf 2 1\n1 3 0\n", "the declared number of variables (2) is smaller", 1, 7),
+    (b"p cnf+ 3 2\n1 2 0\n1 2 x <= 1\n", "expected '<literals> <= <bound>'", 3, 1),
+    (b"p cnf+ 3 2\n1 2 0\n1 1 3 <= 1\n", "a literal occurs more than once", 3, 1),
+])
+def test_errors(data, message, line, column):
+    with pytest.raises(DimacsError) as raised:
+        parse_dimacs(data)
+    assert str(raised.value).startswith(message)
+    assert (raised.value.line, raised.value.column) == (line, column)
+
+
+def test_parse():
+    cnf = parse_dimacs(b"c a comment\np cnf+ 4 3\n1 -2 0 3\n 4 0\nc 5 0\n1 2 3 <= 1\n%\n0\n")
+    assert cnf.num_vars == 4
+    assert [[*clause] for clause in cnf] == [[1, -2], [3, 4]]
+    assert [([*literals], bound) for literals, bound in cnf.constraints] == [([1, 2, 3], 1)]
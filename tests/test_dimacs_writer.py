@@ -0,0 +1,75 @@
+import gzip
+import os
+
+import pytest
+
+from solver.RuleBase import RuleBase
+from solver.Solver import Status
+from tests.helpers import ROOT
+from tools.dimacs_reader import parse_dimacs
+from tools.dimacs_writer import SolutionWriter, write_dimacs, GRID, VALUES
+from tools.get_solver import create_solver
+from tools.sudoku_to_dimacs import sudoku_to_literals
+
+RULES = os.path.join(ROOT, 'input', 'rules', 'sudoku-rules-4x4.txt')
+SUDOKU = '...3..4114..3...'
+
+
+def solve(sudoku: str):
+    size, literals = sudoku_to_literals(sudoku)
+    status, solution, _, _ = create_solver('cdcl', RuleBase.load(RULES).problem(literals)).solve(order=[True])
+    return status, solution
+
+
+def test_grid(tmp_path):
+    status, solution = solve(SUDOKU)
+    filename: str = str(tmp_path / 'solutions.txt')
+    with SolutionWriter(filename, GRID) as writer:
+        writer.write(status, solution)
+        writer.write(Status.UNSAT, None)
+        writer.write(Status.UNKNOWN, None)
+        assert writer.written == 3
+
+    with open(filename) as file:
+        grid, unsat, unknown = file.read().split("\n")[:3]
+    # The solution keeps the givens, and reads back as the same literals.
+    assert all(given in ('.', digit) for given, digit in zip(SUDOKU, grid))
+    assert set(sudoku_to_literals(grid)[1]) == {variable for variable, value in solution.items() if value}
+    assert (unsat, unknown) == ("", "")
+
+
+def test_values(tmp_path):
+    status, solution = solve(SUDOKU)
+    filename: str = str(tmp_path / 'solutions.txt.gz')
+    with SolutionWriter(filename, VALUES) as writer:
+        writer.write(status, {**solution, 999: None})
+        writer.write(Status.UNSAT, None)
+        writer.write(Status.UNKNOWN, None)
+
+    # Compressed, because of the file name.
+    with gzip.open(filename, 'rt') as file:
+        values, unsat, unknown = file.read().splitlines()
+    # Unassigned variables are left out.
+    assert values == "v {} 0".format(" ".join(
+        str(variable if value else variable * -1) for variable, value in solution.items()
+    ))
+    assert (unsat, unknown) == ("s UNSATISFIABLE", "s UNKNOWN")
+
+
+def test_invalid(tmp_path):
+    with pytest.raises(ValueError):
+        SolutionWriter(str(tmp_path / 'solutions.txt'), 'csv')
+    with SolutionWriter(str(tmp_path / 'solutions.txt')) as writer:
+        with pytest.raises(ValueError):
+            writer.write(Status.SAT, {1: True, 2: True, 3: False})
+
+
+def test_write_dimacs(tmp_path):
+    filename: str = str(tmp_path / 'solution.cnf')
+    write_dimacs(filename, {1: True, 2: None, 4: False})
+
+    with open(filename, 'rb') as file:
+        cnf = parse_dimacs(file.read())
+    # The header declares the highest variable, unassigned variables are written as False.
+    assert (cnf.num_vars, cnf.num_clauses) == (4, 3)
+    assert [[*clause] for clause in cnf] == [[1], [-2], [-4]]
@@ -0,0 +1,44 @@
+import os
+import random
+
+from solver.RuleBase import RuleBase
+from solver.Solver import Status
+from tests.helpers import ROOT, random_cnf, to_dimacs, satisfies, models
+from tools.dimacs_reader import parse_dimacs
+from tools.get_solver import create_solver
+
+NUM_VARS = 6
+
+
+def test_iter_solutions_finds_every_model_once():
+    rng: random.Random = random.Random(4)
+    for _ in range(100):
+        clauses = random_cnf(rng, NUM_VARS, rng.randint(2, 20))
+        solver = create_solver('cdcl', parse_dimacs(to_dimacs(NUM_VARS, clauses)))
+        found = [*solver.iter_solutions(max_calls=None, order=[True])]
+
+        # CDCL assigns every variable that occurs, and the variables that don't occur are not part of the problem.
+        occurring = {abs(literal) for clause in clauses for literal in clause}
+        expected = {
+            tuple(model[variable] for variable in sorted(occurring)) for model in models(NUM_VARS, clauses)
+        }
+        assert solver.status is Status.UNSAT
+        assert all(satisfies(solution, clauses) for solution in found)
+        assert len(found) == len(expected)
+        assert {tuple(solution[variable] for variable in sorted(occurring)) for solution in found} == expected
+
+
+def test_count_solutions_of_empty_sudoku():
+    rules: RuleBase = RuleBase.load(os.path.join(ROOT, 'input', 'rules', 'sudoku-rules-4x4.txt'))
+    solver = create_solver('cdcl', rules.problem([]))
+    assert solver.count_solutions(None, order=[True]) == 288
+    assert solver.status is Status.UNSAT
+
+    # The blocking clauses are switched off afterwards, and the limit stops early.
+    assert solver.count_solutions(2, order=[True]) == 2
+    assert solver.solve(order=[True])[0] is Status.SAT
+
+
+def test_only_cdcl_enumerates():
+    solver = create_solver('dlis', parse_dimacs(to_dimacs(2, [(1, 2)])))
+    assert not hasattr(solver, 'iter_solutions')
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from solver.Solver import Status
+from tests.helpers import random_cnf, to_dimacs, models
+from tools.dimacs_reader import parse_dimacs
+from tools.get_solver import create_solver, get_order
+
+NUM_VARS = 6
+
+
+@pytest.mark.parametrize('split', ['cdcl', 'dlis__watched', 'fifo'])
+def test_core_is_subset_of_assumptions(split):
+    rng: random.Random = random.Random(2)
+    unsat: int = 0
+    for _ in range(60):
+        clauses = random_cnf(rng, NUM_VARS, rng.randint(5, 30))
+        assumptions = [variable * rng.choice((1, -1)) for variable in rng.sample(range(1, NUM_VARS + 1), 3)]
+        solver = create_solver(split, parse_dimacs(to_dimacs(NUM_VARS, clauses)))
+        status, solution, _, _ = solver.solve(max_calls=None, assumptions=assumptions, order=get_order(split))
+
+        # The assumptions are unit clauses for the brute force solver.
+        if models(NUM_VARS, [*clauses, *((literal,) for literal in assumptions)]):
+            assert status is Status.SAT
+            assert all(solution[abs(literal)] == (literal > 0) for literal in assumptions)
+        else:
+            unsat += 1
+            assert status is Status.UNSAT
+            assert set(solver.core) <= set(assumptions)
+            # The core alone is enough for the conflict.
+            assert not models(NUM_VARS, [*clauses, *((literal,) for literal in solver.core)])
+    assert unsat != 0
+
+
+@pytest.mark.parametrize('split', ['cdcl', 'vsids__watched', 'dlcs'])
+def test_added_clauses_and_assumptions_between_calls(split):
+    rng: random.Random = random.Random(3)
+    for _ in range(30):
+        clauses = random_cnf(rng, NUM_VARS, rng.randint(3, 12))
+        solver = create_solver(split, parse_dimacs(to_dimacs(NUM_VARS, clauses)))
+
+        for _ in range(4):
+            # Assumptions only hold for one call, added clauses for all following calls.
+            assumption: int = rng.randint(1, NUM_VARS) * rng.choice((1, -1))
+            status, solution, _, _ = solver.solve(max_calls=None, assumptions=[assumption], order=get_order(split))
+            assert (status is Status.SAT) == bool(models(NUM_VARS, [*clauses, (assumption,)]))
+
+            status, solution, _, _ = solver.solve(max_calls=None, order=get_order(split))
+            assert (status is Status.SAT) == bool(models(NUM_VARS, clauses))
+
+            clause = random_cnf(rng, NUM_VARS, 1)[0]
+            solver.add_clause(clause)
+            clauses.append(clause)
@@ -0,0 +1,49 @@
+import random
+
+from solver.Preprocessor import Preprocessor
+from solver.Solver import Status
+from tests.helpers import random_cnf, to_dimacs, satisfies, models
+from tools.dimacs_reader import parse_dimacs
+from tools.get_solver import create_solver
+
+NUM_VARS = 8
+
+
+def test_extend_satisfies_original_clauses():
+    rng: random.Random = random.Random(5)
+    for _ in range(100):
+        # Mostly binary clauses, which give the elimination and the probing something to do.
+        clauses = random_cnf(rng, NUM_VARS, rng.randint(5, 25), width=2)
+        preprocessor: Preprocessor = Preprocessor(clauses)
+        simplified = preprocessor.run()
+
+        # An inconsistent formula simplifies to the empty clause, which has no models.
+        solved = models(NUM_VARS, simplified)
+        assert bool(solved) == bool(models(NUM_VARS, clauses))
+        for solution in solved[:5]:
+            assert satisfies(preprocessor.extend(solution), clauses)
+
+
+def test_simplify_split_solves_original_problem():
+    rng: random.Random = random.Random(6)
+    for _ in range(50):
+        clauses = random_cnf(rng, NUM_VARS, rng.randint(5, 30))
+        solver = create_solver('cdcl__simplify', parse_dimacs(to_dimacs(NUM_VARS, clauses)))
+        status, solution, _, _ = solver.solve(max_calls=None, order=[True])
+
+        if models(NUM_VARS, clauses):
+            assert status is Status.SAT
+            assert satisfies(solution, clauses)
+        else:
+            assert status is Status.UNSAT
+
+
+def test_extend_after_elimination():
+    # 2 only occurs in these two clauses, so it is eliminated and its value comes from extend().
+    clauses = [(1, 2), (-2, 3), (-1, -3, 4)]
+    preprocessor: Preprocessor = Preprocessor(clauses)
+    simplified = preprocessor.run()
+    assert all(2 not in map(abs, clause) for clause in simplified)
+
+    for solution in models(4, simplified):
+        assert satisfies(preprocessor.extend(solution), clauses)
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from solver import RestartPolicy as restart_policy
+from solver.RestartPolicy import luby, get_restart_policy
+from solver.Solver import Status
+from tests.helpers import random_cnf, to_dimacs, satisfies, models
+from tools.dimacs_reader import parse_dimacs
+from tools.get_solver import create_solver, get_order
+
+# The splits with a restart policy and phase saving, and whether they are sure to restart on the test formulas. Glucose
+# only restarts when the conflicts get worse than average.
+SPLITS = [
+    ('cdcl__luby', True),
+    ('cdcl__glucose__phase', False),
+    ('vsids__watched__geometric', True),
+    ('dlis__watched__luby__phase', True),
+    ('fifo__watched__glucose', False),
+    ('dlcs__reversed__phase', False),
+]
+NUM_VARS = 6
+
+
+def test_luby_sequence():
+    assert [luby(index) for index in range(15)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+def test_schedules(monkeypatch):
+    monkeypatch.setattr(restart_policy, 'LUBY_UNIT', 2)
+    monkeypatch.setattr(restart_policy, 'GEOMETRIC_FIRST', 2)
+
+    for name, expected in (('luby', [2, 2, 4, 2, 2, 4, 8]), ('geometric', [2, 3, 5, 7, 11])):
+        policy = get_restart_policy(name)
+        intervals = []
+        for _ in expected:
+            conflicts = 1
+            while not policy.conflict(1):
+                conflicts += 1
+            intervals.append(conflicts)
+        assert intervals == expected
+
+        # A new solve() starts the schedule over.
+        policy.reset()
+        assert policy.restarts == 0 and policy.conflicts == 0
+
+
+@pytest.mark.parametrize('split, restarting', SPLITS)
+def test_agrees_with_brute_force(split, restarting, monkeypatch):
+    # Restart after a few conflicts, so the small formulas restart as well.
+    monkeypatch.setattr(restart_policy, 'LUBY_UNIT', 2)
+    monkeypatch.setattr(restart_policy, 'GEOMETRIC_FIRST', 2)
+    monkeypatch.setattr(restart_policy, 'GLUCOSE_WINDOW', 3)
+
+    rng: random.Random = random.Random(10)
+    restarts: int = 0
+    for _ in range(40):
+        clauses = random_cnf(rng, NUM_VARS, rng.randint(22, 28), min_width=3)
+        solver = create_solver(split, parse_dimacs(to_dimacs(NUM_VARS, clauses)))
+        status, solution, _, _ = solver.solve(max_calls=None, order=get_order(split))
+        restarts += solver.restarts
+
+        if models(NUM_VARS, clauses):
+            assert status is Status.SAT
+            assert satisfies(solution, clauses)
+        else:
+            assert status is Status.UNSAT
+    assert restarts != 0 or not restarting
@@ -0,0 +1,109 @@
+import math
+import os
+import random
+from typing import List
+
+import pytest
+
+from solver.RuleBase import RuleBase
+from solver.Solver import Status
+from tests.helpers import ROOT
+from tools.get_solver import create_solver
+from tools.solve_cache import SolveCache
+from tools.sudoku_preprocessor import Grid, get_grid
+from tools.sudoku_to_dimacs import sudoku_to_literals
+
+RULES = os.path.join(ROOT, 'input', 'rules', 'sudoku-rules-9x9.txt')
+SUDOKUS = [
+    '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......',
+    '52...6.........7.13...........4..8..6......5...........418.........3..2...87.....',
+]
+
+
+def relabel(sudoku: str, rng: random.Random) -> str:
+    digits: List[str] = rng.sample('123456789', 9)
+    return sudoku.translate(str.maketrans('123456789', ''.join(digits)))
+
+
+def permute(sudoku: str, rng: random.Random) -> str:
+    """Reorders the bands, the stacks and the rows and columns within them, which keeps the rules."""
+    size: int = math.isqrt(len(sudoku))
+    box: int = math.isqrt(size)
+    rows: List[int] = [band * box + row for band in rng.sample(range(box), box) for row in rng.sample(range(box), box)]
+    cols: List[int] = [stack * box + col for stack in rng.sample(range(box), box) for col in rng.sample(range(box), box)]
+    return ''.join(sudoku[row * size + col] for row in rows for col in cols)
+
+
+def transpose(sudoku: str) -> str:
+    size: int = math.isqrt(len(sudoku))
+    return ''.join(sudoku[col * size + row] for row in range(size) for col in range(size))
+
+
+def check_solution(sudoku: str, solution) -> None:
+    """The solution fills every cell with one digit, keeps the givens and obeys the rules."""
+    grid: Grid = get_grid(9)
+    digits: List[int] = [0] * 81
+    for variable, (cell, digit) in grid.cells.items():
+        if solution[variable]:
+            assert digits[cell] == 0
+            digits[cell] = digit
+    assert all(given == '.' or int(given) == digit for given, digit in zip(sudoku, digits))
+    for unit in grid.units:
+        assert sorted(digits[cell] for cell in unit) == [*range(1, 10)]
+
+
+@pytest.fixture(scope='module')
+def rules() -> RuleBase:
+    return RuleBase.load(RULES)
+
+
+def solve_with(rules: RuleBase, literals: List[int]):
+    def solve():
+        status, solution, _, _ = create_solver('cdcl', rules.problem(literals)).solve(max_calls=None, order=[True])
+        return status, solution
+    return solve
+
+
+def not_solved():
+    raise AssertionError("An equivalent Sudoku was solved again instead of answered from the cache.")
+
+
+@pytest.mark.parametrize('sudoku', SUDOKUS)
+def test_equivalent_sudokus_hit(rules, sudoku):
+    rng: random.Random = random.Random(7)
+    cache: SolveCache = SolveCache()
+    size, literals = sudoku_to_literals(sudoku)
+    hit, (status, solution) = cache.solve(size, literals, solve_with(rules, literals))
+    assert not hit and status is Status.SAT
+    check_solution(sudoku, solution)
+
+    variants: List[str] = [
+        relabel(sudoku, rng),
+        transpose(sudoku),
+        transpose(relabel(sudoku, rng)),
+        *(permute(relabel(sudoku, rng), rng) for _ in range(5)),
+        *(transpose(permute(sudoku, rng)) for _ in range(5)),
+    ]
+    for variant in variants:
+        size, literals = sudoku_to_literals(variant)
+        # Permutations within bands and stacks are not part of the canonical form, those are solved again.
+        hit, (status, solution) = cache.solve(size, literals, solve_with(rules, literals))
+        assert status is Status.SAT
+        check_solution(variant, solution)
+
+    for variant in variants[:3]:
+        size, literals = sudoku_to_literals(variant)
+        hit, (status, solution) = cache.solve(size, literals, not_solved)
+        assert hit and status is Status.SAT
+        check_solution(variant, solution)
+
+
+def test_unsatisfiable_sudoku_is_cached(rules):
+    # Two 1s in the first row.
+    sudoku: str = '11' + '.' * 79
+    cache: SolveCache = SolveCache()
+    size, literals = sudoku_to_literals(sudoku)
+    hit, (status, solution) = cache.solve(size, literals, solve_with(rules, literals))
+    assert not hit and status is Status.UNSAT
+    size, literals = sudoku_to_literals(transpose(relabel(sudoku, random.Random(8))))
+    assert cache.solve(size, literals, not_solved) == (True, (Status.UNSAT, None))
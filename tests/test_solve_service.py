@@ -0,0 +1,66 @@
+import asyncio
+import os
+
+import pytest
+
+from tests.helpers import ROOT, to_dimacs
+from tools.solve_service import SolveService, solve_request
+
+RULES = os.path.join(ROOT, 'input', 'rules', 'sudoku-rules-{0}x{0}.txt')
+SUDOKU = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+
+
+def first_line(filename: str) -> str:
+    with open(os.path.join(ROOT, 'input', 'sudoku', filename)) as file:
+        return file.readline().strip()
+
+
+def test_sudoku():
+    response = solve_request({'sudoku': SUDOKU, 'rules': RULES.format(9)}, 0)
+    assert response['status'] == 'SAT'
+    positive = [literal for literal in response['solution'] if literal > 0]
+    assert len(positive) == 81
+    # The givens of the first row, 4 in the first cell and 8 and 5 in the last three.
+    assert {114, 178, 195}.issubset(positive)
+
+
+def test_cnf():
+    assert solve_request({'cnf': to_dimacs(2, [(1, 2), (-1,)]).decode()}, 0)['solution'] == [-1, 2]
+    assert solve_request({'cnf': to_dimacs(1, [(1,), (-1,)]).decode()}, 0)['status'] == 'UNSAT'
+
+
+def test_budget():
+    response = solve_request({'sudoku': SUDOKU, 'rules': RULES.format(9), 'split': 'fifo', 'max_calls': 1}, 0)
+    assert response['status'] == 'UNKNOWN'
+    assert response['solution'] is None
+
+
+def test_invalid_requests():
+    with pytest.raises(ValueError):
+        solve_request({}, 0)
+    with pytest.raises(ValueError):
+        solve_request({'sudoku': '1' * 10}, 0)
+    # The givens of the 16x16 file are not variables of the 16x16 rules, the solver would ignore them.
+    with pytest.raises(ValueError):
+        solve_request({'sudoku': first_line('16x16.txt'), 'rules': RULES.format(16)}, 0)
+
+
+def test_service():
+    async def run():
+        service = SolveService(1, [RULES.format(9)], {'max_calls': 1, 'split': 'fifo'})
+        await service.start()
+        try:
+            return await asyncio.gather(
+                # The budget of the service applies to fields that a request leaves unset or None.
+                service.handle({'sudoku': SUDOKU, 'rules': RULES.format(9), 'max_calls': None}),
+                service.handle({'sudoku': SUDOKU, 'rules': RULES.format(9), 'split': 'cdcl', 'max_calls': 100000}),
+                service.handle({'cnf': 'p cnf'}),
+            ), service.stats()
+        finally:
+            service.close()
+
+    (limited, solved, failed), stats = asyncio.run(run())
+    assert limited['status'] == 'UNKNOWN'
+    assert solved['status'] == 'SAT'
+    assert 'error' in failed
+    assert (stats['Requests'], stats['Completed'], stats['Failed']) == (3, 2, 1)
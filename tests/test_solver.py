@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from solver.Solver import Status
+from tests.helpers import random_cnf, random_constraints, to_dimacs, satisfies, models
+from tools.dimacs_reader import parse_dimacs
+from tools.get_solver import create_solver, get_order
+
+# Splits that try both values of every variable, so that UNSAT is a proof. dlis runs on the sets engine.
+SPLITS = ['cdcl', 'vsids__watched', 'dlis', 'dlis__watched', 'dlcs__reversed', 'fifo__watched']
+# Splits for the cardinality constraints, fifo and dlcs on the sets engine as well.
+CONSTRAINT_SPLITS = [*SPLITS, 'fifo', 'dlcs', 'vsids__watched__luby']
+NUM_VARS = 6
+
+
+def formulas(count: int, seed: int = 1):
+    rng: random.Random = random.Random(seed)
+    for _ in range(count):
+        yield random_cnf(rng, NUM_VARS, rng.randint(5, 30))
+
+
+@pytest.mark.parametrize('split', SPLITS)
+def test_agrees_with_brute_force(split):
+    for clauses in formulas(60):
+        solver = create_solver(split, parse_dimacs(to_dimacs(NUM_VARS, clauses)))
+        status, solution, _, _ = solver.solve(max_calls=None, order=get_order(split))
+
+        if models(NUM_VARS, clauses):
+            assert status is Status.SAT
+            assert satisfies(solution, clauses)
+        else:
+            assert status is Status.UNSAT
+
+
+@pytest.mark.parametrize('split', CONSTRAINT_SPLITS)
+def test_constraints_agree_with_brute_force(split):
+    rng: random.Random = random.Random(2)
+    for _ in range(100):
+        clauses = random_cnf(rng, NUM_VARS, rng.randint(0, 12))
+        constraints = random_constraints(rng, NUM_VARS, rng.randint(1, 3))
+        solver = create_solver(split, parse_dimacs(to_dimacs(NUM_VARS, clauses, constraints)))
+        status, solution, _, _ = solver.solve(max_calls=None, order=get_order(split))
+
+        if models(NUM_VARS, clauses, constraints):
+            assert status is Status.SAT
+            assert satisfies(solution, clauses, constraints)
+        else:
+            assert status is Status.UNSAT
@@ -0,0 +1,72 @@
+import itertools
+import os
+import random
+from typing import List
+
+import pytest
+
+from solver.RuleBase import RuleBase
+from solver.Solver import Status
+from tests.helpers import ROOT
+from tools.get_solver import create_solver
+from tools.sudoku_preprocessor import Grid, get_grid, detect_size, implied_literals
+from tools.sudoku_to_dimacs import read_sudokus
+
+
+def solutions_4x4() -> List[List[int]]:
+    """Every solution of an empty 4x4 Sudoku, as the digits of its cells."""
+    grid: Grid = get_grid(4)
+    found: List[List[int]] = []
+    for rows in itertools.product(itertools.permutations(range(1, 5)), repeat=4):
+        digits: List[int] = [digit for row in rows for digit in row]
+        if all(len({digits[cell] for cell in unit}) == 4 for unit in grid.units):
+            found.append(digits)
+    return found
+
+
+def holds(literal: int, digits: List[int]) -> bool:
+    cell, digit = get_grid(4).cells[abs(literal)]
+    return (digits[cell] == digit) == (literal > 0)
+
+
+@pytest.mark.parametrize('size', [4, 9, 16])
+def test_detect_size(size):
+    variables = frozenset(get_grid(size).cells)
+    assert detect_size(variables) == size
+    assert detect_size(variables - {min(variables)}) is None
+
+
+def test_implied_literals_hold_in_every_solution():
+    rng: random.Random = random.Random(9)
+    grid: Grid = get_grid(4)
+    solutions: List[List[int]] = solutions_4x4()
+    assert len(solutions) == 288
+
+    for _ in range(300):
+        literals: List[int] = [
+            grid.variables[cell][rng.randrange(4)] for cell in rng.sample(range(16), rng.randint(1, 7))
+        ]
+        matching = [digits for digits in solutions if all(holds(literal, digits) for literal in literals)]
+        implied = implied_literals(4, literals)
+
+        if implied is None:
+            assert len(matching) == 0
+        else:
+            assert all(holds(literal, digits) for literal in implied for digits in matching)
+
+
+def test_implied_literals_agree_with_solver():
+    rules: RuleBase = RuleBase.load(os.path.join(ROOT, 'input', 'rules', 'sudoku-rules-9x9.txt'))
+    for _, (i, size, literals) in zip(range(20), read_sudokus(os.path.join(ROOT, 'input', 'sudoku', '1000sudokus.txt'))):
+        status, solution, _, _ = create_solver('cdcl', rules.problem(literals)).solve(max_calls=None, order=[True])
+        assert status is Status.SAT
+
+        implied = implied_literals(size, literals)
+        assert implied is not None
+        assert all(solution[abs(literal)] == (literal > 0) for literal in implied)
+
+
+def test_contradiction():
+    grid: Grid = get_grid(9)
+    # The same digit twice in the first row.
+    assert implied_literals(9, [grid.variables[0][0], grid.variables[1][0]]) is None
@@ -0,0 +1,185 @@
+# Solves many Sudokus at once: candidate elimination on a whole batch of grids with NumPy array operations, and the
+# split search of a solver only for the grids that are still open afterwards.
+import functools
+import math
+from typing import List, Dict, Tuple, Optional, Iterator, Callable
+
+from solver.RuleBase import RuleBase
+from solver.Solver import Solver, Status
+from tools.get_solver import create_solver, get_order
+from tools.sudoku_preprocessor import Grid, get_grid, detect_size
+from tools.sudoku_to_dimacs import read_sudokus
+
+try:
+    import numpy
+except ImportError:
+    # NumPy is optional, only the batch solver needs it.
+    numpy = None
+
+# The number of Sudokus that are propagated together.
+BATCH_SIZE = 1000
+
+# A Sudoku with its index in the file, its size and its givens, as read_sudokus yields them.
+Sudoku = Tuple[int, int, List[int]]
+# The index, the solver that searched (None if propagation alone decided the Sudoku), the status and the solution.
+Result = Tuple[int, Optional[Solver], Status, Optional[Dict[int, bool]]]
+
+
+def _rows(candidates):
+    return candidates
+
+
+def _cols(candidates):
+    return candidates.transpose(0, 2, 1)
+
+
+def _boxes(candidates):
+    n, size, _ = candidates.shape
+    box: int = math.isqrt(size)
+    return candidates.reshape(n, box, box, box, box).transpose(0, 1, 3, 2, 4).reshape(n, size, size)
+
+
+# Every unit rearranges a batch of grids of shape (N, size, size) so that the cells of unit u of grid g are in
+# [g, u, :], and back: each of them is its own inverse.
+UNITS: List[Callable] = [_rows, _cols, _boxes]
+
+
+@functools.lru_cache(maxsize=None)
+def popcounts(size: int):
+    """The number of candidates in every mask of a Sudoku of some size, to be indexed with an array of masks."""
+    return numpy.array([bin(mask).count('1') for mask in range(1 << size)], dtype=numpy.int8)
+
+
+def load_batch(size: int, sudokus: List[Sudoku]):
+    """
+    The candidates of a batch of Sudokus of one size, as an array of shape (N, size, size): bit d - 1 of [g, row, col]
+    is set if digit d fits in that cell of grid g. A cell with two different givens has no candidates.
+    """
+    grid: Grid = get_grid(size)
+    candidates = numpy.full((len(sudokus), size * size), (1 << size) - 1, dtype=numpy.uint32)
+
+    positions: List[Tuple[int, int, int]] = [
+        (g, *grid.cells[literal]) for g, (i, _, literals) in enumerate(sudokus) for literal in literals
+    ]
+    if len(positions) != 0:
+        grids, cells, digits = numpy.array(positions, dtype=numpy.int64).T
+        numpy.bitwise_and.at(candidates, (grids, cells), numpy.left_shift(1, digits - 1).astype(numpy.uint32))
+
+    return candidates.reshape(len(sudokus), size, size)
+
+
+def propagate(candidates):
+    """
+    Applies naked singles and hidden singles to every grid of a batch at once, until nothing changes. Returns the
+    remaining candidates and which grids turned out to have no solution, the candidates of those grids mean nothing.
+    """
+    n, size, _ = candidates.shape
+    full: int = (1 << size) - 1
+    popcount = popcounts(size)
+    failed = numpy.zeros(n, dtype=bool)
+
+    while True:
+        before = candidates
+        for unit in UNITS:
+            cells = unit(candidates)
+
+            # Naked singles: the digit of a cell with one candidate left fits in no other cell of the unit. Two such
+            # cells with the same digit are a contradiction.
+            single = popcount[cells] == 1
+            placed = numpy.bitwise_or.reduce(numpy.where(single, cells, 0), axis=2)
+            failed |= (popcount[placed] != single.sum(axis=2)).any(axis=1)
+            cells = numpy.where(single, cells, cells & ~placed[:, :, None])
+
+            # Hidden singles: a digit that fits in only one cell of the unit. Every digit has to fit somewhere, and one
+            # cell can't be the only place for two digits.
+            once = numpy.zeros_like(placed)
+            twice = numpy.zeros_like(placed)
+            for k in range(size):
+                twice |= once & cells[:, :, k]
+                once |= cells[:, :, k]
+            failed |= (once != full).any(axis=1)
+            hidden = cells & ~twice[:, :, None]
+            failed |= (popcount[hidden] > 1).any(axis=(1, 2))
+            cells = numpy.where(hidden != 0, hidden, cells)
+
+            candidates = unit(cells)
+
+        # Candidates are only ever removed, so this ends.
+        failed |= (candidates == 0).any(axis=(1, 2))
+        if numpy.array_equal(candidates, before):
+            return candidates, failed
+
+
+def solve_batch(sudokus: List[Sudoku], rules: RuleBase, split: str) -> List[Result]:
+    """
+    Solves a batch of Sudokus with the rules of their size. The grids that propagation does not decide are searched
+    by a solver with the given split, which starts from the digits that were placed and the candidates that were
+    eliminated. Solutions are dicts of all variables of the rules, like the solvers return them.
+    """
+    if numpy is None:
+        raise RuntimeError("The batch solver needs NumPy, install it with 'pip install numpy'.")
+
+    # The propagation applies the rules of a Sudoku itself, which have to be the same as those of the search.
+    size: Optional[int] = detect_size(rules.variables)
+    if size is None:
+        raise ValueError("The batch solver only solves Sudokus with the rules of a 4x4, 9x9 or 16x16 Sudoku.")
+    for i, _, literals in sudokus:
+        if not rules.variables.issuperset(literals):
+            raise ValueError("Sudoku '{}' does not use the variable encoding of the {}x{} rules.".format(i, size, size))
+
+    grid: Grid = get_grid(size)
+    candidates, failed = propagate(load_batch(size, sudokus))
+    candidates = candidates.reshape(len(sudokus), size * size)
+    solved = (popcounts(size)[candidates] == 1).all(axis=1) & ~failed
+
+    # Whether every digit fits in every cell, in the order of grid.variables.
+    variables: List[int] = [variable for cell in grid.variables for variable in cell]
+    fits = ((candidates[:, :, None] >> numpy.arange(size, dtype=numpy.uint32)) & 1) != 0
+    fits = fits.reshape(len(sudokus), size ** 3)
+
+    results: List[Result] = []
+    for g, (i, _, literals) in enumerate(sudokus):
+        if failed[g]:
+            results.append((i, None, Status.UNSAT, None))
+        elif solved[g]:
+            results.append((i, None, Status.SAT, dict(zip(variables, fits[g].tolist()))))
+        else:
+            # The digits of the cells with one candidate left and the eliminated candidates of the others.
+            single = popcounts(size)[candidates[g]] == 1
+            known: List[int] = [
+                variable if fit else variable * -1
+                for variable, fit, placed in zip(variables, fits[g].tolist(), numpy.repeat(single, size).tolist())
+                if placed or not fit
+            ]
+            solver = create_solver(split, rules.problem(known))
+            status, solution, clauses, conflict = solver.solve(order=get_order(split))
+            results.append((i, solver, status, solution))
+
+    return results
+
+
+def solve_sudokus_batched(
+        sudoku_filename: str,
+        rules_filename: str,
+        split: str,
+        n: Optional[int] = None,
+        offset: int = 0,
+        batch_size: int = BATCH_SIZE
+) -> Iterator[Result]:
+    """Like solve_sudokus, but propagates batch_size Sudokus at a time and only searches the ones that stay open."""
+    rules: RuleBase = RuleBase.load(rules_filename)
+    batch: List[Sudoku] = []
+
+    for i, size, literals in read_sudokus(sudoku_filename):
+        if i < offset:
+            continue
+        if n is not None and i >= offset + n:
+            break
+
+        batch.append((i, size, literals))
+        if len(batch) == batch_size:
+            yield from solve_batch(batch, rules, split)
+            batch = []
+
+    if len(batch) != 0:
+        yield from solve_batch(batch, rules, split)
@@ -0,0 +1,210 @@
+# Reads a file in DIMACS format into flat integer arrays.
+import itertools
+import mmap
+import operator
+import re
+from array import array
+from typing import List, Tuple, Iterator, Optional
+
+COMMENT_LINE = re.compile(rb'^[ \t]*c.*$', re.MULTILINE)
+END_MARKER = re.compile(rb'^[ \t]*%', re.MULTILINE)
+# In the cnf+ format a line like '1 2 3 <= 1' is a cardinality constraint: at most 1 of the literals is True.
+AT_MOST = b'<='
+
+
+class DimacsError(Exception):
+    def __init__(self, message: str, line: Optional[int] = None, column: Optional[int] = None):
+        if line is not None:
+            message = "{} (line {}, column {})".format(message, line, column)
+        super().__init__(message)
+        self.line: Optional[int] = line
+        self.column: Optional[int] = column
+
+
+class CompactCNF:
+    """
+    A CNF formula as one flat array with the literals of all clauses and an array with the offset of every clause in
+    it. Clause i consists of literals[offsets[i]:offsets[i + 1]]. Formulas in the cnf+ format also have cardinality
+    constraints, each with its literals and the number of them that may be True at most.
+    """
+
+    def __init__(self, num_vars: int, literals: array, offsets: array, constraints: List[Tuple[array, int]] = None):
+        self.num_vars: int = num_vars
+        self.num_clauses: int = len(offsets) - 1
+        self.literals: array = literals
+        self.offsets: array = offsets
+        self.constraints: List[Tuple[array, int]] = constraints or []
+
+    def __len__(self) -> int:
+        return self.num_clauses
+
+    def __iter__(self) -> Iterator[array]:
+        literals, offsets = self.literals, self.offsets
+        return (literals[offsets[i]:offsets[i + 1]] for i in range(self.num_clauses))
+
+    @property
+    def clauses(self) -> Iterator[array]:
+        """The clauses one by one, so the compact form can be used wherever a Dimacs problem is used."""
+        return iter(self)
+
+
+def read_dimacs(filename: str) -> CompactCNF:
+    """Memory-maps a DIMACS file and parses all clauses in bulk. Raises a DimacsError with its location if invalid."""
+    with open(filename, 'rb') as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped.
+            data = b''
+
+        try:
+            return parse_dimacs(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+def parse_dimacs(data: bytes) -> CompactCNF:
+    header_end, num_vars, num_clauses, header_line, columns, plus = _parse_header(data)
+
+    # Everything after the header is parsed at once. Comments are blanked out first, and by convention (SATLIB) a line
+    # starting with % ends the formula.
+    body: bytes = data[header_end:]
+    end = END_MARKER.search(body)
+    if end is not None:
+        body = body[:end.start()]
+    if b'c' in body:
+        body = COMMENT_LINE.sub(b'', body)
+
+    # The cardinality constraints of the cnf+ format are parsed line by line and blanked out as well.
+    constraints: List[Tuple[array, int]] = []
+    if plus and AT_MOST in body:
+        lines: List[bytes] = body.split(b'\n')
+        for number, text in enumerate(lines):
+            if AT_MOST in text:
+                constraints.append(_parse_constraint(text, header_line + 1 + number))
+                lines[number] = b''
+        body = b'\n'.join(lines)
+
+    try:
+        tokens: array = array('i', map(int, body.split()))
+    except (ValueError, OverflowError):
+        message, line, column = _locate_invalid_token(data, header_end, header_line, plus)
+        raise DimacsError(message, line, column)
+
+    if len(tokens) != 0 and tokens[-1] != 0:
+        line, column = _locate_last_token(data, header_end, header_line, plus)
+        raise DimacsError("the last clause is not terminated by 0", line, column)
+
+    # The zeros end the clauses: the nth zero sits n positions after the end of the nth clause in the literals array.
+    zeros: List[int] = [*itertools.compress(itertools.count(), map(operator.not_, tokens))]
+    offsets: array = array('i', [0])
+    offsets.extend(map(operator.sub, zeros, itertools.count()))
+    literals: array = array('i', filter(None, tokens))
+
+    # The declared number of clauses includes the constraints.
+    if num_clauses != len(zeros) + len(constraints):
+        raise DimacsError("the declared number of clauses ({}) does not match the actual number of clauses ({})".format(
+            num_clauses, len(zeros) + len(constraints)
+        ), header_line, columns[1])
+
+    max_var: int = max(map(abs, itertools.chain(literals, *(literals for literals, bound in constraints))), default=0)
+    if num_vars < max_var:
+        raise DimacsError("the declared number of variables ({}) is smaller than the actual number of variables ({})"
+                          .format(num_vars, max_var), header_line, columns[0])
+
+    return CompactCNF(num_vars, literals, offsets, constraints)
+
+
+def _parse_constraint(text: bytes, line: int) -> Tuple[array, int]:
+    """Parses a cardinality constraint of the cnf+ format: its literals, '<=' and the bound."""
+    literals, _, bound = text.partition(AT_MOST)
+    try:
+        constraint: Tuple[array, int] = array('i', map(int, literals.split())), int(bound)
+    except ValueError:
+        raise DimacsError("expected '<literals> <= <bound>'", line, 1)
+    except OverflowError:
+        raise DimacsError("literal out of range", line, 1)
+
+    if 0 in constraint[0]:
+        raise DimacsError("a cardinality constraint can't contain 0", line, 1)
+    if len(set(constraint[0])) != len(constraint[0]):
+        raise DimacsError("a literal occurs more than once in the cardinality constraint", line, 1)
+    return constraint
+
+
+def _parse_header(data: bytes) -> Tuple[int, int, int, int, Tuple[int, int], bool]:
+    """
+    Finds the problem line. Returns where the clauses start, the declared counts and their line and columns, and
+    whether the formula is in the cnf+ format.
+    """
+    position: int = 0
+    line: int = 1
+
+    while position < len(data):
+        end: int = data.find(b'\n', position)
+        if end == -1:
+            end = len(data)
+        text: bytes = data[position:end]
+        stripped: bytes = text.strip()
+
+        if stripped.startswith(b'p'):
+            tokens: List[Tuple[bytes, int]] = [
+                (match.group(), match.start() + 1) for match in re.finditer(rb'\S+', text)
+            ]
+            if len(tokens) != 4 or tokens[0][0] != b'p' or tokens[1][0] not in (b'cnf', b'cnf+'):
+                raise DimacsError("expected 'p cnf <variables> <clauses>' or 'p cnf+ <variables> <clauses>'", line,
+                                  tokens[0][1])
+
+            counts: List[int] = []
+            for token, column in tokens[2:]:
+                if not token.isdigit():
+                    raise DimacsError("invalid syntax", line, column)
+                counts.append(int(token))
+
+            return end + 1, counts[0], counts[1], line, (tokens[2][1], tokens[3][1]), tokens[1][0] == b'cnf+'
+
+        if stripped and not stripped.startswith(b'c'):
+            raise DimacsError("expected a problem statement or comment on this line", line, 1)
+
+        position = end + 1
+        line += 1
+
+    raise DimacsError("missing problem statement")
+
+
+def _lines(data: bytes, start: int, line: int) -> Iterator[Tuple[int, bytes]]:
+    for number, text in enumerate(data[start:].split(b'\n'), line + 1):
+        yield number, text
+
+
+def _locate_invalid_token(data: bytes, start: int, line: int, plus: bool = False) -> Tuple[str, int, int]:
+    """
+    Only runs after the bulk parse failed, to find what is wrong with the offending token, which is either no integer
+    or one that does not fit in the literals array, and its line and column.
+    """
+    for number, text in _lines(data, start, line):
+        if text.lstrip().startswith(b'%'):
+            break
+        if text.lstrip().startswith(b'c') or (plus and AT_MOST in text):
+            continue
+        for match in re.finditer(rb'\S+', text):
+            try:
+                array('i', [int(match.group())])
+            except ValueError:
+                return "invalid syntax", number, match.start() + 1
+            except OverflowError:
+                return "literal out of range", number, match.start() + 1
+    return "invalid syntax", line, 1
+
+
+def _locate_last_token(data: bytes, start: int, line: int, plus: bool = False) -> Tuple[int, int]:
+    location: Tuple[int, int] = (line, 1)
+    for number, text in _lines(data, start, line):
+        if text.lstrip().startswith(b'%'):
+            break
+        if text.lstrip().startswith(b'c') or (plus and AT_MOST in text):
+            continue
+        for match in re.finditer(rb'\S+', text):
+            location = (number, match.start() + 1)
+    return location
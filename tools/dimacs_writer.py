@@ -1,17 +1,91 @@
-# Writes an output file in DIMACS format
+# Writes solutions: one instance to a file in DIMACS format, or the solutions of many instances to one stream.
+import gzip
+import math
 import os
-from typing import IO, Dict
+from typing import IO, Dict, List, Optional
+
+from solver.Solver import Status
+from tools.sudoku_preprocessor import Grid, get_grid
+
+# Output formats of the SolutionWriter: a line with the digits of a Sudoku grid, or a DIMACS value line.
+GRID = 'grid'
+VALUES = 'dimacs'
+FORMATS = [GRID, VALUES]
+# The characters of the digits in a grid line, as sudoku_to_dimacs reads them.
+DIGITS = '.123456789ABCDEFG'
+# The size of the write buffer of the output.
+BUFFER_SIZE = 1024 * 1024
 
 
 def write_dimacs(filename_out: str, solution: Dict[int, bool]):
-    file_out: str = os.path.join(filename_out)
-    output_file: IO = open(file_out, 'w')
-    output_file.write("p cnf {} {}\n".format(str(max(solution)), str(len(solution))))
+    """
+    Writes a solution as a DIMACS formula with a unit clause for every variable, so the header declares the highest
+    variable and as many clauses as there are variables. Unassigned variables are written as False.
+    """
+    lines = ["p cnf {} {}\n".format(max(solution), len(solution))]
+    lines.extend("{} 0\n".format(variable if solution[variable] else variable * -1) for variable in solution)
+
+    with open(os.path.join(filename_out), 'w') as output_file:
+        output_file.write("".join(lines))
+
+
+class SolutionWriter:
+    """
+    Streams the solutions of many instances to one buffered file, one line per instance, instead of a file per
+    instance. The GRID format writes the digits of a Sudoku solution in the format of the Sudoku files, and an empty
+    line for an instance without a solution, so line i belongs to the i-th instance written. The VALUES format writes
+    a DIMACS value line 'v <literals> 0', or 's UNSATISFIABLE' or 's UNKNOWN'. Files ending with .gz are compressed.
+    """
+
+    def __init__(self, filename: str, output_format: str = GRID, compress: Optional[bool] = None):
+        if output_format not in FORMATS:
+            raise ValueError("Unknown output format '{}', expected one of {}.".format(output_format, ", ".join(FORMATS)))
+        self.output_format: str = output_format
+        self.written: int = 0
+
+        if compress is None:
+            compress = filename.endswith('.gz')
+        if compress:
+            # The default level 9 is several times slower and compresses these lines hardly any better.
+            self.file: IO = gzip.open(filename, 'wt', compresslevel=6)
+        else:
+            self.file: IO = open(filename, 'w', buffering=BUFFER_SIZE)
+
+    def write(self, status: Status, solution: Optional[Dict[int, Optional[bool]]]):
+        if self.output_format == GRID:
+            line: str = self._grid(solution) if status else ""
+        elif status:
+            line: str = "v {} 0".format(" ".join(
+                str(variable if value else variable * -1) for variable, value in solution.items() if value is not None
+            ))
+        else:
+            line: str = "s UNSATISFIABLE" if status is Status.UNSAT else "s UNKNOWN"
+
+        self.file.write(line + "\n")
+        self.written += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> 'SolutionWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
-    # Writes every element of dict in new line of output file
-    for clause_out in solution:
-        if not solution[clause_out]:
-            clause_out *= -1
-        output_file.write("{} 0\n".format(str(clause_out)))
+    @staticmethod
+    def _grid(solution: Dict[int, Optional[bool]]) -> str:
+        """The digits of a Sudoku solution row by row, the size follows from the number of True variables."""
+        positive: List[int] = [variable for variable, value in solution.items() if value]
+        size: int = math.isqrt(len(positive))
+        if size * size != len(positive) or size > len(DIGITS) - 1:
+            raise ValueError("The solution is not that of a Sudoku.")
 
-    output_file.close()
+        grid: Grid = get_grid(size)
+        cells: List[str] = ['.'] * (size * size)
+        for variable in positive:
+            if variable not in grid.cells:
+                raise ValueError("The solution is not that of a Sudoku, variable {} is no cell.".format(variable))
+            cell, digit = grid.cells[variable]
+            cells[cell] = DIGITS[digit]
+        return "".join(cells)
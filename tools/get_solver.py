@@ -1,35 +1,71 @@
-import mxklabs
-from typing import List
+from typing import List, Tuple, Union
 from mxklabs.dimacs import Dimacs
+from solver.CDCL import CDCL
 from solver.DLIS import DLIS
 from solver.DLCS import DLCS
 from solver.FIFO import FIFO
 from solver.MFLD import MFLD
+from solver.Portfolio import Portfolio
+from solver.RuleBase import Problem
+from solver.RestartPolicy import RESTARTS
+from solver.Solver import ENGINES
+from solver.VSIDS import VSIDS
+from tools.dimacs_reader import read_dimacs, CompactCNF, DimacsError
+from tools.sudoku_preprocessor import preprocess
 
 SEPARATOR = "__"
+# Split option that adds the units found by Sudoku candidate elimination before the search starts.
+PREPROCESS_SUDOKU = 'sudoku'
+# Split option that simplifies the clauses with the generic preprocessor before the search starts.
+SIMPLIFY = 'simplify'
+# Split option that replaces the pairwise at-most-one clauses of exactly-one groups by cardinality constraints.
+CARDINALITY = 'cardinality'
+# Split option that tries the value that a variable had before it was unassigned first, instead of the direction.
+PHASE_SAVING = 'phase'
 
+SOLVERS = {
+    'cdcl': CDCL,
+    'fifo': FIFO,
+    'dlcs': DLCS,
+    'dlis': DLIS,
+    'mfld': MFLD,
+    'vsids': VSIDS,
+    'portfolio': Portfolio,
+}
 
-def get_solver(split: str, input_filename: str):
-    if SEPARATOR not in split:
-        split = split + SEPARATOR
-    split, direction = split.split(SEPARATOR)
 
+def parse_split(split: str) -> Tuple[str, str, List[str]]:
+    """Splits e.g. 'dlis__positive_only__watched' into the heuristic, the direction and any further options."""
+    parts = split.split(SEPARATOR)
+    return parts[0], parts[1] if len(parts) > 1 else "", parts[1:]
+
+
+def get_solver(split: str, input_filename: str):
     try:
-        return {
-            'fifo': FIFO,
-            'dlcs': DLCS,
-            'dlis': DLIS,
-            'mfld': MFLD,
-        }[split](problem=mxklabs.dimacs.read(input_filename))
-    except Exception:
-        print("Could not read DIMACS file. Please make sure it is compliant with the DIMACS standard.")
+        problem = read_dimacs(input_filename)
+    except DimacsError as e:
+        print("Could not read DIMACS file '{}': {}".format(input_filename, e))
         raise
 
+    return create_solver(split, problem)
+
+
+def create_solver(split: str, problem: Union[Dimacs, CompactCNF, Problem]):
+    split, direction, options = parse_split(split)
+    engine = next((option for option in options if option in ENGINES), None)
+    restarts = next((option for option in options if option in RESTARTS), None)
+    if PREPROCESS_SUDOKU in options:
+        problem = preprocess(problem)
+    if SIMPLIFY in options:
+        problem = Problem.simplify(problem)
+    if CARDINALITY in options:
+        problem = Problem.with_constraints(problem)
+
+    return SOLVERS[split](problem=problem, engine=engine, restarts=restarts, phase_saving=PHASE_SAVING in options)
+
 
 def get_order(split: str) -> List[bool]:
-    if SEPARATOR not in split:
-        split = split + SEPARATOR
-    split, direction = split.split(SEPARATOR)
+    split, direction, options = parse_split(split)
 
     if "reversed" in direction:
         return [False, True]
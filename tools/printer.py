@@ -1,5 +1,5 @@
 import math
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any
 
 
 def print_solution(success: bool, solution: Dict[int, Optional[bool]]):
@@ -16,13 +16,13 @@ def print_solution(success: bool, solution: Dict[int, Optional[bool]]):
         print("No solution found.")
 
 
-def print_stats(solver):
-    print("Time: {}\nDP calls: {}\nSplit calls: {}\nSolution attempts: {}".format(
-        solver.end - solver.start,
-        solver.dp_calls,
-        solver.split_calls,
-        solver.solution_attempts
-    ))
+def print_stats(solver, cache=None):
+    """Prints the stats of a solver and those of a solve cache, either may be None."""
+    print_values({**(solver.stats() if solver is not None else {}), **(cache.stats() if cache is not None else {})})
+
+
+def print_values(stats: Dict[str, Any]):
+    print("\n".join("{}: {}".format(name, value) for name, value in stats.items()))
 
 
 def print_sudoku(solution: Dict[int, Optional[bool]], size: int = 9):
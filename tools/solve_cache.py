@@ -0,0 +1,178 @@
+# Answers Sudokus that are equivalent to one that was solved before from a cache, without solving them again.
+import collections
+import dbm
+import functools
+import itertools
+import math
+import operator
+from typing import List, Dict, Tuple, Optional, Callable, Sequence
+
+from solver.Solver import Status
+from tools.sudoku_preprocessor import Grid, get_grid
+
+# The number of Sudokus that the cache keeps in memory.
+CAPACITY = 10000
+
+# A transform of the cells of a Sudoku: the cell of the original grid at every position of the transformed grid.
+Transform = Callable[[Sequence[int]], Tuple[int, ...]]
+# The result of a Sudoku: its status and, if it has one, its solution.
+Result = Tuple[Status, Optional[Dict[int, bool]]]
+
+
+@functools.lru_cache(maxsize=None)
+def get_transforms(size: int) -> List[Transform]:
+    """
+    The transforms of a grid of some size that keep the rules: every order of the bands and of the stacks, with and
+    without transposing. Permutations of the rows within a band and of the columns within a stack keep the rules as
+    well, but there are so many of them that trying them all takes longer than solving most Sudokus.
+    """
+    box: int = math.isqrt(size)
+    transforms: List[Transform] = []
+    for transpose in (False, True):
+        for bands in itertools.permutations(range(box)):
+            for stacks in itertools.permutations(range(box)):
+                rows: List[int] = [band * box + row for band in bands for row in range(box)]
+                cols: List[int] = [stack * box + col for stack in stacks for col in range(box)]
+                transforms.append(operator.itemgetter(*(
+                    col * size + row if transpose else row * size + col for row in rows for col in cols
+                )))
+    return transforms
+
+
+def canonical_form(size: int, values: bytes) -> Tuple[bytes, Transform, bytes]:
+    """
+    The smallest form of a grid (the digit of every cell, 0 if it is empty) among all its transforms, with the digits
+    renumbered in the order in which they first appear. Returns the form, the transform and the renumbering, a table
+    for bytes.translate that maps every digit of the grid to its digit in the form. Digits that don't appear in the grid
+    are renumbered in order.
+    """
+    best: Optional[Tuple[bytes, Transform, bytes]] = None
+    for transform in get_transforms(size):
+        cells: bytes = bytes(transform(values))
+        digits: List[int] = [*dict.fromkeys(cells)]
+        if 0 in digits:
+            digits.remove(0)
+        digits.extend(digit for digit in range(1, size + 1) if digit not in digits)
+
+        renumbering: bytearray = bytearray(256)
+        for new, digit in enumerate(digits, 1):
+            renumbering[digit] = new
+        form: bytes = cells.translate(renumbering)
+        if best is None or form < best[0]:
+            best = form, transform, bytes(renumbering)
+    return best
+
+
+class SolveCache:
+    """
+    Remembers the results of Sudokus by their canonical form, so a Sudoku that is the same as an earlier one up to
+    relabelling the digits, reordering the bands or stacks or transposing is answered with the solution of that one,
+    transformed back. The least recently used results are evicted from memory beyond the capacity. With a path, every
+    result is also stored in a database file, which is read on a miss in memory and kept between runs.
+
+    The cache applies the rules of a Sudoku itself, so it is only used for problems with the standard rules, like
+    candidate elimination (see sudoku_preprocessor).
+    """
+
+    def __init__(self, capacity: int = CAPACITY, path: Optional[str] = None):
+        self.capacity: int = capacity
+        # The canonical form of a Sudoku and the canonical form of its solution, empty if it has none.
+        self.entries: collections.OrderedDict = collections.OrderedDict()
+        self.database = dbm.open(path, 'c') if path is not None else None
+
+        self.hits: int = 0
+        self.misses: int = 0
+        # The hits that were found in the database file, they count as hits as well.
+        self.disk_hits: int = 0
+
+    def close(self):
+        if self.database is not None:
+            self.database.close()
+            self.database = None
+
+    def __enter__(self) -> 'SolveCache':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def solve(self, size: int, literals: List[int], solve: Callable[[], Result]) -> Tuple[bool, Result]:
+        """
+        Whether a Sudoku with the given literals was in the cache, and its status and solution, from the cache or from
+        solve(). Only decided Sudokus are stored. Sudokus with two givens in one cell are always solved.
+        """
+        grid: Grid = get_grid(size)
+        values: bytearray = bytearray(size * size)
+        for literal in literals:
+            cell, digit = grid.cells[literal]
+            if values[cell] not in (0, digit):
+                return False, solve()
+            values[cell] = digit
+
+        form, transform, renumbering = canonical_form(size, bytes(values))
+        solution: Optional[bytes] = self._get(form)
+        if solution is not None:
+            self.hits += 1
+            return True, self._result(size, solution, transform, renumbering)
+
+        self.misses += 1
+        status, result = solve()
+        if status is Status.UNSAT:
+            self._put(form, b'')
+        elif status is Status.SAT:
+            # The digit of every cell of the solution, in the cells and with the digits of the canonical form.
+            digits: bytearray = bytearray(size * size)
+            for variable, (cell, digit) in grid.cells.items():
+                if result.get(variable):
+                    digits[cell] = digit
+            self._put(form, bytes(transform(digits)).translate(renumbering))
+        return False, (status, result)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'Cache hits': self.hits,
+            'Cache misses': self.misses,
+            **({'Cache disk hits': self.disk_hits} if self.database is not None else {}),
+            'Cache entries': len(self.entries),
+        }
+
+    def _get(self, form: bytes) -> Optional[bytes]:
+        if form in self.entries:
+            self.entries.move_to_end(form)
+            return self.entries[form]
+        if self.database is not None and form in self.database:
+            self.disk_hits += 1
+            solution: bytes = self.database[form]
+            self._remember(form, solution)
+            return solution
+        return None
+
+    def _put(self, form: bytes, solution: bytes):
+        self._remember(form, solution)
+        if self.database is not None:
+            self.database[form] = solution
+
+    def _remember(self, form: bytes, solution: bytes):
+        self.entries[form] = solution
+        self.entries.move_to_end(form)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def _result(self, size: int, solution: bytes, transform: Transform, renumbering: bytes) -> Result:
+        """Transforms a canonical solution back to the cells and digits of the Sudoku that was looked up."""
+        if len(solution) == 0:
+            return Status.UNSAT, None
+
+        grid: Grid = get_grid(size)
+        digits: List[int] = [0] * (size + 1)
+        for digit in range(size + 1):
+            digits[renumbering[digit]] = digit
+        # The transforms are permutations of the cells, position k of the form is cell transform(cells)[k].
+        cells: Tuple[int, ...] = transform(range(size * size))
+        placed: List[int] = [0] * (size * size)
+        for position, cell in enumerate(cells):
+            placed[cell] = digits[solution[position]]
+
+        return Status.SAT, {
+            variable: placed[cell] == digit for variable, (cell, digit) in grid.cells.items()
+        }
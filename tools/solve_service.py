@@ -0,0 +1,216 @@
+# A long-running solve service: an asyncio server on localhost that hands Sudokus and CNF formulas to a pool of worker
+# processes, which keep their imports and the parsed rules between requests. Requests and responses are JSON objects,
+# one per line, so a connection can send many requests without waiting for the answers.
+import asyncio
+import collections
+import concurrent.futures
+import json
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Deque, Optional, Any
+
+from solver.RuleBase import RuleBase
+from solver.Solver import Status
+from tools.dimacs_reader import parse_dimacs
+from tools.get_solver import create_solver, get_order
+from tools.sudoku_to_dimacs import sudoku_to_literals
+
+HOST = '127.0.0.1'
+PORT = 8765
+# The rules for every size of Sudoku, for requests that don't name their own.
+RULES = os.path.join('input', 'rules', 'sudoku-rules-{0}x{0}.txt')
+SPLIT = 'cdcl'
+# The budget fields of a request, they are passed on to solve().
+BUDGETS = ['max_calls', 'max_conflicts', 'max_decisions', 'time_limit']
+# The longest request line, CNF formulas are sent in one line.
+LINE_LIMIT = 64 * 1024 * 1024
+# The number of recent requests that the latency percentiles are computed over.
+LATENCY_WINDOW = 1000
+
+
+def warm(rules_filenames: List[str]):
+    """Initialises a worker process. The rules are parsed once, every request after that shares them."""
+    for filename in rules_filenames:
+        RuleBase.load(filename)
+
+
+def solve_request(request: Dict[str, Any], queued: float) -> Dict[str, Any]:
+    """
+    Solves the Sudoku ('sudoku', a line as in the Sudoku files, with optional 'rules') or the DIMACS formula ('cnf') of
+    a request in a worker process, with its 'split' and budget. The solution is a list of literals, one per variable.
+    """
+    started: float = time.time()
+    split: str = request.get('split') or SPLIT
+    budget: Dict[str, Any] = {name: request[name] for name in BUDGETS if request.get(name) is not None}
+
+    if 'sudoku' in request:
+        converted = sudoku_to_literals(request['sudoku'])
+        if converted is None:
+            raise ValueError("The Sudoku does not have square dimensions.")
+        size, literals = converted
+        rules_filename: str = request.get('rules') or RULES.format(size)
+        rules: RuleBase = RuleBase.load(rules_filename)
+        # Givens that the rules don't know about would silently be ignored by the solver.
+        if not rules.variables.issuperset(literals):
+            raise ValueError("The Sudoku does not use the variable encoding of '{}'.".format(rules_filename))
+        problem = rules.problem(literals)
+    elif 'cnf' in request:
+        problem = parse_dimacs(request['cnf'].encode())
+    else:
+        raise ValueError("A request needs a 'sudoku' or a 'cnf'.")
+
+    solver = create_solver(split, problem)
+    status, solution, clauses, conflict = solver.solve(order=get_order(split), **budget)
+
+    return {
+        'status': status.name,
+        'solution': [
+            variable if value else variable * -1 for variable, value in solution.items() if value is not None
+        ] if status is Status.SAT else None,
+        'stats': solver.stats(),
+        'wait': started - queued,
+    }
+
+
+class SolveService:
+    """
+    Answers requests on a pool of worker processes that are started and warmed up front. Requests on any connection
+    run concurrently, up to one per worker, the others wait in the queue of the pool. A request {"command": "stats"}
+    is answered with the queue depth and the latencies of the service.
+    """
+
+    def __init__(self, workers: int, rules_filenames: List[str], budget: Optional[Dict[str, Any]] = None):
+        self.workers: int = workers
+        self.rules_filenames: List[str] = rules_filenames
+        # The budget of requests that don't set one themselves.
+        self.budget: Dict[str, Any] = budget or {}
+        self.executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        # Only one request replaces a pool that broke, the others wait for the new one.
+        self.restarting: asyncio.Lock = asyncio.Lock()
+        self.restarts: int = 0
+
+        self.started: float = time.time()
+        self.requests: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+        self.in_flight: int = 0
+        # The latencies of the recent requests, from receiving them to sending the answer.
+        self.latencies: Deque[float] = collections.deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self):
+        """Starts the workers and waits until every one of them has parsed the rules."""
+        loop = asyncio.get_running_loop()
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, initializer=warm, initargs=(self.rules_filenames,)
+        )
+        await asyncio.gather(*(loop.run_in_executor(self.executor, os.getpid) for _ in range(self.workers)))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    async def serve(self, host: str = HOST, port: int = PORT):
+        await self.start()
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=LINE_LIMIT)
+        print("Serving on {}:{} with {} workers.".format(host, port, self.workers))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answers the requests on a connection as they complete, a request with an 'id' gets it back."""
+        answers: set = set()
+
+        async def answer(line: bytes):
+            try:
+                request: Any = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("A request is a JSON object.")
+            except ValueError as e:
+                request, response = {}, {'error': str(e)}
+            else:
+                response = await self.handle(request)
+
+            if 'id' in request:
+                response['id'] = request['id']
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        try:
+            while True:
+                line: bytes = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task: asyncio.Task = asyncio.create_task(answer(line))
+                    answers.add(task)
+                    task.add_done_callback(answers.discard)
+            await asyncio.gather(*answers)
+        except (ConnectionError, ValueError):
+            # The client went away, or sent a line beyond the limit.
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if request.get('command') == 'stats':
+            return {'stats': self.stats()}
+
+        loop = asyncio.get_running_loop()
+        start: float = time.perf_counter()
+        self.requests += 1
+        self.in_flight += 1
+        executor: concurrent.futures.ProcessPoolExecutor = self.executor
+        # Fields that a request leaves unset or None get the budget of the service.
+        request = {**self.budget, **{name: value for name, value in request.items() if value is not None}}
+        try:
+            response: Dict[str, Any] = await loop.run_in_executor(executor, solve_request, request, time.time())
+            self.completed += 1
+        except BrokenProcessPool:
+            # A worker died, e.g. because it ran out of memory, which breaks the whole pool. The requests that were in
+            # the pool fail, the later ones go to a new pool.
+            self.failed += 1
+            response = {'error': "A worker process died while solving."}
+            await self._restart(executor)
+        except Exception as e:
+            self.failed += 1
+            response = {'error': str(e) or type(e).__name__}
+        finally:
+            self.in_flight -= 1
+
+        response['latency'] = time.perf_counter() - start
+        self.latencies.append(response['latency'])
+        return response
+
+    async def _restart(self, broken: concurrent.futures.ProcessPoolExecutor):
+        async with self.restarting:
+            if self.executor is not broken:
+                return
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.restarts += 1
+            await self.start()
+
+    def stats(self) -> Dict[str, Any]:
+        latencies: List[float] = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            return latencies[round((len(latencies) - 1) * p / 100)] if latencies else None
+
+        return {
+            'Workers': self.workers,
+            'Requests': self.requests,
+            'Completed': self.completed,
+            'Failed': self.failed,
+            'Pool restarts': self.restarts,
+            'In flight': self.in_flight,
+            # The requests that wait for a worker.
+            'Queued': max(0, self.in_flight - self.workers),
+            'Latency p50': percentile(50),
+            'Latency p95': percentile(95),
+            'Latency max': latencies[-1] if latencies else None,
+            'Uptime': time.time() - self.started,
+        }
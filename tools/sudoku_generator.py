@@ -1,4 +1,6 @@
-from random import sample
+import argparse
+from random import sample, choice
+from typing import List
 
 distributions = [
     [0, 0, 0, 0, 0, 1, 1, 1, 9],
@@ -13,6 +15,10 @@ distributions = [
 base = 3
 side = 9
 
+# The solver that checks uniqueness. CDCL proves that there is no other solution, and keeps what it learned from the
+# first solution while it looks for the second.
+UNIQUE_SPLIT = 'cdcl__positive_only'
+
 
 # pattern for a baseline valid solution
 def pattern(r, c):
@@ -33,16 +39,71 @@ def generate_sudoku():
     return [nums[pattern(r, c)] for c in cols for r in rows]
 
 
-for distribution in distributions:
-    for k in range(0, 100):
-        sudoku = generate_sudoku()
-        for i, freq in enumerate(distribution):
-            positions = sample(range(1, 10), freq)
-            current_pos = 0
-            for j, value in enumerate(sudoku):
-                if value == i + 1:
-                    current_pos += 1
-                    if current_pos not in positions:
-                        sudoku[j] = 0
+def remove_givens(sudoku, distribution):
+    # keep freq occurrences of digit i + 1, at random
+    for i, freq in enumerate(distribution):
+        positions = sample(range(1, 10), freq)
+        current_pos = 0
+        for j, value in enumerate(sudoku):
+            if value == i + 1:
+                current_pos += 1
+                if current_pos not in positions:
+                    sudoku[j] = 0
+
+
+def make_unique(sudoku: List[int], board: List[int], rules) -> List[int]:
+    """
+    Puts back givens of the board until it is the only solution of the Sudoku. Every given that is put back is one on
+    which another solution differs from the board, so that solution is ruled out. Returns the cells that were put back.
+    """
+    # Imported here, so generating without the uniqueness check does not need the solver.
+    from tools.get_solver import create_solver, get_order
+    from tools.sudoku_preprocessor import get_grid
+
+    variables: List[List[int]] = get_grid(side).variables
+    solver = create_solver(UNIQUE_SPLIT, rules.problem(
+        variables[cell][value - 1] for cell, value in enumerate(sudoku) if value != 0
+    ))
+    # The board is a solution already, so blocking it leaves one search per given instead of counting two solutions.
+    solver.add_clause([variables[cell][value - 1] * -1 for cell, value in enumerate(board)])
+    added: List[int] = []
+
+    while True:
+        status, other, clauses, conflict = solver.solve(max_calls=None, order=get_order(UNIQUE_SPLIT))
+        if not status:
+            return added
+
+        cell: int = choice([
+            cell for cell, value in enumerate(board) if sudoku[cell] == 0 and not other[variables[cell][value - 1]]
+        ])
+        sudoku[cell] = board[cell]
+        solver.add_clause([variables[cell][board[cell] - 1]])
+        added.append(cell)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate 9x9 Sudokus with a given distribution of digits.")
+    parser.add_argument('--n', type=int, default=100, help="number of Sudokus per distribution")
+    parser.add_argument('--unique', metavar='RULES', default=None,
+                        help="only output Sudokus with a unique solution, checked against these rules; givens are "
+                             "put back until the solution is unique")
+    args = parser.parse_args()
+
+    rules = None
+    if args.unique is not None:
+        from solver.RuleBase import RuleBase
+        rules = RuleBase.load(args.unique)
+
+    for distribution in distributions:
+        for k in range(0, args.n):
+            board = generate_sudoku()
+            sudoku = [*board]
+            remove_givens(sudoku, distribution)
+            if rules is not None:
+                make_unique(sudoku, board, rules)
+
+            print("".join(f"{n or '.':{1}}" for n in sudoku))
+
 
-        print("".join(f"{n or '.':{1}}" for n in sudoku))
+if __name__ == '__main__':
+    main()
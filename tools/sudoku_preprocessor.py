@@ -0,0 +1,197 @@
+# Candidate elimination on the grid of a Sudoku, to find the units that the solver would otherwise have to split for.
+import functools
+import math
+from typing import List, Dict, Tuple, Iterable, Optional, FrozenSet, Union
+
+from mxklabs.dimacs import Dimacs
+
+from solver.RuleBase import Problem, as_problem
+from tools.dimacs_reader import CompactCNF
+
+# The sizes of the Sudokus whose encoding is recognised.
+SIZES = [4, 9, 16]
+
+
+class Contradiction(Exception):
+    pass
+
+
+class Grid:
+    """
+    The cells, rows, columns and boxes of a Sudoku of some size. Cells are numbered row by row from 0, the variable of
+    digit d in a cell uses the decimal encoding of sudoku_to_dimacs: row, column and digit, each in as many digits as
+    the size needs.
+    """
+
+    def __init__(self, size: int):
+        box: int = int(math.sqrt(size))
+        cells: range = range(size * size)
+
+        self.size: int = size
+        self.rows: List[Tuple[int, ...]] = [tuple(row * size + col for col in range(size)) for row in range(size)]
+        self.cols: List[Tuple[int, ...]] = [tuple(row * size + col for row in range(size)) for col in range(size)]
+        self.boxes: List[Tuple[int, ...]] = [
+            tuple((top + row) * size + left + col for row in range(box) for col in range(box))
+            for top in range(0, size, box) for left in range(0, size, box)
+        ]
+        self.units: List[Tuple[int, ...]] = [*self.rows, *self.cols, *self.boxes]
+        self.row_of: List[int] = [cell // size for cell in cells]
+        self.col_of: List[int] = [cell % size for cell in cells]
+        self.box_of: List[int] = [self.row_of[cell] // box * box + self.col_of[cell] // box for cell in cells]
+        self.peers: List[Tuple[int, ...]] = [
+            tuple(sorted({*self.rows[self.row_of[cell]], *self.cols[self.col_of[cell]],
+                          *self.boxes[self.box_of[cell]]} - {cell}))
+            for cell in cells
+        ]
+
+        digits: int = math.ceil(math.log10(size + 1))
+        self.variables: List[List[int]] = [
+            [(self.row_of[cell] + 1) * 10 ** (2 * digits) + (self.col_of[cell] + 1) * 10 ** digits + digit
+             for digit in range(1, size + 1)]
+            for cell in cells
+        ]
+        self.cells: Dict[int, Tuple[int, int]] = {
+            variable: (cell, digit)
+            for cell, variables in enumerate(self.variables) for digit, variable in enumerate(variables, 1)
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def get_grid(size: int) -> Grid:
+    return Grid(size)
+
+
+@functools.lru_cache(maxsize=None)
+def detect_size(variables: FrozenSet[int]) -> Optional[int]:
+    """The size of the Sudoku if the variables are exactly those of a Sudoku encoding, otherwise None."""
+    for size in SIZES:
+        if len(variables) == size ** 3 and variables.issubset(get_grid(size).cells):
+            return size
+    return None
+
+
+def implied_literals(size: int, literals: Iterable[int]) -> Optional[List[int]]:
+    """
+    Applies naked singles, hidden singles and locked candidates to the grid of a Sudoku with the given literals, until
+    none of them finds anything new. Returns the literals that follow: the digits that were placed and the candidates
+    that were eliminated from the cells that are still open. Returns None if the Sudoku turns out to have no solution.
+    """
+    grid: Grid = get_grid(size)
+    full: int = (1 << size) - 1
+    candidates: List[int] = [full] * (size * size)
+    placed: List[int] = [0] * (size * size)
+    literals: List[int] = [*literals]
+
+    def eliminate(cell: int, bit: int) -> bool:
+        if not candidates[cell] & bit:
+            return False
+        candidates[cell] &= ~bit
+        if candidates[cell] == 0:
+            raise Contradiction()
+        return True
+
+    def place(cell: int, digit: int):
+        bit: int = 1 << (digit - 1)
+        if not candidates[cell] & bit:
+            raise Contradiction()
+        candidates[cell] = bit
+        placed[cell] = digit
+        for peer in grid.peers[cell]:
+            eliminate(peer, bit)
+
+    try:
+        for literal in literals:
+            cell, digit = grid.cells[abs(literal)]
+            if literal > 0:
+                if placed[cell] != digit:
+                    place(cell, digit)
+            else:
+                eliminate(cell, 1 << (digit - 1))
+
+        changed: bool = True
+        while changed:
+            changed = False
+
+            # Naked singles: a cell with only one candidate left.
+            for cell, mask in enumerate(candidates):
+                if not placed[cell] and mask & (mask - 1) == 0:
+                    place(cell, mask.bit_length())
+                    changed = True
+
+            # Hidden singles: a digit that fits in only one cell of a row, column or box.
+            for unit in grid.units:
+                # The digits that fit in at least one and at least two cells of the unit.
+                once: int = 0
+                twice: int = 0
+                for cell in unit:
+                    twice |= once & candidates[cell]
+                    once |= candidates[cell]
+                if once != full:
+                    raise Contradiction()
+
+                for cell in unit:
+                    single: int = candidates[cell] & ~twice
+                    if single and not placed[cell]:
+                        place(cell, single.bit_length())
+                        changed = True
+
+            if changed:
+                continue
+
+            # Locked candidates: if the cells of a box where a digit fits all lie in one row or column, the digit can't
+            # be anywhere else in that row or column (pointing), and the other way around (claiming).
+            for bit in (1 << digit for digit in range(size)):
+                for box in grid.boxes:
+                    cells: List[int] = [cell for cell in box if not placed[cell] and candidates[cell] & bit]
+                    if len(cells) < 2:
+                        continue
+                    for lines, line_of in ((grid.rows, grid.row_of), (grid.cols, grid.col_of)):
+                        if len({line_of[cell] for cell in cells}) == 1:
+                            for cell in lines[line_of[cells[0]]]:
+                                if grid.box_of[cell] != grid.box_of[cells[0]]:
+                                    changed = eliminate(cell, bit) or changed
+
+                for lines in (grid.rows, grid.cols):
+                    for line in lines:
+                        cells: List[int] = [cell for cell in line if not placed[cell] and candidates[cell] & bit]
+                        if len(cells) < 2 or len({grid.box_of[cell] for cell in cells}) != 1:
+                            continue
+                        for cell in grid.boxes[grid.box_of[cells[0]]]:
+                            if cell not in line:
+                                changed = eliminate(cell, bit) or changed
+    except Contradiction:
+        return None
+
+    known: FrozenSet[int] = frozenset(literals)
+    implied: List[int] = []
+    for cell, variables in enumerate(grid.variables):
+        for digit, variable in enumerate(variables, 1):
+            if placed[cell] == digit:
+                literal: int = variable
+            elif not placed[cell] and not candidates[cell] & (1 << (digit - 1)):
+                literal: int = variable * -1
+            else:
+                continue
+            if literal not in known:
+                implied.append(literal)
+
+    return implied
+
+
+def preprocess(problem: Union[Dimacs, CompactCNF, Problem]) -> Union[Dimacs, CompactCNF, Problem]:
+    """
+    Adds the literals that candidate elimination finds as givens, if the problem uses the variables of a Sudoku.
+    Other problems, and Sudokus without a solution, are returned as they are.
+    """
+    converted: Problem = as_problem(problem)
+    rules, givens = converted.rules, converted.givens
+
+    size: Optional[int] = detect_size(rules.variables)
+    if size is None:
+        return problem
+
+    implied: Optional[List[int]] = implied_literals(size, [*rules.units, *givens])
+    if implied is None:
+        return problem
+
+    return rules.problem([*givens, *implied])
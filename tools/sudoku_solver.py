@@ -0,0 +1,52 @@
+# Solves Sudokus straight from a file with one Sudoku per line, without writing DIMACS files in between.
+from typing import Iterator, Tuple, Optional, Dict, List
+
+from solver.RuleBase import RuleBase
+from solver.Solver import Status
+from tools.get_solver import create_solver, get_order
+from tools.solve_cache import SolveCache
+from tools.sudoku_preprocessor import detect_size
+from tools.sudoku_to_dimacs import read_sudokus
+
+
+def solve_sudokus(
+        sudoku_filename: str,
+        rules_filename: str,
+        split: str,
+        n: Optional[int] = None,
+        offset: int = 0,
+        cache: Optional[SolveCache] = None
+) -> Iterator[Tuple[int, object, bool, Optional[Dict[int, bool]]]]:
+    """
+    Parses the rules once and yields the index, solver, success and solution of every Sudoku from offset up to
+    offset + n. All solvers share the parsed rules, the givens of every Sudoku are added as unit clauses. With a cache,
+    Sudokus that are equivalent to one that was solved before are answered from it, the solver is None for them.
+    """
+    rules: RuleBase = RuleBase.load(rules_filename)
+    # The cache knows the standard rules only.
+    cached_size: Optional[int] = detect_size(rules.variables) if cache is not None else None
+
+    for i, size, literals in read_sudokus(sudoku_filename):
+        if i < offset:
+            continue
+        if n is not None and i >= offset + n:
+            break
+
+        # Givens that the rules don't know about would silently be ignored by the solver.
+        if not rules.variables.issuperset(literals):
+            raise ValueError("Sudoku '{}' does not use the variable encoding of '{}'.".format(i, rules_filename))
+
+        if cached_size != size:
+            solver = create_solver(split, rules.problem(literals))
+            success, solution, clauses, conflict = solver.solve(order=get_order(split))
+            yield i, solver, success, solution
+            continue
+
+        solvers: List[object] = []
+
+        def solve() -> Tuple[Status, Optional[Dict[int, bool]]]:
+            solvers.append(create_solver(split, rules.problem(literals)))
+            return solvers[0].solve(order=get_order(split))[:2]
+
+        _, (success, solution) = cache.solve(size, literals, solve)
+        yield i, solvers[0] if solvers else None, success, solution
@@ -1,63 +1,96 @@
+import argparse
 import math
 import os
 import re
-import sys
 import mxklabs.dimacs
 from mxklabs.dimacs import Dimacs
-from typing import List, IO
+from typing import List, IO, Iterator, Optional, Tuple
 
 
-def main(sudoku_filename: str, rules_filename: str, output_prefix: str) -> None:
-    # Opens the file.
-    sudoku_file: IO = open(sudoku_filename, "r")
+def sudoku_to_literals(sudoku: str) -> Optional[Tuple[int, List[int]]]:
+    """Returns the size of the Sudoku and a literal for every given, or None if the Sudoku is not square."""
+    # Remove all characters that we don't need.
+    sudoku: str = re.sub('[^1-9A-Z.]', '', sudoku)
+    size: float = math.sqrt(len(sudoku))
+    if not size.is_integer():
+        print("Sudoku '{0}' does not have square dimensions.".format(sudoku))
+        return None
 
+    # How many digits will we need to encode the variables in decimals.
+    num_digits: int = math.ceil(math.log10(int(size) + 1))
+    # List to store the literals in
+    literals: List[int] = []
+    counter: int = 0
+    current_col: int = int(size)
+    current_row: int = 0
+
+    # Iterates over every character in the line, making it a literal if it's a number.
+    for character in sudoku:
+        if current_col == size:
+            current_row += 1
+            current_col: int = 0
+            # This will resolve to 100 for 1 digit or 10.000 for 2 digits.
+            counter: int = int(math.pow(10, num_digits * 2) * current_row)
+
+        current_col += 1
+        counter += int(math.pow(10, num_digits))
+
+        # Determines if it's a usable literal.
+        if character != '.':
+            # The ordinal value of the first letter, A, is 65, but will be the 10th character in our notation.
+            literals.append(counter + (int(character) if character.isnumeric() else (ord(character) - 55)))
+
+    return int(size), literals
+
+
+def read_sudokus(sudoku_filename: str) -> Iterator[Tuple[int, int, List[int]]]:
+    """Yields the index, size and given literals of every square Sudoku in a file with one Sudoku per line."""
+    with open(sudoku_filename, "r") as sudoku_file:
+        for i, sudoku in enumerate(sudoku_file):
+            converted = sudoku_to_literals(sudoku)
+            if converted is not None:
+                yield (i, *converted)
+
+
+def main(sudoku_filename: str, rules_filename: str, output_prefix: str, cardinality: bool = False) -> None:
     rules: Dimacs = mxklabs.dimacs.read(rules_filename)
     rules.clauses = [[str(literal) for literal in clause] for clause in rules.clauses]
+    constraints: List[str] = []
+
+    # The exactly-one groups of the rules become constraints in the CNF+ format: 'l1 l2 ... <= 1'.
+    if cardinality:
+        # Imported here, the conversion without constraints also runs as a script from the tools directory.
+        from solver.RuleBase import RuleBase
+        detected: RuleBase = RuleBase.load(rules_filename).with_constraints()
+        rules.clauses = [[str(literal) for literal in clause] for clause in detected.clauses]
+        constraints = [
+            " ".join(str(literal) for literal in literals) + " <= {}\n".format(bound)
+            for literals, bound in detected.constraints
+        ]
 
     # Iterates over every line, creating a sudoku of each line in the file.
-    for i, sudoku in enumerate(sudoku_file):
+    for i, size, literals in read_sudokus(sudoku_filename):
         print("Converting Sudoku '{0}'".format(i))
-        # Remove all characters that we don't need.
-        sudoku: str = re.sub('[^1-9A-Z.]', '', sudoku)
-        size: float = math.sqrt(len(sudoku))
-        if not size.is_integer():
-            print("Sudoku '{0}' does not have square dimensions.".format(sudoku))
-            continue
-
-        # How many digits will we need to encode the variables in decimals.
-        num_digits: int = math.ceil(math.log10(int(size) + 1))
-        # List to store the clauses in
-        clauses: List[List[str]] = []
-        counter: int = 0
-        current_col: int = int(size)
-        current_row: int = 0
-
-        # Iterates over every character in the line, making it a clause if it's a number.
-        for character in sudoku:
-            if current_col == size:
-                current_row += 1
-                current_col: int = 0
-                # This will resolve to 100 for 1 digit or 10.000 for 2 digits.
-                counter: int = int(math.pow(10, num_digits * 2) * current_row)
-
-            current_col += 1
-            counter += int(math.pow(10, num_digits))
-
-            # Determines if it's a usable clause.
-            if character != '.':
-                # The ordinal value of the first letter, A, is 65, but will be the 10th character in our notation.
-                literal: int = counter + (int(character) if character.isnumeric() else (ord(character.lower()) - 55))
-                clauses.append([str(literal)])
-
-        clauses = clauses + rules.clauses
+        clauses: List[List[str]] = [[str(literal)] for literal in literals] + rules.clauses
 
         # Write the clauses to a cnf file.
         output_filename: str = os.path.join(output_prefix + '-' + str(i).rjust(4, '0') + '.cnf')
         output_file: IO = open(output_filename, 'w')
-        output_file.write("p cnf {} {}\n".format(str(int(size)) * 3, len(clauses)))
+        output_file.write("p {} {} {}\n".format(
+            "cnf+" if cardinality else "cnf", str(size) * 3, len(clauses) + len(constraints)
+        ))
         for clause in clauses:
             output_file.write(" ".join(clause) + " 0\n")
+        output_file.writelines(constraints)
         output_file.close()
 
 
-main(sys.argv[1], sys.argv[2], sys.argv[3])
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Encode every Sudoku in a file as a DIMACS file.")
+    parser.add_argument('sudoku_filename', help="file with one Sudoku per line")
+    parser.add_argument('rules_filename', help="DIMACS file with the rules of the Sudokus")
+    parser.add_argument('output_prefix', help="prefix of the output files, followed by the index of the Sudoku")
+    parser.add_argument('--cardinality', action='store_true',
+                        help="write the exactly-one groups of the rules as at-most-one constraints in CNF+ format")
+    args = parser.parse_args()
+    main(args.sudoku_filename, args.rules_filename, args.output_prefix, args.cardinality)